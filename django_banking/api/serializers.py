@@ -1,14 +1,21 @@
 from decimal import Decimal
 from typing import Dict
 
+import magic
 from rest_framework import serializers
 
 from django_banking import logger
 from django_banking.core.api.fields import AssetPrecisionDecimal
+from django_banking.core.exceptions import UploadNotFound
+from django_banking.core.uploads import (
+    UploadedFile,
+    get_uploaded_file
+)
 from django_banking.models import (
     Asset,
     Operation
 )
+from django_banking.models.assets.registry import asset_registry
 from django_banking.models.transactions.enum import (
     OperationStatus,
     OperationType
@@ -16,6 +23,7 @@ from django_banking.models.transactions.enum import (
 from django_banking.models.transactions.models import (
     OperationConfirmationDocument
 )
+from django_banking.storages import operation_upload_storage
 
 
 class AssetSerializer(serializers.ModelSerializer):
@@ -109,15 +117,16 @@ class BaseOperationSerializer(serializers.ModelSerializer):
         asset_id = total_price_data.get('quote_asset_id')
         if not total_price or not asset_id:
             return
-        asset = Asset.objects.get(pk=asset_id)
+        asset = asset_registry.get(asset_id)
         return str(Decimal(total_price).quantize(Decimal(10) ** -asset.decimals))
 
     def get_user_iban(self, obj):
         from django_banking.contrib.wire_transfer.models import UserBankAccount
+        if obj.user_bank_account_uuid is None:
+            return None
         try:
-            bank_account_uuid = obj.references['user_bank_account_uuid']
-            return UserBankAccount.objects.get(pk=bank_account_uuid).iban_number[-4:]
-        except (UserBankAccount.DoesNotExist, KeyError):
+            return UserBankAccount.objects.get(pk=obj.user_bank_account_uuid).iban_number[-4:]
+        except UserBankAccount.DoesNotExist:
             return None
 
 
@@ -187,7 +196,7 @@ class DepositOperationSerializer(BaseOperationSerializer):
             return None
 
     def get_deposit_reference_code(self, obj):
-        return obj.references.get('reference_code')
+        return obj.reference_code
 
     def get_crypto_deposit_address(self, obj):
         return obj.deposit_cryptocurrency_address and obj.deposit_cryptocurrency_address.address
@@ -279,6 +288,58 @@ class UploadConfirmationRequestSerializer(serializers.ModelSerializer):
         fields = ('file',)
 
 
+class RequestConfirmationUploadSerializer(serializers.Serializer):
+    fileName = serializers.CharField(max_length=255, source='file_name')
+    contentType = serializers.ChoiceField(
+        choices=OperationConfirmationDocument.SUPPORTED_MIME_TYPES,
+        source='content_type',
+    )
+
+
+class FinalizeConfirmationUploadSerializer(serializers.Serializer):
+    token = serializers.CharField()
+    checksum = serializers.RegexField(r'^[0-9a-f]{32}$')
+
+    def validate(self, attrs):
+        try:
+            upload = get_uploaded_file(
+                operation_upload_storage, attrs['token'], self.context['operation'].pk
+            )
+        except UploadNotFound as exc:
+            raise serializers.ValidationError({'token': str(exc)})
+        try:
+            self.check_upload(upload, attrs['checksum'])
+        except serializers.ValidationError:
+            # rejected file is removed, new upload should be requested to retry
+            if not OperationConfirmationDocument.objects.filter(file=upload.name).exists():
+                operation_upload_storage.delete(upload.name)
+            raise
+        attrs['file'] = upload.name
+        return attrs
+
+    @staticmethod
+    def check_upload(upload: UploadedFile, checksum: str):
+        errors = []
+        if not 0 < upload.size <= OperationConfirmationDocument.MAX_SIZE:
+            errors.append(
+                f'File size `{upload.size}` should be in range from '
+                f'`1` to `{OperationConfirmationDocument.MAX_SIZE}`'
+            )
+        mime_type = magic.from_buffer(upload.head, mime=True)
+        if mime_type not in OperationConfirmationDocument.SUPPORTED_MIME_TYPES:
+            errors.append(f'File type `{mime_type}` not supported')
+        if errors:
+            raise serializers.ValidationError({'token': errors})
+        if upload.checksum != checksum:
+            raise serializers.ValidationError({'checksum': 'Checksum does not match uploaded file'})
+
+    def create(self, validated_data):
+        return OperationConfirmationDocument.objects.create(
+            operation=self.context['operation'],
+            file=validated_data['file'],
+        )
+
+
 class LimitsSerializer(serializers.Serializer):
     asset = serializers.UUIDField(source='asset.uuid')
     total = AssetPrecisionDecimal(source='*', real_source='total', asset_source='asset')
@@ -11,17 +11,22 @@ from rest_framework.viewsets import ReadOnlyModelViewSet
 from django_banking.core.exceptions import NonSupportedCountryException
 from django_banking.models import PaymentOperation
 
-from ..core.api.pagination import CustomCursorPagination
+from ..core.api.pagination import KeysetCursorPagination
+from ..core.uploads import request_upload
 from ..limitations.utils import get_user_limits
 from ..models import (
     Asset,
-    Operation,
-    UserAccount
+    Operation
 )
+from ..models.transactions.models import OperationConfirmationDocument
+from ..storages import operation_upload_storage
+from ..user import get_financial_context
 from .serializers import (
     AssetSerializer,
+    FinalizeConfirmationUploadSerializer,
     LimitsSerializer,
     OperationSerializer,
+    RequestConfirmationUploadSerializer,
     UploadConfirmationRequestSerializer
 )
 
@@ -33,22 +38,25 @@ class AssetsListAPIView(ListAPIView):
         return Asset.objects.for_customer(self.request.user)
 
 
+class OperationHistoryPagination(KeysetCursorPagination):
+    ordering = ('-history_created_at', '-history_operation_id')  # type: ignore
+
+
 class OperationViewSet(ReadOnlyModelViewSet):
     serializer_class = OperationSerializer
 
-    pagination_class = CustomCursorPagination
+    pagination_class = OperationHistoryPagination
     page_size_query_param = 'cursor'  # TODO: WTF? Why `cursor`?
 
     def get_queryset(self):
+        user = self.request.user
+        qs = PaymentOperation.objects.history(user)
         try:
-            qs = PaymentOperation.objects.with_amounts(
-                self.request.user
-            ).for_user(
-                self.request.user,
-                only_allowed_assets=False
-            ).order_by('-created_at')
+            # history is read from summaries only, residency is resolved to hide
+            # operations of users from non supported countries
+            get_financial_context(user).residency_country
         except NonSupportedCountryException:
-            qs = PaymentOperation.objects.none()
+            qs = qs.none()
         return qs
 
     def retrieve(self, request, *args, **kwargs):
@@ -63,17 +71,54 @@ class OperationViewSet(ReadOnlyModelViewSet):
 class UploadOperationConfirmationAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request, pk):
-        user_accounts = UserAccount.objects.get_user_accounts(request.user)
-        operation = get_object_or_404(
-            Operation, transactions__account__in=user_accounts, pk=pk
+    def get_operation(self, pk):
+        return get_object_or_404(
+            Operation,
+            transactions__account__in=get_financial_context(self.request.user).allowed_account_ids,
+            pk=pk,
         )
+
+    def post(self, request, pk):
+        operation = self.get_operation(pk)
         serializer = UploadConfirmationRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save(operation=operation)
         return Response(status=status.HTTP_201_CREATED)
 
 
+class RequestOperationConfirmationUploadAPIView(UploadOperationConfirmationAPIView):
+    def post(self, request, pk):
+        operation = self.get_operation(pk)
+        serializer = RequestConfirmationUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = request_upload(
+            operation_upload_storage,
+            owner=operation.pk,
+            filename=serializer.validated_data['file_name'],
+            content_type=serializer.validated_data['content_type'],
+            min_size=1,
+            max_size=OperationConfirmationDocument.MAX_SIZE,
+        )
+        return Response({
+            'data': {
+                'token': upload.token,
+                'url': upload.url,
+                'fields': upload.fields,
+            }
+        })
+
+
+class FinalizeOperationConfirmationUploadAPIView(UploadOperationConfirmationAPIView):
+    def post(self, request, pk):
+        operation = self.get_operation(pk)
+        serializer = FinalizeConfirmationUploadSerializer(
+            data=request.data, context={'operation': operation}
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(status=status.HTTP_201_CREATED)
+
+
 class PaymentLimitsListAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
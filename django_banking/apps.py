@@ -5,3 +5,12 @@ from django.utils.translation import ugettext_lazy as _
 class DjangoBankingConfig(AppConfig):
     name = 'django_banking'
     verbose_name = _('Django Banking')
+
+    def ready(self):
+        """
+        Signals connection
+
+        :return:
+        """
+        import django_banking.signals.handler  # NOQA
+        import django_banking.checks  # NOQA
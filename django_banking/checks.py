@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.checks import (
+    Error,
+    register
+)
+
+#: backends keeping cached data in memory of single process
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """Check default cache is shared between processes.
+
+    Price snapshot refreshed by celery beat, price offers, registries and
+    limits usage are published to api and celery processes through it.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend not in PROCESS_LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        Error(
+            f'Default cache backend `{backend}` is not shared between processes.',
+            hint='Use database, memcached or redis cache backend.',
+            obj='CACHES',
+            id='django_banking.E001',
+        )
+    ]
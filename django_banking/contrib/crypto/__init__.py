@@ -0,0 +1 @@
+default_app_config = 'django_banking.contrib.crypto.apps.CryptoConfig'
@@ -1,4 +1,5 @@
 import json
+from collections import defaultdict
 
 from django.contrib import admin
 from django.db import transaction
@@ -13,8 +14,7 @@ from django_banking.admin.base import (
     BaseDepositWithdrawalOperationModelAdmin
 )
 from django_banking.admin.helpers import empty_value_display
-from django_banking.models import Account
-from django_banking.models.accounts.enum import AccountType
+from django_banking.models.assets.registry import asset_registry
 
 from ..models import (
     DepositCryptoOperation,
@@ -57,20 +57,14 @@ class DepositCryptoAccountAdmin(DjangoObjectActions, admin.ModelAdmin):
     @transaction.atomic()
     def add_via_json(self, request, queryset):
         if request.method == 'POST':
-            addresses = json.load(request.FILES['json'])
-
-            account_data = {
-                'type': AccountType.TYPE_PASSIVE,
-                'strict': True
-            }
-
-            accounts = []
-            for a in addresses:
-                account = Account.objects.create(asset_id=a['asset'], **account_data)
-                accounts.append(
-                    UserCryptoDepositAccount(address=a['address'], account=account)
+            addresses = defaultdict(list)
+            for a in json.load(request.FILES['json']):
+                addresses[a['asset']].append(a['address'])
+
+            for asset_id, asset_addresses in addresses.items():
+                UserCryptoDepositAccount.objects.add_addresses(
+                    asset_registry.get(asset_id), asset_addresses
                 )
-            UserCryptoDepositAccount.objects.bulk_create(accounts)
             return redirect('admin:payments_depositcryptoaccount_changelist')
         return render(request, template_name='admin/depositcryptoaccount/crypto_accounts_via_json.html')
 
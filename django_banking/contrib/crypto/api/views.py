@@ -1,5 +1,7 @@
 from django.shortcuts import get_object_or_404
+from rest_framework import status
 from rest_framework.decorators import permission_classes
+from rest_framework.exceptions import APIException
 from rest_framework.generics import (
     DestroyAPIView,
     ListCreateAPIView
@@ -15,9 +17,16 @@ from django_banking.contrib.crypto.models import (
 from django_banking.models import Asset
 
 from ...card.api.mixin import NonAtomicMixin
+from ..exceptions import AddressPoolExhausted
 from .serializers import CryptoAccountSerializer
 
 
+class DepositAddressUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'No deposit address available, try again later'
+    default_code = 'deposit_address_unavailable'
+
+
 class CryptoAccountListAPIView(ListCreateAPIView):
     serializer_class = CryptoAccountSerializer
 
@@ -51,9 +60,13 @@ class CryptoAccountDepositAPIView(APIView):
     def get(self, request, asset_id):
         asset = get_object_or_404(Asset, pk=asset_id)
 
-        deposit_account = UserCryptoDepositAccount.objects.for_customer(
-            user=request.user, asset=asset
-        )
+        try:
+            deposit_account = UserCryptoDepositAccount.objects.for_customer(
+                user=request.user, asset=asset
+            )
+        except AddressPoolExhausted:
+            # pool refill is already scheduled
+            raise DepositAddressUnavailable()
         return Response({
             "address": deposit_account.address,
         })
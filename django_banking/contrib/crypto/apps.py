@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+from django.utils.translation import ugettext_lazy as _
+
+
+class CryptoConfig(AppConfig):
+    name = 'django_banking.contrib.crypto'
+    verbose_name = _('Crypto')
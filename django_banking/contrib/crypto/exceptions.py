@@ -0,0 +1,8 @@
+class AddressPoolExhausted(Exception):
+
+    """No free deposit address left in pool for asset.
+    """
+
+    def __init__(self, asset):
+        self.asset = asset
+        super().__init__(f'No address in crypto deposit address pool for asset {asset}')
@@ -0,0 +1,270 @@
+"""Batched ingestion of chain deposit events.
+
+Events come from blockchain watchers as a stream (file or queue). Each batch
+is deduplicated by unique transfer index, resolved to deposit addresses with
+one query and posted to ledger with single bulk write. Transfers to addresses
+not bound to users yet are kept pending and settled once address is bound,
+see `settle_pending_transfers`.
+"""
+import json
+from decimal import Decimal
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    TextIO
+)
+from uuid import (
+    UUID,
+    uuid4
+)
+
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    transaction
+)
+
+from django_banking import logger
+from django_banking.core.prices import (
+    PriceSnapshot,
+    price_repository
+)
+from django_banking.models import (
+    Operation,
+    UserAccount
+)
+from django_banking.models.transactions.enum import OperationType
+from django_banking.models.transactions.posting import Posting
+from django_banking.settings import (
+    CRYPTO_DEPOSIT_BATCH_SIZE,
+    CRYPTO_DEPOSIT_CONFIRMATIONS
+)
+from django_banking.user import get_financial_context
+
+from .managers import get_total_price_metadata
+from .models import (
+    CryptoDepositTransfer,
+    UserCryptoDepositAccount
+)
+
+
+class CryptoDepositEvent(NamedTuple):
+    address: str
+    tx_hash: str
+    amount: Decimal
+    confirmations: int
+
+
+class IngestionResult(NamedTuple):
+    created: int = 0
+    duplicated: int = 0
+    unknown: int = 0
+    unconfirmed: int = 0
+    #: pending transfers credited once their address got bound
+    settled: int = 0
+
+    def __add__(self, other):
+        return IngestionResult(*(a + b for a, b in zip(self, other)))
+
+
+def read_deposit_events(file: TextIO) -> Iterator[CryptoDepositEvent]:
+    """Read events from JSON lines, one object with event fields per line.
+    """
+    for line in file:
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        yield CryptoDepositEvent(
+            address=data['address'],
+            tx_hash=data['tx_hash'],
+            amount=Decimal(str(data['amount'])),
+            confirmations=int(data['confirmations']),
+        )
+
+
+def ingest_deposit_batch(
+    events: List[CryptoDepositEvent], prices: PriceSnapshot = None, using: str = None
+) -> IngestionResult:
+    """Record transfers of confirmed events and post committed deposits for them.
+
+    Transfers already ingested, by this or concurrent process, are skipped by
+    unique index. Transfers to addresses not bound to users are recorded
+    without operation and stay pending.
+    """
+    using = using or DEFAULT_DB_ALIAS
+    if prices is None:
+        prices = price_repository.get_snapshot()
+    confirmed = {
+        (event.tx_hash, event.address): event
+        for event in events
+        if event.confirmations >= CRYPTO_DEPOSIT_CONFIRMATIONS
+    }
+    unconfirmed = sum(1 for event in events if event.confirmations < CRYPTO_DEPOSIT_CONFIRMATIONS)
+    if not confirmed:
+        return IngestionResult(unconfirmed=unconfirmed)
+
+    deposit_accounts = {
+        deposit_account.address: deposit_account
+        for deposit_account in UserCryptoDepositAccount.objects.db_manager(using).filter(
+            address__in={address for _, address in confirmed},
+        ).select_related('account', 'user')
+    }
+    transfers = [
+        CryptoDepositTransfer(
+            uuid=uuid4(),
+            tx_hash=event.tx_hash,
+            address=event.address,
+            amount=event.amount,
+            confirmations=event.confirmations,
+            deposit_account=deposit_accounts.get(event.address),
+        )
+        for event in confirmed.values()
+    ]
+
+    with transaction.atomic(using=using):
+        CryptoDepositTransfer.objects.db_manager(using).bulk_create(
+            transfers, ignore_conflicts=True
+        )
+        inserted = set(
+            CryptoDepositTransfer.objects.db_manager(using).filter(
+                pk__in=[transfer.pk for transfer in transfers],
+            ).values_list('pk', flat=True)
+        )
+        transfers = [transfer for transfer in transfers if transfer.pk in inserted]
+        payable = [
+            transfer for transfer in transfers
+            if transfer.deposit_account and transfer.deposit_account.user_id
+        ]
+        created = _settle(payable, prices, using)
+
+    return IngestionResult(
+        created=created,
+        duplicated=len(events) - unconfirmed - len(transfers),
+        unknown=len(transfers) - len(payable),
+        unconfirmed=unconfirmed,
+    )
+
+
+def settle_pending_transfers(
+    addresses: Iterable[str] = None, prices: PriceSnapshot = None, using: str = None
+) -> int:
+    """Post deposits for pending transfers to addresses bound to users since ingestion.
+
+    Transfers are settled in batches, each in its own db transaction. Pending
+    transfers locked by concurrent settlement are skipped.
+
+    :param addresses: settle transfers to these addresses only, all pending by default
+    :return: number of created deposits
+    """
+    using = using or DEFAULT_DB_ALIAS
+    if prices is None:
+        prices = price_repository.get_snapshot()
+    bound_accounts = UserCryptoDepositAccount.objects.db_manager(using).filter(user__isnull=False)
+    pending = CryptoDepositTransfer.objects.db_manager(using).pending().filter(
+        address__in=bound_accounts.values('address'),
+    )
+    if addresses is not None:
+        pending = pending.filter(address__in=addresses)
+
+    settled = 0
+    while True:
+        with transaction.atomic(using=using):
+            transfers = list(
+                pending.order_by('created_at').select_for_update(skip_locked=True)[
+                    :CRYPTO_DEPOSIT_BATCH_SIZE
+                ]
+            )
+            deposit_accounts = {
+                deposit_account.address: deposit_account
+                for deposit_account in bound_accounts.filter(
+                    address__in={transfer.address for transfer in transfers},
+                ).select_related('account', 'user')
+            }
+            for transfer in transfers:
+                transfer.deposit_account = deposit_accounts[transfer.address]
+            CryptoDepositTransfer.objects.db_manager(using).bulk_update(
+                transfers, ['deposit_account']
+            )
+            settled += _settle(transfers, prices, using)
+        if len(transfers) < CRYPTO_DEPOSIT_BATCH_SIZE:
+            return settled
+
+
+def _settle(transfers: List[CryptoDepositTransfer], prices: PriceSnapshot, using: str) -> int:
+    """Post committed deposits for transfers to addresses bound to users.
+    """
+    user_accounts = _get_user_accounts(transfers, using)
+    quote_assets: Dict[Any, UUID] = {}
+    postings = []
+    for transfer in transfers:
+        deposit_account = transfer.deposit_account
+        asset_id = deposit_account.account.asset_id
+        metadata = {'tx_hash': transfer.tx_hash}
+        user_id = deposit_account.user_id
+        if user_id not in quote_assets:
+            context = get_financial_context(deposit_account.user)
+            quote_assets[user_id] = context.main_fiat_asset.pk
+        metadata.update(
+            get_total_price_metadata(prices, asset_id, quote_assets[user_id], transfer.amount)
+        )
+        posting = Posting(type=OperationType.DEPOSIT, metadata=metadata)
+        posting.add(deposit_account.account, -transfer.amount)
+        posting.add(user_accounts[deposit_account.user_id, asset_id], transfer.amount)
+        postings.append(posting)
+    if postings:
+        Operation.objects.db_manager(using).post(postings, commit=True)
+
+    for transfer, posting in zip(transfers, postings):
+        transfer.operation = posting.operation
+    CryptoDepositTransfer.objects.db_manager(using).bulk_update(transfers, ['operation'])
+    return len(postings)
+
+
+def _get_user_accounts(transfers: List[CryptoDepositTransfer], using: str) -> Dict:
+    """Get user accounts credited by transfers keyed by user and asset ids.
+    """
+    keys = {
+        (deposit_account.user_id, deposit_account.account.asset_id): deposit_account
+        for deposit_account in (transfer.deposit_account for transfer in transfers)
+    }
+    user_accounts = {
+        (user_account.user_id, user_account.asset_id): user_account.account
+        for user_account in UserAccount.objects.db_manager(using).filter(
+            user__in={user_id for user_id, _ in keys},
+            asset__in={asset_id for _, asset_id in keys},
+        ).select_related('account')
+    }
+    for key, deposit_account in keys.items():
+        if key not in user_accounts:
+            user_accounts[key] = UserAccount.objects.db_manager(using).for_customer(
+                deposit_account.user, deposit_account.account.asset
+            )
+    return user_accounts
+
+
+def ingest_deposit_events(
+    events: Iterable[CryptoDepositEvent],
+    prices: PriceSnapshot = None,
+    batch_size: int = None,
+    using: str = None,
+) -> IngestionResult:
+    """Ingest stream of chain deposit events in batches.
+    """
+    batch_size = batch_size or CRYPTO_DEPOSIT_BATCH_SIZE
+    events = iter(events)
+    result = IngestionResult()
+    while True:
+        batch = list(islice(events, batch_size))
+        if not batch:
+            break
+        result += ingest_deposit_batch(batch, prices=prices, using=using)
+    result += IngestionResult(settled=settle_pending_transfers(prices=prices, using=using))
+    logger.info(
+        'Crypto deposits ingested: %s created, %s duplicated, %s unknown, %s unconfirmed, '
+        '%s pending settled', *result
+    )
+    return result
@@ -0,0 +1,36 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from ...ingestion import (
+    ingest_deposit_events,
+    read_deposit_events
+)
+
+
+class Command(BaseCommand):
+    help = 'Ingest chain deposit events from JSON lines file and post deposits for confirmed ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Events file path, - to read from stdin')
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Number of events posted in single db transaction',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if path == '-':
+            result = ingest_deposit_events(
+                read_deposit_events(sys.stdin), batch_size=options['batch_size']
+            )
+        else:
+            with open(path) as file:
+                result = ingest_deposit_events(
+                    read_deposit_events(file), batch_size=options['batch_size']
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.created} deposits created, {result.duplicated} duplicates skipped, "
+            f"{result.unknown} to unknown addresses, {result.unconfirmed} unconfirmed, "
+            f"{result.settled} pending settled"
+        ))
@@ -1,53 +1,193 @@
 import logging
 from decimal import Decimal
-from typing import Dict
+from typing import (
+    Dict,
+    Iterable
+)
 
+from django.core.cache import cache
 from django.db import (
+    IntegrityError,
     models,
     transaction
 )
+from django.utils.module_loading import import_string
 
+from django_banking.core.prices import (
+    PriceSnapshot,
+    price_repository
+)
 from django_banking.models import (
+    Account,
     Asset,
     Operation,
     UserAccount
 )
+from django_banking.models.accounts.enum import AccountType
 from django_banking.models.transactions.queryset import OperationQuerySet
-from django_banking.user import User
+from django_banking.settings import (
+    CRYPTO_ADDRESS_GENERATOR,
+    CRYPTO_ADDRESS_POOL_LOW_WATER_MARK,
+    CRYPTO_ADDRESS_POOL_SIZE
+)
+from django_banking.user import (
+    User,
+    get_financial_context
+)
+
+from .exceptions import AddressPoolExhausted
 
 logger = logging.getLogger(__name__)
 
+#: seconds before lost refill task can be enqueued again
+ADDRESS_POOL_REFILL_TIMEOUT = 600
+
 
 class CryptoAccountManager(models.Manager):
     pass
 
 
+class CryptoDepositTransferManager(models.Manager):
+    def pending(self):
+        """Transfers not credited to any user yet.
+        """
+        return self.filter(operation__isnull=True)
+
+
+def address_pool_refill_cache_key(asset_id) -> str:
+    return f'django_banking:crypto_address_pool:refill:{asset_id}'
+
+
 class DepositCryptoAccountManager(models.Manager):
+
+    """Pool of pre-generated deposit addresses.
+    """
+
+    def free(self, asset: Asset):
+        return self.filter(user__isnull=True, asset=asset)
+
     def for_customer(self, user: User, asset: Asset):
-        with transaction.atomic():
-            try:
-                deposit_account = self.get(user=user, account__asset=asset)
-                logger.debug("Use already binded account %s for %s deposits.",
-                             deposit_account, user)
-            except self.model.DoesNotExist:
-                deposit_account = self.filter(
-                    user__isnull=True, account__asset=asset
-                ).select_for_update().first()
-
-                if deposit_account is None:
-                    logger.error(
-                        "%s asset has no active deposit crypto account. "
-                        "Can't acquired account for %s",
-                        asset, user
-                    )
-                    raise Exception(
-                        "No address in crypto account withdrawal pool for asset "
-                        "%s" % asset
-                    )
-                logger.info("Account %s binded to user %s", deposit_account, user)
-                deposit_account.user = user
-                deposit_account.save()
+        deposit_account = self.filter(user=user, asset=asset).first()
+        if deposit_account is not None:
+            logger.debug("Use already binded account %s for %s deposits.", deposit_account, user)
             return deposit_account
+        return self.allocate(user, asset)
+
+    def allocate(self, user: User, asset: Asset):
+        """Bind free pool address to user.
+
+        Free rows locked by concurrent allocations are skipped, so they take
+        different addresses without waiting for each other. Address bound to
+        the same user concurrently is returned instead of a new one.
+        """
+        with transaction.atomic(using=self.db):
+            deposit_account = self.free(asset).select_for_update(skip_locked=True).first()
+            if deposit_account is not None:
+                return self._bind(deposit_account, user, asset)
+
+        logger.error(
+            "%s asset has no free deposit crypto account. Can't acquire account for %s",
+            asset, user
+        )
+        self.schedule_refill(asset)
+        raise AddressPoolExhausted(asset)
+
+    def _bind(self, deposit_account, user: User, asset: Asset):
+        deposit_account.user = user
+        try:
+            with transaction.atomic(using=self.db):
+                deposit_account.save(update_fields=('user',))
+        except IntegrityError:
+            return self.get(user=user, asset=asset)
+        logger.info("Account %s binded to user %s", deposit_account, user)
+        self.schedule_settlement(deposit_account)
+
+        low_water_mark = CRYPTO_ADDRESS_POOL_LOW_WATER_MARK
+        if self.free(asset)[:low_water_mark].count() < low_water_mark:
+            self.schedule_refill(asset)
+        return deposit_account
+
+    def schedule_settlement(self, deposit_account):
+        """Enqueue settlement of transfers received by address before it was bound.
+        """
+        from .models import CryptoDepositTransfer
+        from .tasks import settle_pending_deposits_task
+        address = deposit_account.address
+        pending = CryptoDepositTransfer.objects.db_manager(self.db).pending()
+        if pending.filter(address=address).exists():
+            transaction.on_commit(
+                lambda: settle_pending_deposits_task.delay(address=address), using=self.db
+            )
+
+    def schedule_refill(self, asset: Asset):
+        """Enqueue pool refill, at most one at a time per asset.
+
+        Refill is enqueued once current transaction is committed (right away
+        outside of transaction), throttling key is set only at that moment, so
+        rolled back allocations don't block refills.
+        """
+        transaction.on_commit(lambda: self._enqueue_refill(asset), using=self.db)
+
+    @staticmethod
+    def _enqueue_refill(asset: Asset):
+        from .tasks import refill_address_pool_task
+        key = address_pool_refill_cache_key(asset.pk)
+        if not cache.add(key, True, ADDRESS_POOL_REFILL_TIMEOUT):
+            return
+        try:
+            refill_address_pool_task.delay(asset_id=str(asset.pk))
+        except Exception:
+            cache.delete(key)
+            raise
+
+    def refill(self, asset: Asset) -> int:
+        """Top up free addresses up to pool size with addresses from configured generator.
+        """
+        if not CRYPTO_ADDRESS_GENERATOR:
+            logger.warning("No crypto address generator configured, fill %s pool manually", asset)
+            return 0
+        missing = CRYPTO_ADDRESS_POOL_SIZE - self.free(asset).count()
+        if missing <= 0:
+            return 0
+        return self.add_addresses(asset, import_string(CRYPTO_ADDRESS_GENERATOR)(asset, missing))
+
+    def add_addresses(self, asset: Asset, addresses: Iterable[str]) -> int:
+        """Bulk insert free addresses with their bookkeeping accounts.
+
+        Already known addresses are skipped.
+        """
+        addresses = list(dict.fromkeys(addresses))
+        known = set(self.filter(address__in=addresses).values_list('address', flat=True))
+        addresses = [address for address in addresses if address not in known]
+        accounts = [
+            Account(asset=asset, type=AccountType.TYPE_PASSIVE, strict=True) for _ in addresses
+        ]
+        with transaction.atomic(using=self.db):
+            Account.objects.db_manager(self.db).bulk_create(accounts)
+            self.bulk_create([
+                self.model(address=address, account=account, asset=asset)
+                for address, account in zip(addresses, accounts)
+            ])
+        return len(addresses)
+
+
+def get_total_price_metadata(
+    prices: PriceSnapshot, base_asset_id, quote_asset_id, amount: Decimal
+) -> Dict:
+    """Get deposit valuation metadata, empty if price of assets pair isn't available.
+    """
+    price = prices.get((base_asset_id, quote_asset_id))
+    if price is None:
+        return {}
+    return {
+        'total_price': {
+            'base_asset_id': str(base_asset_id),
+            'quote_asset_id': str(quote_asset_id),
+            'sell_price': str(price.sell),
+            'buy_price': str(price.buy),
+            'total': str(price.sell * amount),
+        }
+    }
 
 
 class DepositCryptoOperationManager(models.Manager):
@@ -59,26 +199,16 @@ class DepositCryptoOperationManager(models.Manager):
         assert isinstance(deposit_crypto_account, UserCryptoDepositAccount)
         user = deposit_crypto_account.user
         asset = deposit_crypto_account.account.asset
-        # TODO
-        asset_pair = AssetPair.objects.get(
-            base=asset,
-            quote__country__iexact=user.get_residency_country_code(),
-        )
-        price = price_repository.get_by_pair_id(asset_pair.pk)
+        quote_asset = get_financial_context(user).main_fiat_asset
         account = UserAccount.objects.for_customer(user=user, asset=asset)
         operation = Operation.objects.create_deposit(
             payment_method_account=deposit_crypto_account.account,
             user_account=account,
             amount=amount,
             metadata={
-                'total_price': {
-                    'asset_pair_id': str(asset_pair.pk),
-                    'base_asset_id': str(asset.pk),
-                    'quote_asset_id': str(asset_pair.quote.pk),
-                    'sell_price': str(price.sell),
-                    'buy_price': str(price.buy),
-                    'total': str(price.sell * amount)
-                },
+                **get_total_price_metadata(
+                    price_repository.get_snapshot(), asset.pk, quote_asset.pk, amount
+                ),
                 **(metadata or {})
             }
         )
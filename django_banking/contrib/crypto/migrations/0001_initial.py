@@ -0,0 +1,95 @@
+# Generated by Django 3.0.3 on 2026-10-18 03:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.DJANGO_BANKING_USER_MODEL),
+        ('django_banking', '0017_operation_finalized_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepositCryptoOperation',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('django_banking.operation',),
+        ),
+        migrations.CreateModel(
+            name='WithdrawalCryptoOperation',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('django_banking.operation',),
+        ),
+        migrations.CreateModel(
+            name='UserCryptoDepositAccount',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('address', models.CharField(db_index=True, max_length=128, unique=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='django_banking.Account')),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='django_banking.Asset')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, to=settings.DJANGO_BANKING_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'django_banking_usercryptodepositaccount',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserCryptoAccount',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('address', models.CharField(max_length=128)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='django_banking.Account')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to=settings.DJANGO_BANKING_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'django_banking_usercryptoaccount',
+            },
+        ),
+        migrations.CreateModel(
+            name='CryptoDepositTransfer',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('tx_hash', models.CharField(max_length=128)),
+                ('address', models.CharField(max_length=128)),
+                ('amount', models.DecimalField(decimal_places=6, max_digits=16)),
+                ('confirmations', models.PositiveIntegerField()),
+                ('deposit_account', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='transfers', to='crypto.UserCryptoDepositAccount')),
+                ('operation', models.OneToOneField(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='crypto_transfer', to='django_banking.Operation')),
+            ],
+            options={
+                'db_table': 'django_banking_cryptodeposittransfer',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='usercryptodepositaccount',
+            index=models.Index(condition=models.Q(user__isnull=True), fields=['asset', 'uuid'], name='crypto_deposit_account_free'),
+        ),
+        migrations.AddConstraint(
+            model_name='usercryptodepositaccount',
+            constraint=models.UniqueConstraint(fields=('user', 'asset'), name='crypto_deposit_account_unique_user_asset'),
+        ),
+        migrations.AddConstraint(
+            model_name='cryptodeposittransfer',
+            constraint=models.UniqueConstraint(fields=('tx_hash', 'address'), name='crypto_deposit_transfer_unique_tx_address'),
+        ),
+    ]
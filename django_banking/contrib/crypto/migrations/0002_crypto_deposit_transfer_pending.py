@@ -0,0 +1,17 @@
+# Generated by Django 3.0.3 on 2026-10-18 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crypto', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cryptodeposittransfer',
+            index=models.Index(condition=models.Q(operation__isnull=True), fields=['address'], name='crypto_deposit_pending'),
+        ),
+    ]
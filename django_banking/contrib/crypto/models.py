@@ -3,14 +3,20 @@ from uuid import uuid4
 from django.db import models
 
 from django_banking import module_name
-from django_banking.settings import USER_MODEL
+from django_banking.settings import (
+    ACCOUNTING_DECIMAL_PLACES,
+    ACCOUNTING_MAX_DIGITS,
+    USER_MODEL
+)
 
 from ...models import (
     Account,
+    Asset,
     Operation
 )
 from .managers import (
     CryptoAccountManager,
+    CryptoDepositTransferManager,
     DepositCryptoAccountManager,
     DepositCryptoOperationManager,
     WithdrawalCryptoOperationManager
@@ -40,10 +46,16 @@ class UserCryptoAccount(models.Model):
 
 
 class UserCryptoDepositAccount(models.Model):
+
+    """Deposit address from pre-generated pool, bound to user on first request.
+    """
+
     uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     user = models.ForeignKey(to=USER_MODEL, on_delete=models.PROTECT, null=True)
 
     account = models.ForeignKey(Account, on_delete=models.PROTECT)
+    #: copy of account asset to pick free addresses without join
+    asset = models.ForeignKey(Asset, on_delete=models.PROTECT, related_name='+')
 
     address = models.CharField(max_length=128, unique=True, db_index=True)
 
@@ -51,11 +63,68 @@ class UserCryptoDepositAccount(models.Model):
 
     class Meta:
         db_table = f'{module_name}_usercryptodepositaccount'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'asset'], name='crypto_deposit_account_unique_user_asset',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['asset', 'uuid'], name='crypto_deposit_account_free',
+                condition=models.Q(user__isnull=True),
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.asset_id is None:
+            self.asset_id = self.account.asset_id
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.account.asset} - {self.address} ({self.user})"
 
 
+class CryptoDepositTransfer(models.Model):
+
+    """Chain transfer to deposit address, ingested once per transaction and address.
+    """
+
+    uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    tx_hash = models.CharField(max_length=128)
+    address = models.CharField(max_length=128)
+    amount = models.DecimalField(
+        max_digits=ACCOUNTING_MAX_DIGITS, decimal_places=ACCOUNTING_DECIMAL_PLACES
+    )
+    confirmations = models.PositiveIntegerField()
+
+    #: empty if address isn't bound to any user
+    deposit_account = models.ForeignKey(
+        UserCryptoDepositAccount, null=True, on_delete=models.PROTECT, related_name='transfers'
+    )
+    #: empty until deposit is posted, see `pending`
+    operation = models.OneToOneField(
+        Operation, null=True, on_delete=models.PROTECT, related_name='crypto_transfer'
+    )
+
+    objects = CryptoDepositTransferManager()
+
+    class Meta:
+        db_table = f'{module_name}_cryptodeposittransfer'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tx_hash', 'address'], name='crypto_deposit_transfer_unique_tx_address',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['address'], name='crypto_deposit_pending',
+                condition=models.Q(operation__isnull=True),
+            ),
+        ]
+
+
 class DepositCryptoOperation(Operation):
     objects = DepositCryptoOperationManager()
 
@@ -0,0 +1,26 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.core.cache import cache
+
+from django_banking.models.assets.registry import asset_registry
+
+from .ingestion import settle_pending_transfers
+from .managers import address_pool_refill_cache_key
+from .models import UserCryptoDepositAccount
+
+logger = get_task_logger(__name__)
+
+
+@shared_task()
+def refill_address_pool_task(asset_id):
+    try:
+        created = UserCryptoDepositAccount.objects.refill(asset_registry.get(asset_id))
+    finally:
+        cache.delete(address_pool_refill_cache_key(asset_id))
+    logger.info("%s addresses added to %s deposit address pool", created, asset_id)
+
+
+@shared_task()
+def settle_pending_deposits_task(address):
+    settled = settle_pending_transfers(addresses=[address])
+    logger.info("%s pending deposits to %s settled", settled, address)
@@ -20,6 +20,7 @@ from ..models import (
     ColdBankAccount,
     DepositWireTransferOperation,
     RefundWireTransferOperation,
+    UnmatchedStatementLine,
     WithdrawalWireTransferOperation
 )
 from ..signals import (
@@ -183,3 +184,38 @@ class RefundWireTransferOperationModelAdmin(BaseDepositWithdrawalOperationModelA
         }), obj.references['deposit']
 
     deposit_link.short_description = 'deposit'
+
+
+@admin.register(UnmatchedStatementLine)
+class UnmatchedStatementLineModelAdmin(admin.ModelAdmin):
+    list_display = (
+        'statement',
+        'line_number',
+        'booked_at',
+        'amount',
+        'currency',
+        'reason',
+        'reference_code',
+        'is_resolved',
+    )
+    list_filter = (
+        'is_resolved',
+        'reason',
+        'currency',
+    )
+    search_fields = (
+        'statement',
+        'reference',
+        'reference_code',
+        'iban_number',
+    )
+    ordering = ('-created_at', 'statement', 'line_number')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def get_readonly_fields(self, request, obj=None):
+        return [field.name for field in self.model._meta.fields if field.name != 'is_resolved']
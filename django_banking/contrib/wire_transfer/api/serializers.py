@@ -23,11 +23,18 @@ from django_banking.contrib.wire_transfer.signals import (
     wire_transfer_deposit_requested
 )
 from django_banking.core.utils import get_client_ip
-from django_banking.limitations.exceptions import OutOfLimitsException
-from django_banking.limitations.utils import validate_by_limits
+from django_banking.limitations.exceptions import (
+    LimitExceededException,
+    OutOfLimitsException
+)
+from django_banking.limitations.utils import (
+    validate_by_limits,
+    validate_limits_available
+)
 from django_banking.models import UserAccount
 from django_banking.models.accounts.exceptions import AccountingException
 from django_banking.models.transactions.enum import OperationType
+from django_banking.user import get_financial_context
 from django_banking.utils import generate_deposit_reference_code
 
 
@@ -98,7 +105,7 @@ class WireTransferDepositSerializer(serializers.ModelSerializer):
                 self.user
             )
         except ColdBankAccount.DoesNotExist:
-            country_code = self.user.get_residency_country_code()
+            country_code = get_financial_context(self.user).residency_country
             # Return 500 in case we have no deposit bank account available
             logger.error("No active deposit bank account found for %s country",
                          country_code)
@@ -114,8 +121,12 @@ class WireTransferDepositSerializer(serializers.ModelSerializer):
         except OutOfLimitsException as e:
             raise ValidationError(f'Amount should be greater than {e.bottom_limit}')
 
-        # TODO
-        # check limit exceed and reject operation if it was
+        try:
+            validate_limits_available(
+                self.user, OperationType.DEPOSIT, self.user_bank_account.account.asset, value
+            )
+        except LimitExceededException as e:
+            raise ValidationError(f'Amount should be less than {e.limit.available}')
 
         return sanitize_amount(
             value,
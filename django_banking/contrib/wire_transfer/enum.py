@@ -0,0 +1,15 @@
+class StatementFormat:
+    CSV = 'csv'
+    MT940 = 'mt940'
+    CAMT053 = 'camt053'
+
+
+class StatementLineMismatch:
+    NO_REFERENCE = 'no_reference'
+    UNKNOWN_REFERENCE = 'unknown_reference'
+    AMBIGUOUS_REFERENCE = 'ambiguous'
+    DUPLICATE = 'duplicate'
+    AMOUNT_MISMATCH = 'amount'
+    CURRENCY_MISMATCH = 'currency'
+    IBAN_MISMATCH = 'iban'
+    SETTLEMENT_FAILED = 'settlement'
@@ -0,0 +1,62 @@
+import os
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+from django.utils.module_loading import import_string
+
+from django_banking.settings import WIRE_TRANSFER_STATEMENT_MATCHER
+
+from ...enum import StatementFormat
+from ...statements import (
+    PARSERS,
+    StatementFormatError,
+    parse_statement
+)
+
+EXTENSION_FORMATS = {
+    '.csv': StatementFormat.CSV,
+    '.sta': StatementFormat.MT940,
+    '.mt940': StatementFormat.MT940,
+    '.xml': StatementFormat.CAMT053,
+}
+
+
+class Command(BaseCommand):
+    help = 'Import bank statement, settle matched pending deposits and queue unmatched lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Statement file path')
+        parser.add_argument(
+            '--format', choices=sorted(PARSERS),
+            help='Statement file format, guessed by file extension if omitted',
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Number of matched payments settled in single db transaction',
+        )
+        parser.add_argument(
+            '--name',
+            help='Statement name used to identify queued unmatched lines, file name by default',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        format = options['format'] or EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower())
+        if format is None:
+            raise CommandError(f"Can't guess format of {path}, specify it explicitly")
+
+        matcher = import_string(WIRE_TRANSFER_STATEMENT_MATCHER)(
+            statement=options['name'] or os.path.basename(path),
+            batch_size=options['batch_size'],
+        )
+        try:
+            with open(path, 'rb') as file:
+                result = matcher.run(parse_statement(file, format))
+        except StatementFormatError as exc:
+            raise CommandError(f"Statement import stopped, preceding lines are processed. {exc}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.matched} lines matched, {result.unmatched} queued as unmatched, "
+            f"{result.skipped} already settled"
+        ))
@@ -1,5 +1,13 @@
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.db import models
+from django.db.models import (
+    F,
+    Value
+)
+from django.db.models.functions import (
+    Replace,
+    Upper
+)
 
 from django_banking.models import (
     Account,
@@ -9,6 +17,8 @@ from django_banking.models.accounts.enum import AccountType
 from django_banking.models.transactions.managers import OperationManager
 from django_banking.models.transactions.queryset import OperationQuerySet
 
+from .statements import normalize_iban
+
 
 class BankAccountManager(models.Manager):
     def create(self, **kwargs):
@@ -19,6 +29,13 @@ class BankAccountManager(models.Manager):
             )
         return super().create(**kwargs)
 
+    def with_iban(self, iban: str):
+        """Filter bank accounts by IBAN, spaces and letter case are ignored on both sides.
+        """
+        return self.annotate(
+            normalized_iban=Upper(Replace(F('iban_number'), Value(' '), Value(''))),
+        ).filter(normalized_iban=normalize_iban(iban))
+
 
 class DepositBankAccountManager(models.Manager):
 
@@ -0,0 +1,305 @@
+import re
+from decimal import (
+    Decimal,
+    InvalidOperation
+)
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple
+)
+
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    transaction
+)
+from django.db.models import (
+    OuterRef,
+    Subquery
+)
+
+from django_banking import logger
+from django_banking.models import Operation
+from django_banking.models.transactions.enum import (
+    OperationStatus,
+    OperationType
+)
+from django_banking.models.transactions.models import Transaction
+from django_banking.settings import STATEMENT_IMPORT_BATCH_SIZE
+
+from .enum import StatementLineMismatch
+from .models import (
+    DepositWireTransferOperation,
+    UnmatchedStatementLine,
+    UserBankAccount
+)
+from .signals import wire_transfer_deposit_approved
+from .statements import (
+    StatementLine,
+    normalize_iban
+)
+
+
+class Candidate(NamedTuple):
+
+    """Pending payment which can be settled by statement line.
+
+    Empty `iban` matches any sender account.
+    """
+
+    reference_code: str
+    amount: Optional[Decimal]
+    currency: str
+    iban: str
+    target: Any
+
+
+Match = Tuple[StatementLine, Candidate]
+
+
+class StatementImportResult(NamedTuple):
+    matched: int
+    unmatched: int
+    #: lines settled by previous imports of overlapping statements
+    skipped: int = 0
+
+
+class StatementMatcher:
+
+    """Match bank statement lines to pending wire transfer deposits and settle them.
+
+    Pending deposits are loaded into in-memory index once per run, so lines
+    are matched without queries. Matched deposits are committed in batches,
+    one db transaction per batch and savepoint per deposit, failed ones are
+    queued as unmatched. Subclasses can add candidates of other kinds by
+    extending `load_candidates` and `settle`.
+
+    Settled deposits keep fingerprint of their statement line, so lines of
+    overlapping statements imported again are skipped. Reference code shared
+    by several payments isn't matched automatically.
+    """
+
+    reference_code_re = re.compile(r'DEPOSIT-\d{3}-\d{3}-\d{3}')
+
+    def __init__(self, statement: str, batch_size: int = None, using: str = None):
+        self.statement = statement
+        self.batch_size = batch_size or STATEMENT_IMPORT_BATCH_SIZE
+        self.using = using or DEFAULT_DB_ALIAS
+
+    def load_candidates(self) -> Iterator[Candidate]:
+        operations = DepositWireTransferOperation.objects.db_manager(self.using).filter(
+            status=OperationStatus.HOLD,
+            reference_code__isnull=False,
+        )
+        ibans = dict(
+            UserBankAccount.objects.db_manager(self.using).filter(
+                pk__in=operations.values('user_bank_account_uuid'),
+            ).values_list('uuid', 'iban_number')
+        )
+        currency = Transaction.objects.filter(
+            operation=OuterRef('pk'), amount__gt=0,
+        ).values('account__asset__symbol')[:1]
+        for operation in operations.annotate(currency=Subquery(currency)).iterator():
+            amount: Optional[Decimal]
+            try:
+                amount = Decimal(operation.references['amount'])
+            except (KeyError, InvalidOperation):
+                amount = None
+            yield Candidate(
+                reference_code=operation.reference_code,
+                amount=amount,
+                currency=operation.currency,
+                iban=normalize_iban(ibans.get(operation.user_bank_account_uuid)),
+                target=operation,
+            )
+
+    def load_settled(self) -> Tuple[Set[str], Set[str]]:
+        """Load reference codes of settled deposits and fingerprints of lines they were settled by.
+        """
+        codes: Set[str] = set()
+        fingerprints: Set[str] = set()
+        settled = Operation.objects.db_manager(self.using).filter(
+            type=OperationType.DEPOSIT,
+            status=OperationStatus.COMMITTED,
+            reference_code__isnull=False,
+        ).values_list('reference_code', 'references__statement_line')
+        for code, fingerprint in settled.iterator():
+            codes.add(code)
+            if fingerprint:
+                fingerprints.add(fingerprint)
+        return codes, fingerprints
+
+    def settle(self, candidate: Candidate, line: StatementLine) -> Operation:
+        """Apply matched payment.
+
+        :return: committed deposit operation
+        """
+        operation = candidate.target
+        operation.commit()
+        transaction.on_commit(
+            lambda: wire_transfer_deposit_approved.send(
+                sender=DepositWireTransferOperation, instance=operation, user_ip_address=None
+            ),
+            using=self.using,
+        )
+        return operation
+
+    def get_pending(self, candidates: List[Candidate]) -> Set[Any]:
+        """Get primary keys of candidates which are still pending since index was loaded.
+        """
+        return set(
+            Operation.objects.db_manager(self.using).filter(
+                pk__in=[candidate.target.pk for candidate in candidates],
+                status=OperationStatus.HOLD,
+            ).values_list('pk', flat=True)
+        )
+
+    def match(
+        self,
+        line: StatementLine,
+        index: Dict[str, Candidate],
+        settled: Set[str],
+        ambiguous: Set[str],
+    ) -> Tuple[Optional[Candidate], str, str]:
+        """Find candidate for statement line.
+
+        Returns matched candidate, or mismatch reason and reference code of rejected candidate.
+        """
+        codes = self.reference_code_re.findall(line.reference.upper())
+        if not codes:
+            return None, StatementLineMismatch.NO_REFERENCE, ''
+        code = next(
+            (code for code in codes if code in index or code in settled or code in ambiguous),
+            None,
+        )
+        if code is None:
+            return None, StatementLineMismatch.UNKNOWN_REFERENCE, ''
+        if code in ambiguous:
+            return None, StatementLineMismatch.AMBIGUOUS_REFERENCE, code
+        if code in settled:
+            return None, StatementLineMismatch.DUPLICATE, code
+        candidate = index[code]
+        if candidate.amount != line.amount:
+            return None, StatementLineMismatch.AMOUNT_MISMATCH, code
+        if candidate.currency != line.currency:
+            return None, StatementLineMismatch.CURRENCY_MISMATCH, code
+        if candidate.iban and candidate.iban != line.iban:
+            return None, StatementLineMismatch.IBAN_MISMATCH, code
+        return candidate, '', code
+
+    def build_index(self, settled: Set[str]) -> Tuple[Dict[str, Candidate], Set[str]]:
+        """Index pending candidates by reference code.
+
+        :return: index and reference codes shared by several payments, settled ones included
+        """
+        index: Dict[str, Candidate] = {}
+        ambiguous: Set[str] = set()
+        for candidate in self.load_candidates():
+            code = candidate.reference_code
+            if code in index or code in ambiguous or code in settled:
+                ambiguous.add(code)
+                index.pop(code, None)
+            else:
+                index[code] = candidate
+        if ambiguous:
+            logger.warning(
+                'Statement %s: reference codes %s are shared by several payments',
+                self.statement, ', '.join(sorted(ambiguous)),
+            )
+        return index, ambiguous
+
+    def run(self, lines: Iterable[StatementLine]) -> StatementImportResult:
+        settled, settled_lines = self.load_settled()
+        index, ambiguous = self.build_index(settled)
+        matches: List[Match] = []
+        unmatched: List[UnmatchedStatementLine] = []
+        matched_count = unmatched_count = skipped_count = 0
+
+        try:
+            for line in lines:
+                if line.fingerprint in settled_lines:
+                    skipped_count += 1
+                    continue
+                candidate, reason, code = self.match(line, index, settled, ambiguous)
+                if candidate is None:
+                    unmatched.append(self._unmatched(line, reason, code))
+                else:
+                    settled.add(code)
+                    del index[code]
+                    matches.append((line, candidate))
+
+                if len(matches) >= self.batch_size:
+                    failed = self._settle_batch(matches)
+                    matched_count += len(matches) - len(failed)
+                    unmatched.extend(failed)
+                    matches = []
+                if len(unmatched) >= self.batch_size:
+                    unmatched_count += self._save_unmatched(unmatched)
+                    unmatched = []
+        finally:
+            # lines read before statement parsing failed are processed too
+            failed = self._settle_batch(matches)
+            matched_count += len(matches) - len(failed)
+            unmatched_count += self._save_unmatched([*unmatched, *failed])
+
+        logger.info(
+            'Statement %s imported: %s lines matched, %s unmatched, %s already settled',
+            self.statement, matched_count, unmatched_count, skipped_count,
+        )
+        return StatementImportResult(
+            matched=matched_count, unmatched=unmatched_count, skipped=skipped_count
+        )
+
+    def _settle_batch(self, matches: List[Match]) -> List[UnmatchedStatementLine]:
+        if not matches:
+            return []
+        failed = []
+        with transaction.atomic(using=self.using):
+            pending = self.get_pending([candidate for _, candidate in matches])
+            for line, candidate in matches:
+                code = candidate.reference_code
+                if candidate.target.pk not in pending:
+                    failed.append(self._unmatched(line, StatementLineMismatch.DUPLICATE, code))
+                    continue
+                try:
+                    with transaction.atomic(using=self.using):
+                        operation = self.settle(candidate, line)
+                        operation.references['statement_line'] = line.fingerprint
+                        Operation.objects.db_manager(self.using).filter(pk=operation.pk).update(
+                            references=operation.references
+                        )
+                except Exception:
+                    logger.exception(
+                        'Statement %s line %s settlement of %s failed',
+                        self.statement, line.line_number, code,
+                    )
+                    reason = StatementLineMismatch.SETTLEMENT_FAILED
+                    failed.append(self._unmatched(line, reason, code))
+        return failed
+
+    def _unmatched(self, line: StatementLine, reason: str, code: str) -> UnmatchedStatementLine:
+        return UnmatchedStatementLine(
+            statement=self.statement,
+            line_number=line.line_number,
+            booked_at=line.booked_at,
+            amount=line.amount,
+            currency=line.currency,
+            iban_number=line.iban,
+            reference=line.reference,
+            reason=reason,
+            reference_code=code,
+        )
+
+    def _save_unmatched(self, lines: List[UnmatchedStatementLine]) -> int:
+        """Queue unmatched lines, lines queued by previous import of the same statement are kept.
+        """
+        UnmatchedStatementLine.objects.db_manager(self.using).bulk_create(
+            lines, ignore_conflicts=True
+        )
+        return len(lines)
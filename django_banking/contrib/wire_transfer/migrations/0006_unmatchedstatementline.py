@@ -0,0 +1,38 @@
+# Generated by Django 3.0.3 on 2026-10-18 02:11
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wire_transfer', '0005_auto_20200204_1613'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnmatchedStatementLine',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('statement', models.CharField(max_length=320)),
+                ('line_number', models.PositiveIntegerField()),
+                ('booked_at', models.DateField(null=True)),
+                ('amount', models.DecimalField(decimal_places=6, max_digits=16)),
+                ('currency', models.CharField(max_length=3)),
+                ('iban_number', models.CharField(blank=True, max_length=34)),
+                ('reference', models.TextField(blank=True)),
+                ('reason', models.CharField(choices=[('no_reference', 'No reference code'), ('unknown_reference', 'Unknown reference code'), ('duplicate', 'Duplicate payment'), ('amount', 'Amount mismatch'), ('currency', 'Currency mismatch'), ('iban', 'IBAN mismatch'), ('settlement', 'Settlement failed')], max_length=20)),
+                ('reference_code', models.CharField(blank=True, max_length=100)),
+                ('is_resolved', models.BooleanField(db_index=True, default=False)),
+            ],
+            options={
+                'db_table': 'django_banking_unmatchedstatementline',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='unmatchedstatementline',
+            constraint=models.UniqueConstraint(fields=('statement', 'line_number'), name='unmatched_statement_line_unique'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.3 on 2026-10-18 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wire_transfer', '0006_unmatchedstatementline'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='unmatchedstatementline',
+            name='reason',
+            field=models.CharField(choices=[('no_reference', 'No reference code'), ('unknown_reference', 'Unknown reference code'), ('ambiguous', 'Reference code of several payments'), ('duplicate', 'Duplicate payment'), ('amount', 'Amount mismatch'), ('currency', 'Currency mismatch'), ('iban', 'IBAN mismatch'), ('settlement', 'Settlement failed')], max_length=20),
+        ),
+    ]
@@ -4,6 +4,7 @@ from django.db import models
 from django.utils.functional import cached_property
 
 from django_banking import module_name
+from django_banking.contrib.wire_transfer.enum import StatementLineMismatch
 from django_banking.contrib.wire_transfer.managers import (
     BankAccountManager,
     DepositBankAccountManager,
@@ -15,7 +16,11 @@ from django_banking.models import (
     Account,
     Operation
 )
-from django_banking.settings import USER_MODEL
+from django_banking.settings import (
+    ACCOUNTING_DECIMAL_PLACES,
+    ACCOUNTING_MAX_DIGITS,
+    USER_MODEL
+)
 
 
 class ColdBankAccount(models.Model):
@@ -90,10 +95,6 @@ class DepositWireTransferOperation(Operation):
     def amount(self):
         return self.references['amount']
 
-    @cached_property
-    def reference_code(self):
-        return self.references['reference_code']
-
 
 class WithdrawalWireTransferOperation(DepositWireTransferOperation):
     objects = WithdrawalWireTransferOperationManager()
@@ -111,5 +112,50 @@ class RefundWireTransferOperation(Operation):
     @cached_property
     def deposit(self):
         return DepositWireTransferOperation.objects.get(
-            pk=self.references['deposit']
+            pk=self.refunded_deposit_id
         )
+
+
+class UnmatchedStatementLine(models.Model):
+
+    """Bank statement line which wasn't matched to any pending deposit.
+
+    Exception queue of statement import, resolved by admins manually.
+    """
+
+    REASON_CHOICES = (
+        (StatementLineMismatch.NO_REFERENCE, 'No reference code'),
+        (StatementLineMismatch.UNKNOWN_REFERENCE, 'Unknown reference code'),
+        (StatementLineMismatch.AMBIGUOUS_REFERENCE, 'Reference code of several payments'),
+        (StatementLineMismatch.DUPLICATE, 'Duplicate payment'),
+        (StatementLineMismatch.AMOUNT_MISMATCH, 'Amount mismatch'),
+        (StatementLineMismatch.CURRENCY_MISMATCH, 'Currency mismatch'),
+        (StatementLineMismatch.IBAN_MISMATCH, 'IBAN mismatch'),
+        (StatementLineMismatch.SETTLEMENT_FAILED, 'Settlement failed'),
+    )
+
+    uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    statement = models.CharField(max_length=320)
+    line_number = models.PositiveIntegerField()
+    booked_at = models.DateField(null=True)
+    amount = models.DecimalField(
+        max_digits=ACCOUNTING_MAX_DIGITS, decimal_places=ACCOUNTING_DECIMAL_PLACES
+    )
+    currency = models.CharField(max_length=3)
+    iban_number = models.CharField(max_length=34, blank=True)
+    reference = models.TextField(blank=True)
+
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    #: reference code of matched deposit if line was rejected by amount, currency or IBAN
+    reference_code = models.CharField(max_length=100, blank=True)
+    is_resolved = models.BooleanField(default=False, db_index=True)
+
+    class Meta:
+        db_table = f'{module_name}_unmatchedstatementline'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['statement', 'line_number'], name='unmatched_statement_line_unique',
+            )
+        ]
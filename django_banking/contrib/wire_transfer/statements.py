@@ -0,0 +1,327 @@
+"""Streaming parsers of bank statement files.
+
+Parsers read file line by line (entry by entry for XML) and yield incoming
+transfers only, so statements of any size are processed in constant memory.
+"""
+import csv
+import hashlib
+import io
+import re
+from datetime import (
+    date,
+    datetime
+)
+from decimal import (
+    Decimal,
+    InvalidOperation
+)
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional
+)
+from xml.etree.ElementTree import (
+    Element,
+    ParseError,
+    iterparse
+)
+
+from .enum import StatementFormat
+from .iban import valid_iban
+
+IBAN_RE = re.compile(r'\b[A-Z]{2}\d{2}[A-Z0-9]{11,30}\b')
+
+
+class StatementFormatError(ValueError):
+
+    """Statement file can't be parsed.
+    """
+
+    def __init__(self, line_number: int, message: str):
+        self.line_number = line_number
+        super().__init__(f'Line {line_number}: {message}')
+
+
+class StatementLine(NamedTuple):
+
+    """Incoming transfer found in bank statement.
+    """
+
+    line_number: int
+    amount: Decimal
+    currency: str
+    reference: str
+    iban: str = ''
+    booked_at: Optional[date] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Identity of transfer which stays the same in overlapping statements.
+
+        Line number depends on file, so it isn't included.
+        """
+        amount = format(self.amount.normalize(), 'f')
+        value = f'{self.booked_at}|{amount}|{self.currency}|{self.iban}|{self.reference}'
+        return hashlib.sha1(value.encode()).hexdigest()
+
+
+def normalize_iban(value: Optional[str]) -> str:
+    return ''.join((value or '').split()).upper()
+
+
+def find_iban(text: str) -> str:
+    """Get first valid IBAN mentioned in free text.
+    """
+    for candidate in IBAN_RE.findall(text.upper()):
+        if valid_iban(candidate):
+            return candidate
+    return ''
+
+
+def _parse_amount(line_number: int, value: str) -> Decimal:
+    try:
+        return Decimal(value.strip().replace(',', '.'))
+    except InvalidOperation:
+        raise StatementFormatError(line_number, f'invalid amount {value!r}')
+
+
+def parse_csv(file: BinaryIO, encoding: str = 'utf-8') -> Iterator[StatementLine]:
+    """Parse CSV statement.
+
+    Header row is required, `amount`, `currency` and `reference` columns are
+    mandatory, `iban` and `date` (YYYY-MM-DD) are optional. Debit lines
+    (negative amount) are skipped.
+    """
+    text = io.TextIOWrapper(file, encoding=encoding, newline='')
+    try:
+        yield from _parse_csv_rows(csv.DictReader(text))
+    finally:
+        # keep provided file open
+        text.detach()
+
+
+def _parse_csv_rows(reader: csv.DictReader) -> Iterator[StatementLine]:
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or ()]
+    missing = {'amount', 'currency', 'reference'}.difference(reader.fieldnames)
+    if missing:
+        raise StatementFormatError(1, f'missing columns {", ".join(sorted(missing))}')
+
+    for row in reader:
+        line_number = reader.line_num
+        amount = _parse_amount(line_number, row['amount'])
+        if amount <= 0:
+            continue
+        booked_at = None
+        if row.get('date'):
+            try:
+                booked_at = date.fromisoformat(row['date'].strip())
+            except ValueError:
+                raise StatementFormatError(line_number, f'invalid date {row["date"]!r}')
+        yield StatementLine(
+            line_number=line_number,
+            amount=amount,
+            currency=row['currency'].strip().upper(),
+            reference=row['reference'].strip(),
+            iban=normalize_iban(row.get('iban')),
+            booked_at=booked_at,
+        )
+
+
+MT940_TAG_RE = re.compile(r'^:(?P<tag>\d{2}[A-Z]?):(?P<value>.*)$')
+MT940_BALANCE_RE = re.compile(r'^[CD]\d{6}(?P<currency>[A-Z]{3})')
+MT940_LINE_RE = re.compile(
+    r'^(?P<date>\d{6})(?:\d{4})?(?P<mark>R?[CD])[A-Z]?(?P<amount>\d+,\d*)(?P<details>.*)$',
+    re.DOTALL,
+)
+MT940_SUBFIELD_RE = re.compile(r'\?\d{2}')
+#: tags finishing previous statement line with its information
+MT940_LINE_END_TAGS = ('20', '61', '62F', '62M')
+
+
+def _iter_mt940_fields(file: BinaryIO, encoding: str) -> Iterator[Dict]:
+    """Yield MT940 fields with continuation lines joined.
+    """
+    text = io.TextIOWrapper(file, encoding=encoding)
+    try:
+        field: Optional[Dict] = None
+        for line_number, line in enumerate(text, 1):
+            line = line.rstrip('\r\n')
+            match = MT940_TAG_RE.match(line)
+            if match:
+                if field:
+                    yield field
+                field = {'line_number': line_number, **match.groupdict()}
+            elif line.startswith('-'):
+                if field:
+                    yield field
+                field = None
+            elif field:
+                field['value'] += '\n' + line
+        if field:
+            yield field
+    finally:
+        # keep provided file open
+        text.detach()
+
+
+def _mt940_statement_line(
+    line: Optional[Dict], currency: str, info: List[str]
+) -> Optional[StatementLine]:
+    if line is None or line['mark'] != 'C':
+        return None
+    details = MT940_SUBFIELD_RE.sub(' ', ''.join(info)).strip()
+    return StatementLine(
+        line_number=line['line_number'],
+        amount=line['amount'],
+        currency=currency,
+        reference=' '.join(filter(None, (line['details'].strip(), details))),
+        iban=find_iban(details),
+        booked_at=line['booked_at'],
+    )
+
+
+def _parse_mt940_line(line_number: int, value: str) -> Dict:
+    match = MT940_LINE_RE.match(value)
+    if not match:
+        raise StatementFormatError(line_number, 'invalid statement line')
+    return {
+        'line_number': line_number,
+        'mark': match.group('mark'),
+        'amount': _parse_amount(line_number, match.group('amount')),
+        'details': match.group('details').replace('\n', ' '),
+        'booked_at': datetime.strptime(match.group('date'), '%y%m%d').date(),
+    }
+
+
+def parse_mt940(file: BinaryIO, encoding: str = 'latin-1') -> Iterator[StatementLine]:
+    """Parse SWIFT MT940 statement.
+
+    Reference is taken from `:61:` supplementary details and `:86:`
+    information, IBAN is searched in `:86:` information. Only credit
+    lines are yielded.
+    """
+    currency = ''
+    pending: Optional[Dict] = None
+    info: List[str] = []
+
+    for field in _iter_mt940_fields(file, encoding):
+        tag, value, line_number = field['tag'], field['value'], field['line_number']
+        if tag == '86':
+            info.append(value.replace('\n', ''))
+            continue
+
+        if tag in MT940_LINE_END_TAGS:
+            line = _mt940_statement_line(pending, currency, info)
+            if line:
+                yield line
+            pending, info = None, []
+
+        if tag in ('60F', '60M'):
+            match = MT940_BALANCE_RE.match(value)
+            if not match:
+                raise StatementFormatError(line_number, 'invalid opening balance')
+            currency = match.group('currency')
+        elif tag == '61':
+            pending = _parse_mt940_line(line_number, value)
+
+    line = _mt940_statement_line(pending, currency, info)
+    if line:
+        yield line
+
+
+def _local_name(element: Element) -> str:
+    return element.tag.rsplit('}', 1)[-1]
+
+
+def _children(element: Optional[Element], name: str) -> List[Element]:
+    if element is None:
+        return []
+    return [child for child in element if _local_name(child) == name]
+
+
+def _find(element: Optional[Element], *path: str) -> Optional[Element]:
+    """Find descendant by path of local (namespace-less) tag names.
+    """
+    for name in path:
+        children = _children(element, name)
+        element = children[0] if children else None
+    return element
+
+
+def _text(element: Optional[Element], *path: str) -> str:
+    found = _find(element, *path)
+    return (found.text or '').strip() if found is not None else ''
+
+
+def _camt053_statement_line(entry: Element, entry_number: int) -> Optional[StatementLine]:
+    amount = _find(entry, 'Amt')
+    if _text(entry, 'CdtDbtInd') != 'CRDT' or amount is None:
+        return None
+
+    references = [_text(entry, 'AddtlNtryInf')]
+    ibans = []
+    for tx in _children(_find(entry, 'NtryDtls'), 'TxDtls'):
+        remittance = _find(tx, 'RmtInf')
+        references.append(_text(tx, 'Refs', 'EndToEndId'))
+        references.extend((info.text or '').strip() for info in _children(remittance, 'Ustrd'))
+        references.extend(_text(ref, 'CdtrRefInf', 'Ref') for ref in _children(remittance, 'Strd'))
+        ibans.append(_text(tx, 'RltdPties', 'DbtrAcct', 'Id', 'IBAN'))
+
+    booked_at = _text(entry, 'BookgDt', 'Dt') or _text(entry, 'BookgDt', 'DtTm')[:10]
+    try:
+        booked_date = date.fromisoformat(booked_at) if booked_at else None
+    except ValueError:
+        raise StatementFormatError(entry_number, f'invalid booking date {booked_at!r}')
+    return StatementLine(
+        line_number=entry_number,
+        amount=_parse_amount(entry_number, amount.text or ''),
+        currency=amount.get('Ccy', '').upper(),
+        reference=' '.join(filter(None, references)),
+        iban=normalize_iban(next(filter(None, ibans), '')),
+        booked_at=booked_date,
+    )
+
+
+def parse_camt053(file: BinaryIO) -> Iterator[StatementLine]:
+    """Parse ISO 20022 CAMT.053 statement.
+
+    Entries are read one by one and removed from their statement right after
+    they are processed, so memory isn't growing with number of entries.
+    Line number is an ordinal number of entry in file.
+    """
+    entry_number = 0
+    #: elements opened and not closed yet, the last one is parent of closed element
+    parents: List[Element] = []
+    try:
+        for event, element in iterparse(file, events=('start', 'end')):
+            if event == 'start':
+                parents.append(element)
+                continue
+            parents.pop()
+            if _local_name(element) != 'Ntry':
+                continue
+            entry_number += 1
+            line = _camt053_statement_line(element, entry_number)
+            if parents:
+                parents[-1].remove(element)
+            if line:
+                yield line
+    except ParseError as exc:
+        raise StatementFormatError(getattr(exc, 'position', (entry_number,))[0], str(exc))
+
+
+PARSERS: Dict[str, Callable[[BinaryIO], Iterator[StatementLine]]] = {
+    StatementFormat.CSV: parse_csv,
+    StatementFormat.MT940: parse_mt940,
+    StatementFormat.CAMT053: parse_camt053,
+}
+
+
+def parse_statement(file: BinaryIO, format: str) -> Iterator[StatementLine]:
+    """Parse statement file of specified format, see `StatementFormat`.
+    """
+    return PARSERS[format](file)
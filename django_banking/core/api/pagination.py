@@ -1,3 +1,6 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 
@@ -12,3 +15,103 @@ class CustomCursorPagination(CursorPagination):
             'previous': self.get_previous_link(),
             'data': data,
         })
+
+
+class KeysetCursorPagination(CustomCursorPagination):
+
+    """Cursor pagination by unique combination of ordering fields.
+
+    Cursor position keeps values of all ordering fields, so pages are stable
+    across equal values of the first field and no offset is ever required.
+    Page is read in constant time if ordering is covered by index.
+    """
+
+    ordering = ('-created_at', '-pk')  # type: ignore
+    position_separator = '|'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            _, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*[
+                order[1:] if order.startswith('-') else f'-{order}' for order in self.ordering
+            ])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = self.filter_after_position(queryset, current_position, reverse)
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def filter_after_position(self, queryset, position, reverse):
+        """Filter items following position in (reversed) ordering.
+
+        Lookup on the first field bounds index range scan, the rest of
+        condition resolves ties.
+        """
+        values = position.split(self.position_separator)
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = Q()
+        equal = {}
+        for order, value in zip(self.ordering, values):
+            field_name = order.lstrip('-')
+            lookup = 'lt' if order.startswith('-') != reverse else 'gt'
+            condition |= Q(**equal, **{f'{field_name}__{lookup}': value})
+            equal[field_name] = value
+
+        first_lookup = 'lte' if self.ordering[0].startswith('-') != reverse else 'gte'
+        try:
+            return queryset.filter(
+                condition,
+                **{f'{self.ordering[0].lstrip("-")}__{first_lookup}': values[0]}
+            )
+        except (ValidationError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field_name = order.lstrip('-')
+            if isinstance(instance, dict):
+                attr = instance[field_name]
+            else:
+                attr = getattr(instance, field_name)
+            values.append(attr.isoformat() if hasattr(attr, 'isoformat') else str(attr))
+        return self.position_separator.join(values)
@@ -1,2 +1,10 @@
 class NonSupportedCountryException(Exception):
     pass
+
+
+class PriceUnavailable(Exception):
+    pass
+
+
+class UploadNotFound(Exception):
+    pass
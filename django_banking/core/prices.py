@@ -0,0 +1,233 @@
+"""Price repository.
+
+Prices are fetched from pluggable source by periodic `refresh` only and
+published to default cache as versioned snapshot, so the cache must be shared
+by all processes (see `django_banking.checks`). Each process keeps the
+snapshot in memory and reloads it once its version changes, so price lookups
+are dict lookups and never call the source.
+"""
+import json
+import logging
+from collections.abc import Mapping
+from datetime import (
+    datetime,
+    timedelta
+)
+from decimal import Decimal
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+from uuid import (
+    UUID,
+    uuid4
+)
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from ..settings import (
+    PRICE_OFFER_LIFETIME,
+    PRICE_SNAPSHOT_TIMEOUT,
+    PRICE_SOURCE,
+    PRICE_SOURCE_OPTIONS
+)
+from .exceptions import PriceUnavailable
+from .registry import Registry
+
+logger = logging.getLogger(__name__)
+
+PairKey = Tuple[UUID, UUID]
+
+
+class Price(NamedTuple):
+    base_asset_id: UUID
+    quote_asset_id: UUID
+    buy: Decimal
+    sell: Decimal
+
+    def inverse(self) -> 'Price':
+        return Price(
+            base_asset_id=self.quote_asset_id,
+            quote_asset_id=self.base_asset_id,
+            buy=1 / self.sell,
+            sell=1 / self.buy,
+        )
+
+
+class SourcePrice(NamedTuple):
+
+    """Price of base asset in quote asset as provided by source, assets are referenced by symbols.
+    """
+
+    base: str
+    quote: str
+    buy: Decimal
+    sell: Decimal
+
+
+class PriceSource:
+
+    """Provider of current prices.
+    """
+
+    def fetch(self) -> Iterable[SourcePrice]:
+        raise NotImplementedError
+
+
+class FilePriceSource(PriceSource):
+
+    """Prices read from local JSON file.
+
+    File contains list of objects with `base`, `quote`, `buy` and `sell` keys,
+    e.g. `[{"base": "BTC", "quote": "USD", "buy": "9100.5", "sell": "9090"}]`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def fetch(self) -> Iterator[SourcePrice]:
+        with open(self.path) as file:
+            data = json.load(file)
+        for item in data:
+            yield SourcePrice(
+                base=item['base'],
+                quote=item['quote'],
+                buy=Decimal(str(item['buy'])),
+                sell=Decimal(str(item['sell'])),
+            )
+
+
+class PriceSnapshot(Mapping):
+
+    """Immutable set of prices keyed by base and quote asset ids.
+
+    Inverse prices are added for pairs not provided by source, so any
+    direction is looked up in constant time.
+    """
+
+    def __init__(self, prices: Iterable[Price], version: str = '', created_at: datetime = None):
+        self.version = version
+        self.created_at = created_at
+        self._prices: Dict[PairKey, Price] = {}
+        inverse = []
+        for price in prices:
+            self._prices[price.base_asset_id, price.quote_asset_id] = price
+            if price.buy and price.sell:
+                inverse.append(price.inverse())
+        for price in inverse:
+            self._prices.setdefault((price.base_asset_id, price.quote_asset_id), price)
+
+    def __getitem__(self, key: PairKey) -> Price:
+        return self._prices[key]
+
+    def __iter__(self) -> Iterator[PairKey]:
+        return iter(self._prices)
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+
+class PriceOffer(NamedTuple):
+
+    """Price fixed for user until offer expires.
+    """
+
+    uuid: UUID
+    user_id: UUID
+    price: Price
+    version: str
+    expires_at: datetime
+
+
+class PriceRepository(Registry):
+
+    """In-process snapshot of current prices.
+
+    Snapshot is dropped from shared cache if it isn't refreshed within
+    `PRICE_SNAPSHOT_TIMEOUT`, so stale prices are never used.
+    """
+
+    version_cache_key = 'django_banking:prices:version'
+    snapshot_cache_key = 'django_banking:prices:snapshot'
+
+    def __init__(self, source: PriceSource = None):
+        super().__init__()
+        self._source = source
+
+    @property
+    def source(self) -> PriceSource:
+        if self._source is None:
+            self._source = import_string(PRICE_SOURCE)(**PRICE_SOURCE_OPTIONS)
+        return self._source
+
+    def load(self) -> PriceSnapshot:
+        snapshot = cache.get(self.snapshot_cache_key)
+        if snapshot is None:
+            logger.warning('Price snapshot is not available, prices should be refreshed')
+            return PriceSnapshot([])
+        return snapshot
+
+    def refresh(self) -> PriceSnapshot:
+        """Fetch prices from source and publish them to all processes.
+        """
+        from ..models import Asset
+        from ..models.assets.registry import asset_registry
+
+        prices = []
+        for item in self.source.fetch():
+            try:
+                base = asset_registry.get_by_symbol(item.base)
+                quote = asset_registry.get_by_symbol(item.quote)
+            except Asset.DoesNotExist:
+                logger.warning('Price of unknown pair %s/%s skipped', item.base, item.quote)
+                continue
+            prices.append(Price(base.pk, quote.pk, item.buy, item.sell))
+
+        snapshot = PriceSnapshot(prices, version=uuid4().hex, created_at=timezone.now())
+        cache.set(self.snapshot_cache_key, snapshot, PRICE_SNAPSHOT_TIMEOUT)
+        cache.set(self.version_cache_key, snapshot.version, PRICE_SNAPSHOT_TIMEOUT)
+        return snapshot
+
+    def get_snapshot(self) -> PriceSnapshot:
+        return self.get_index()
+
+    def get(self, base_asset_id, quote_asset_id, snapshot: PriceSnapshot = None) -> Price:
+        if snapshot is None:
+            snapshot = self.get_snapshot()
+        try:
+            return snapshot[base_asset_id, quote_asset_id]
+        except KeyError:
+            raise PriceUnavailable(f'Price of {base_asset_id}/{quote_asset_id} is not available')
+
+    def make_offer(self, user_id, base_asset_id, quote_asset_id) -> PriceOffer:
+        """Fix current price for user for `PRICE_OFFER_LIFETIME` seconds.
+        """
+        snapshot = self.get_snapshot()
+        price = self.get(base_asset_id, quote_asset_id, snapshot)
+        offer = PriceOffer(
+            uuid=uuid4(),
+            user_id=user_id,
+            price=price,
+            version=snapshot.version,
+            expires_at=timezone.now() + timedelta(seconds=PRICE_OFFER_LIFETIME),
+        )
+        cache.set(self._offer_cache_key(user_id, offer.uuid), offer, PRICE_OFFER_LIFETIME)
+        return offer
+
+    def get_offer(self, user_id, offer_id) -> PriceOffer:
+        offer: Optional[PriceOffer] = cache.get(self._offer_cache_key(user_id, offer_id))
+        if offer is None or offer.expires_at <= timezone.now():
+            raise PriceUnavailable(f'Price offer {offer_id} is expired')
+        return offer
+
+    def _offer_cache_key(self, user_id, offer_id) -> str:
+        return f'django_banking:prices:offer:{user_id}:{offer_id}'
+
+
+price_repository = PriceRepository()
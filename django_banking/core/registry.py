@@ -0,0 +1,74 @@
+import threading
+from typing import (
+    Any,
+    Optional
+)
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+    transaction
+)
+
+
+class Registry:
+
+    """In-process cache of rarely changed db rows.
+
+    Rows are loaded once per process and kept until `invalidate` is called,
+    usually from model signals. Other processes are notified with version key
+    in default cache, so it must be shared by all processes (not locmem or
+    dummy backend). Changes made bypassing model signals (queryset update,
+    bulk create) must be followed by `invalidate` call. Loaded objects are
+    shared, don't modify them.
+    """
+
+    version_cache_key: str
+
+    def __init__(self):
+        self._index: Optional[Any] = None
+        self._version: Optional[str] = None
+        self._local = threading.local()
+
+    def load(self) -> Any:
+        """Read rows from db into lookup tables.
+        """
+        raise NotImplementedError
+
+    def invalidate(self, using: str = None):
+        """Drop loaded rows in all processes.
+
+        Until changing transaction is finished, its thread reads rows from db
+        bypassing registry, so uncommitted changes are never shared.
+        """
+        def callback():
+            self._index = None
+            cache.set(self.version_cache_key, uuid4().hex, None)
+
+        callback()
+        using = using or DEFAULT_DB_ALIAS
+        if connections[using].in_atomic_block:
+            self._local.pending = (using, callback)
+        transaction.on_commit(callback, using=using)
+
+    def _in_changing_transaction(self) -> bool:
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            return False
+        using, callback = pending
+        # hook is dropped once transaction is committed or rolled back
+        if any(func is callback for _, func in connections[using].run_on_commit):
+            return True
+        self._local.pending = None
+        return False
+
+    def get_index(self) -> Any:
+        if self._in_changing_transaction():
+            return self.load()
+
+        version = cache.get(self.version_cache_key)
+        if self._index is None or self._version != version:
+            self._index, self._version = self.load(), version
+        return self._index
@@ -0,0 +1,84 @@
+"""Direct uploads to object storage.
+
+Client gets presigned form, sends file straight to bucket and finalizes
+upload with signed token afterwards, so API workers never receive file
+content. Token is bound to owner (user profile, operation etc.) and storage
+it was issued for. Uploaded file is validated by object metadata and its
+first bytes only.
+"""
+import os
+from typing import (
+    Any,
+    Dict,
+    NamedTuple
+)
+from uuid import uuid4
+
+from django.core import signing
+
+from ..settings import DIRECT_UPLOAD_LIFETIME
+from ..storages import AmazonS3Storage
+from .exceptions import UploadNotFound
+
+#: number of leading bytes read to detect file type
+HEAD_SIZE = 1024
+
+
+class DirectUpload(NamedTuple):
+    token: str
+    url: str
+    fields: Dict[str, str]
+
+
+class UploadedFile(NamedTuple):
+    name: str
+    size: int
+    #: hex MD5 digest of content, taken from ETag of object uploaded with form
+    checksum: str
+    #: first `HEAD_SIZE` bytes of content
+    head: bytes
+
+
+def _get_salt(storage: AmazonS3Storage) -> str:
+    return f'django_banking.uploads:{storage.location}'
+
+
+def request_upload(
+    storage: AmazonS3Storage,
+    owner: Any,
+    filename: str,
+    content_type: str,
+    min_size: int,
+    max_size: int,
+) -> DirectUpload:
+    """Sign form for uploading file to storage under unique name.
+    """
+    name = f'{uuid4().hex}/{storage.get_valid_name(os.path.basename(filename))}'
+    url, fields = storage.presigned_post(
+        name, content_type, min_size, max_size, DIRECT_UPLOAD_LIFETIME
+    )
+    token = signing.dumps({'name': name, 'owner': str(owner)}, salt=_get_salt(storage))
+    return DirectUpload(token=token, url=url, fields=fields)
+
+
+def get_uploaded_file(storage: AmazonS3Storage, token: str, owner: Any) -> UploadedFile:
+    """Get metadata and first bytes of file uploaded with form issued for owner.
+
+    File content isn't downloaded, one HEAD and one ranged GET request are made.
+
+    :raises UploadNotFound: token is invalid, expired, issued for someone else
+    or file wasn't uploaded
+    """
+    try:
+        data = signing.loads(token, salt=_get_salt(storage), max_age=DIRECT_UPLOAD_LIFETIME * 2)
+    except signing.BadSignature:
+        raise UploadNotFound('Upload token is invalid or expired')
+    info = storage.get_object_info(data['name']) if data['owner'] == str(owner) else None
+    if info is None:
+        raise UploadNotFound('File is not uploaded')
+    return UploadedFile(
+        name=data['name'],
+        size=info.size,
+        checksum=info.etag,
+        head=storage.read_head(data['name'], HEAD_SIZE) if info.size else b'',
+    )
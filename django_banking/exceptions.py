@@ -1,4 +1,8 @@
-from .core.exceptions import NonSupportedCountryException  # NOQA
+from .core.exceptions import (  # NOQA
+    NonSupportedCountryException,
+    PriceUnavailable,
+    UploadNotFound
+)
 from .models.accounts.exceptions import (  # NOQA
     AccountBalanceException,
     AccountException,
@@ -0,0 +1,64 @@
+from datetime import date
+from typing import (
+    Iterable,
+    Optional,
+    Tuple
+)
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+from ..settings import LIMITS_USAGE_CACHE_TIMEOUT
+
+
+def get_limits_usage_cache_key(user_id) -> str:
+    """Get cache key of user limits usage.
+
+    Key includes current date, so usage cached before intervals start is never read.
+    """
+    return f'django_banking:limits_usage:{user_id}:{date.today().isoformat()}'
+
+
+def get_limits_usage_version_cache_key(user_id) -> str:
+    return f'django_banking:limits_usage_version:{user_id}'
+
+
+def get_cached_limits_usage(user_id) -> Tuple[Optional[dict], str]:
+    """Get cached user limits usage and current usage version.
+
+    Usage is returned only if it was calculated at current version, so usage
+    calculated by any process before user operation was posted or cancelled
+    is never read even if it was cached after invalidation. Version should
+    be passed to `set_cached_limits_usage` once usage is calculated.
+    """
+    usage_key = get_limits_usage_cache_key(user_id)
+    version_key = get_limits_usage_version_cache_key(user_id)
+    values = cache.get_many([usage_key, version_key])
+    version = values.get(version_key, '')
+    cached = values.get(usage_key)
+    if cached is None or cached[0] != version:
+        return None, version
+    return cached[1], version
+
+
+def set_cached_limits_usage(user_id, usage, version: str):
+    cache.set(get_limits_usage_cache_key(user_id), (version, usage), LIMITS_USAGE_CACHE_TIMEOUT)
+
+
+def invalidate_limits_usage(user_ids: Iterable, using: str = None):
+    """Drop cached limits usage of users.
+
+    Usage version is changed right away and once again on transaction commit,
+    so usage calculated concurrently before operation is committed isn't used.
+    """
+    keys = [get_limits_usage_version_cache_key(user_id) for user_id in set(user_ids)]
+    if not keys:
+        return
+
+    def change_version():
+        # kept longer than usage, so older usage can't match missing version
+        cache.set_many({key: uuid4().hex for key in keys}, LIMITS_USAGE_CACHE_TIMEOUT * 2)
+
+    change_version()
+    transaction.on_commit(change_version, using=using)
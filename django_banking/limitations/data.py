@@ -6,7 +6,10 @@ from django_banking.limitations.enum import (
     LimitInterval,
     LimitType
 )
-from django_banking.models.transactions.enum import OperationType
+from django_banking.models.transactions.enum import (
+    OperationStatus,
+    OperationType
+)
 
 OPERATION_TYPE_MAP = {
     LimitType.DEPOSIT: OperationType.DEPOSIT,
@@ -18,6 +21,13 @@ LIMIT_TYPE_MAP = {
     v: k for k, v in OPERATION_TYPE_MAP.items()
 }
 
+#: operations in these statuses are counted in limits usage
+LIMITS_USAGE_STATUSES = (
+    OperationStatus.NEW,
+    OperationStatus.HOLD,
+    OperationStatus.COMMITTED,
+)
+
 
 class Limit(NamedTuple):
 
@@ -2,3 +2,8 @@
 class OutOfLimitsException(Exception):
     def __init__(self, bottom_limit):
         self.bottom_limit = bottom_limit
+
+
+class LimitExceededException(Exception):
+    def __init__(self, limit):
+        self.limit = limit
@@ -4,36 +4,45 @@ from datetime import (
     datetime,
     timedelta
 )
-from typing import List
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Tuple
+)
 
 from dateutil.relativedelta import relativedelta
 from django.db.models import (
-    Sum,
-    Value
-)
-from django.db.models.functions import (
-    Abs,
-    Coalesce
+    Q,
+    Sum
 )
+from django.utils.timezone import make_aware
 
 from django_banking.models import (
     Asset,
-    Transaction,
-    UserAccount
+    Transaction
 )
-from django_banking.models.transactions.enum import OperationStatus
 
 from ..settings import (
     LIMITS,
     LIMITS_MINIMAL_OPERATION
 )
+from .cache import (
+    get_cached_limits_usage,
+    set_cached_limits_usage
+)
 from .data import (
     LIMIT_TYPE_MAP,
+    LIMITS_USAGE_STATUSES,
     OPERATION_TYPE_MAP,
+    Limit,
     UserLimit
 )
 from .enum import LimitInterval
-from .exceptions import OutOfLimitsException
+from .exceptions import (
+    LimitExceededException,
+    OutOfLimitsException
+)
 
 # TODO: move to db
 LIMITS_MINIMAL_OPERATION_MAP = {
@@ -68,6 +77,72 @@ def get_limit_interval_end(interval: LimitInterval = LimitInterval.WEEK) -> date
         raise Exception("Unsupported limit interval `%s`" % interval)
 
 
+def get_limit_interval_start(interval: LimitInterval) -> datetime:
+    """Get start of current limitation interval.
+    """
+    today = date.today()
+    if interval == LimitInterval.DAY:
+        start = today
+    elif interval == LimitInterval.WEEK:
+        start = today - timedelta(days=today.weekday())
+    elif interval == LimitInterval.MONTH:
+        start = today.replace(day=1)
+    else:
+        raise Exception("Unsupported limit interval `%s`" % interval)
+    return make_aware(datetime.combine(start, datetime.min.time()))
+
+
+def calculate_limits_usage(user, limits: Iterable[Limit]) -> Dict[Tuple, decimal.Decimal]:
+    """Calculate amounts used by user for all provided limits.
+
+    Usage of every asset, operation type and interval is aggregated with single
+    grouped query over `created_at` range starting at the earliest interval.
+    Per operation limits restrict single operation amount, so they don't
+    accumulate usage and aren't included.
+
+    :return: mapping of (asset symbol, limit type, limit interval) to used amount
+    """
+    limits = [limit for limit in limits if limit.interval != LimitInterval.OPERATION]
+    starts = {limit.interval: get_limit_interval_start(limit.interval) for limit in limits}
+    if not starts:
+        return {}
+
+    qs = Transaction.objects.filter(
+        account__useraccount__user=user,
+        account__asset__symbol__in={limit.asset_symbol for limit in limits},
+        operation__type__in={OPERATION_TYPE_MAP[limit.type] for limit in limits},
+        operation__status__in=LIMITS_USAGE_STATUSES,
+        operation__created_at__gte=min(starts.values()),
+    )
+
+    annotations = {
+        interval.value: Sum('amount', filter=Q(operation__created_at__gte=start))
+        for interval, start in starts.items()
+    }
+    rows = qs.order_by().values('account__asset__symbol', 'operation__type').annotate(**annotations)
+
+    usage: Dict[Tuple, decimal.Decimal] = {}
+    for row in rows:
+        for interval in starts:
+            key = (row['account__asset__symbol'], LIMIT_TYPE_MAP[row['operation__type']], interval)
+            usage[key] = abs(row[interval.value] or 0)
+    return usage
+
+
+def get_limits_usage(user) -> Dict[Tuple, decimal.Decimal]:
+    """Get amounts used by user for all configured limits.
+
+    Result is cached until user operation is posted or cancelled, see
+    `django_banking.limitations.cache`.
+    """
+    usage, version = get_cached_limits_usage(user.pk)
+    if usage is None:
+        limits = [limit for risk_level_limits in LIMITS.values() for limit in risk_level_limits]
+        usage = calculate_limits_usage(user, limits)
+        set_cached_limits_usage(user.pk, usage, version)
+    return usage
+
+
 def get_user_limits(user) -> List[UserLimit]:
     """Get payment limits appliable to the user.
     """
@@ -77,26 +152,18 @@ def get_user_limits(user) -> List[UserLimit]:
     # TODO: timezone handling
     asset = Asset.objects.main_fiat_for_customer(user)
 
-    user_assets = [asset.symbol]
-
     risk_level = getattr(user, 'risk_level', None)
+    usage = get_limits_usage(user)
 
     for limit in LIMITS[risk_level]:
-        if limit.asset_symbol not in user_assets:
+        if limit.asset_symbol != asset.symbol:
             continue
 
-        user_asset = Asset.objects.get(symbol=limit.asset_symbol)
-
-        operation_type = OPERATION_TYPE_MAP[limit.type]
-        limit_used = get_limit_used(user, user_asset, operation_type, limit.interval)
-
-        available = limit.value
-
-        if limit_used:
-            available = limit.value - limit_used
+        limit_used = usage.get((limit.asset_symbol, limit.type, limit.interval), 0)
+        available = limit.value - limit_used
 
         user_limits.append(UserLimit(
-            asset=user_asset,
+            asset=asset,
             total=limit.value,
             available=available.quantize(
                 decimal.Decimal('.1') ** asset.decimals,
@@ -113,40 +180,23 @@ def get_user_limits(user) -> List[UserLimit]:
 def get_limit_used(user, asset, operation_type, interval: LimitInterval):
     """Get payment limit used by user specified asset, operation type and interval.
     """
-    user_account = UserAccount.objects.for_customer(
-        user, asset
-    )
-    used_limit_qs = Transaction.objects.filter(
-        account=user_account,
-        operation__type=operation_type,
-        operation__status__in=[
-            OperationStatus.NEW,
-            OperationStatus.HOLD,
-            OperationStatus.COMMITTED,
-        ]
+    limit = Limit(
+        asset_symbol=asset.symbol,
+        value=decimal.Decimal(0),
+        type=LIMIT_TYPE_MAP[operation_type],
+        interval=interval,
     )
+    usage = calculate_limits_usage(user, [limit])
+    return usage.get((limit.asset_symbol, limit.type, limit.interval), 0)
 
-    today = date.today()
-    if interval == LimitInterval.MONTH:
-        used_limit_qs = used_limit_qs.filter(
-            operation__created_at__year=today.year,
-            operation__created_at__month=today.month,
-        )
-    if interval == LimitInterval.WEEK:
-        current_week = today.isocalendar()[1]
-        used_limit_qs = used_limit_qs.filter(
-            operation__created_at__year=today.year,
-            operation__created_at__week=current_week,
-        )
-    elif interval == LimitInterval.DAY:
-        used_limit_qs = used_limit_qs.filter(
-            operation__created_at__date=today,
-        )
 
-    result = used_limit_qs.aggregate(
-        used=Coalesce(Abs(Sum('amount')), Value(0))
-    )
-    return result['used']
+def validate_limits_available(user, operation_type, asset: Asset, amount: decimal.Decimal):
+    """Check amount of new operation doesn't exceed available user limits.
+    """
+    for limit in get_user_limits(user):
+        if limit.type == LIMIT_TYPE_MAP[operation_type] and limit.asset == asset \
+                and amount > limit.available:
+            raise LimitExceededException(limit)
 
 
 def validate_by_limits(operation_type, asset: Asset, amount: decimal.Decimal):
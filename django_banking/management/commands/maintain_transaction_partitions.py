@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from django_banking.models.transactions.partitions import maintain_partitions
+from django_banking.settings import (
+    TRANSACTION_ARCHIVE_AFTER_MONTHS,
+    TRANSACTION_PARTITIONS_AHEAD
+)
+
+
+class Command(BaseCommand):
+    help = 'Create monthly transaction partitions in advance and archive old ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ahead', type=int, default=TRANSACTION_PARTITIONS_AHEAD,
+            help='Number of months to create partitions for in advance',
+        )
+        parser.add_argument(
+            '--archive-after', type=int, default=TRANSACTION_ARCHIVE_AFTER_MONTHS,
+            help='Archive partitions older than this number of months, '
+                 'only ones covered by balance checkpoint are archived',
+        )
+
+    def handle(self, *args, **options):
+        created, archived = maintain_partitions(options['ahead'], options['archive_after'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(created)} transaction partitions created, {len(archived)} archived"
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+from django_banking.models import AccountBalance
+
+
+class Command(BaseCommand):
+    help = 'Rebuild persisted account balances from transactions history or check their consistency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only compare persisted balances with transactions history',
+        )
+        parser.add_argument(
+            '--account', action='append', dest='accounts', metavar='UUID',
+            help='Limit to specified account, can be passed multiple times',
+        )
+
+    def handle(self, *args, **options):
+        accounts = options['accounts']
+        if options['check']:
+            mismatches = AccountBalance.objects.check_consistency(accounts)
+            for mismatch in mismatches:
+                self.stdout.write(
+                    f"Account {mismatch.account_id} {mismatch.field}: "
+                    f"stored {mismatch.stored}, actual {mismatch.actual}"
+                )
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} balance mismatches found")
+            self.stdout.write(self.style.SUCCESS("Account balances are consistent"))
+            return
+
+        count = AccountBalance.objects.rebuild(accounts)
+        self.stdout.write(self.style.SUCCESS(f"{count} account balances rebuilt"))
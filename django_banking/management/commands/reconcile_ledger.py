@@ -0,0 +1,34 @@
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+from django.db import DEFAULT_DB_ALIAS
+
+from django_banking.models.transactions.reconciliation import reconcile_ledger
+
+
+class Command(BaseCommand):
+    help = 'Check that committed operations balance and account balances follow account type rules'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Database to read ledger from, e.g. replica',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int,
+            help='Number of rows fetched from database at once',
+        )
+
+    def handle(self, *args, **options):
+        count = 0
+        for violation in reconcile_ledger(options['database'], options['chunk_size']):
+            count += 1
+            self.stdout.write(
+                f"{violation.type}: operation {violation.operation_id}, "
+                f"account {violation.account_id}, asset {violation.asset_id}, "
+                f"amount {violation.amount}"
+            )
+        if count:
+            raise CommandError(f"{count} ledger violations found")
+        self.stdout.write(self.style.SUCCESS("Ledger is consistent"))
@@ -0,0 +1,40 @@
+# Generated by Django 3.0.3 on 2026-10-18 01:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django_banking.core.db.fields
+
+from django_banking.models.balances.utils import aggregate_balances
+
+
+def backfill_balances(apps, schema_editor):
+    Transaction = apps.get_model('django_banking', 'Transaction')
+    AccountBalance = apps.get_model('django_banking', 'AccountBalance')
+    AccountBalance.objects.bulk_create(
+        [
+            AccountBalance(account_id=account_id, **values)
+            for account_id, values in aggregate_balances(Transaction.objects.all()).items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_banking', '0005_auto_20200207_1209'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountBalance',
+            fields=[
+                ('account', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='live_balance', serialize=False, to='django_banking.Account')),
+                ('hold', django_banking.core.db.fields.DecimalField(decimal_places=6, default=0, max_digits=16)),
+                ('committed', django_banking.core.db.fields.DecimalField(decimal_places=6, default=0, max_digits=16)),
+                ('available', django_banking.core.db.fields.DecimalField(decimal_places=6, default=0, max_digits=16)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.0.3 on 2026-10-18 01:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django_banking.core.db.fields
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_banking', '0006_account_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BalanceCheckpoint',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('cutoff', models.DateTimeField(db_index=True)),
+                ('committed', django_banking.core.db.fields.DecimalField(decimal_places=6, default=0, max_digits=16)),
+                ('available', django_banking.core.db.fields.DecimalField(decimal_places=6, default=0, max_digits=16)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_checkpoints', to='django_banking.Account')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='balancecheckpoint',
+            constraint=models.UniqueConstraint(fields=('account', 'cutoff'), name='unique_account_balance_checkpoint'),
+        ),
+    ]
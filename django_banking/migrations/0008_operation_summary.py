@@ -0,0 +1,63 @@
+# Generated by Django 3.0.3 on 2026-10-18 01:34
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django_banking.core.db.fields
+import uuid
+
+from django_banking.models.transactions.utils import summarize_operations
+
+
+def backfill_summaries(apps, schema_editor):
+    Operation = apps.get_model('django_banking', 'Operation')
+    Transaction = apps.get_model('django_banking', 'Transaction')
+    OperationSummary = apps.get_model('django_banking', 'OperationSummary')
+    UserAccount = apps.get_model('django_banking', 'UserAccount')
+    UserFeeAccount = apps.get_model('django_banking', 'UserFeeAccount')
+
+    operation_ids = list(Operation.objects.order_by('pk').values_list('pk', flat=True))
+    for i in range(0, len(operation_ids), 1000):
+        summaries = summarize_operations(
+            Transaction.objects.filter(operation__in=operation_ids[i:i + 1000]),
+            UserAccount.objects.all(),
+            UserFeeAccount.objects.all(),
+        )
+        # `created_at` column appears only in 0010, which backfills it on its own
+        OperationSummary.objects.bulk_create(
+            [
+                OperationSummary(**{key: value for key, value in values.items() if key != 'created_at'})
+                for values in summaries
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.DJANGO_BANKING_USER_MODEL),
+        ('django_banking', '0007_balance_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OperationSummary',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('debit_amount', django_banking.core.db.fields.DecimalField(decimal_places=6, max_digits=16)),
+                ('credit_amount', django_banking.core.db.fields.DecimalField(decimal_places=6, max_digits=16)),
+                ('fee_amount', django_banking.core.db.fields.DecimalField(decimal_places=6, max_digits=16)),
+                ('credit_asset', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='django_banking.Asset')),
+                ('debit_asset', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='django_banking.Asset')),
+                ('fee_asset', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='django_banking.Asset')),
+                ('operation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='summaries', to='django_banking.Operation')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='operation_summaries', to=settings.DJANGO_BANKING_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='operationsummary',
+            constraint=models.UniqueConstraint(fields=('operation', 'user'), name='unique_operation_user_summary'),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
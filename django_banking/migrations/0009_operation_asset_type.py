@@ -0,0 +1,36 @@
+# Generated by Django 3.0.3 on 2026-10-18 01:38
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+
+
+def backfill_asset_types(apps, schema_editor):
+    Operation = apps.get_model('django_banking', 'Operation')
+    Transaction = apps.get_model('django_banking', 'Transaction')
+    asset_types = Transaction.objects.filter(
+        operation=OuterRef('pk'),
+    ).order_by().values('operation').annotate(
+        types_count=Count('account__asset__type', distinct=True),
+        asset_type=Min('account__asset__type'),
+    ).filter(types_count=1).values('asset_type')
+    Operation.objects.update(asset_type=Subquery(asset_types))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_banking', '0008_operation_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='operation',
+            name='asset_type',
+            field=models.CharField(choices=[('fiat', 'Fiat'), ('crypto', 'Cryptocurrency'), ('token', 'Token')], max_length=10, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='operation',
+            index=models.Index(fields=['type', 'asset_type', '-created_at'], name='operation_type_asset_created'),
+        ),
+        migrations.RunPython(backfill_asset_types, migrations.RunPython.noop),
+    ]
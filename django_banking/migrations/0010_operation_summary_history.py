@@ -0,0 +1,39 @@
+# Generated by Django 3.0.3 on 2026-10-18 02:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_created_at(apps, schema_editor):
+    Operation = apps.get_model('django_banking', 'Operation')
+    OperationSummary = apps.get_model('django_banking', 'OperationSummary')
+    OperationSummary.objects.update(
+        created_at=Subquery(
+            Operation.objects.filter(pk=OuterRef('operation_id')).values('created_at')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_banking', '0009_operation_asset_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='operationsummary',
+            name='created_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(backfill_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='operationsummary',
+            name='created_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='operationsummary',
+            index=models.Index(fields=['user', '-created_at', '-operation'], name='operation_summary_history'),
+        ),
+    ]
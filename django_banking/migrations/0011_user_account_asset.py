@@ -0,0 +1,34 @@
+# Generated by Django 3.0.3 on 2026-10-18 03:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+USER_ACCOUNT_MODELS = ['useraccount', 'userexchangeaccount', 'userfeeaccount', 'userroundingaccount']
+
+
+def backfill_asset(apps, schema_editor):
+    Account = apps.get_model('django_banking', 'Account')
+    for model_name in USER_ACCOUNT_MODELS:
+        apps.get_model('django_banking', model_name).objects.update(
+            asset=Subquery(Account.objects.filter(pk=OuterRef('account_id')).values('asset_id')[:1])
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_banking', '0010_operation_summary_history'),
+    ]
+
+    operations = [
+        *[
+            migrations.AddField(
+                model_name=model_name,
+                name='asset',
+                field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='django_banking.Asset'),
+            )
+            for model_name in USER_ACCOUNT_MODELS
+        ],
+        migrations.RunPython(backfill_asset, migrations.RunPython.noop),
+    ]
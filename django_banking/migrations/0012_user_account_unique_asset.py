@@ -0,0 +1,108 @@
+# Generated by Django 3.0.3 on 2026-10-18 03:10
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, F, Max, Sum
+import django.db.models.deletion
+
+USER_ACCOUNT_MODELS = ['useraccount', 'userexchangeaccount', 'userfeeaccount', 'userroundingaccount']
+
+
+def merge_balances(apps, account_id, merged_account_ids, cutoff):
+    """Add balances and the latest checkpoints of merged accounts to the kept account.
+
+    The latest checkpoint of any account is valid for the latest cutoff overall,
+    so their sum is the kept account checkpoint at that cutoff.
+    """
+    AccountBalance = apps.get_model('django_banking', 'AccountBalance')
+    BalanceCheckpoint = apps.get_model('django_banking', 'BalanceCheckpoint')
+
+    merged_balances = AccountBalance.objects.filter(account_id__in=merged_account_ids)
+    totals = merged_balances.aggregate(
+        hold=Sum('hold'), committed=Sum('committed'), available=Sum('available'),
+    )
+    changes = {field: F(field) + value for field, value in totals.items() if value}
+    if changes:
+        AccountBalance.objects.get_or_create(account_id=account_id)
+        AccountBalance.objects.filter(account_id=account_id).update(**changes)
+    merged_balances.delete()
+
+    if cutoff is None:
+        return
+    latest = list(BalanceCheckpoint.objects.filter(
+        account_id__in=[account_id, *merged_account_ids],
+    ).order_by('account_id', '-cutoff').distinct('account_id'))
+    BalanceCheckpoint.objects.filter(account_id__in=merged_account_ids).delete()
+    if latest:
+        BalanceCheckpoint.objects.update_or_create(
+            account_id=account_id,
+            cutoff=cutoff,
+            defaults={
+                'committed': sum(checkpoint.committed for checkpoint in latest),
+                'available': sum(checkpoint.available for checkpoint in latest),
+            },
+        )
+
+
+def merge_duplicate_relations(apps, schema_editor):
+    """Keep single relation per user and asset created by racy account provisioning.
+
+    Relation which account has most transactions is kept. Transactions,
+    balances and checkpoints of other duplicates, if any, are moved to the
+    kept account.
+    """
+    Transaction = apps.get_model('django_banking', 'Transaction')
+    BalanceCheckpoint = apps.get_model('django_banking', 'BalanceCheckpoint')
+    cutoff = BalanceCheckpoint.objects.aggregate(cutoff=Max('cutoff'))['cutoff']
+    for model_name in USER_ACCOUNT_MODELS:
+        model = apps.get_model('django_banking', model_name)
+        duplicated = model.objects.values('user_id', 'asset_id').annotate(
+            relations=Count('pk')
+        ).filter(relations__gt=1)
+        groups = defaultdict(list)
+        for relation in model.objects.filter(
+            user_id__in={row['user_id'] for row in duplicated},
+        ).annotate(
+            transactions_count=Count('account__transaction'),
+        ).order_by('-transactions_count', 'account_id'):
+            groups[relation.user_id, relation.asset_id].append(relation)
+
+        for kept, *duplicates in groups.values():
+            if not duplicates:
+                continue
+            used_duplicates = [
+                relation.account_id for relation in duplicates if relation.transactions_count
+            ]
+            if used_duplicates:
+                Transaction.objects.filter(account_id__in=used_duplicates).update(
+                    account_id=kept.account_id
+                )
+                merge_balances(apps, kept.account_id, used_duplicates, cutoff)
+            model.objects.filter(pk__in=[relation.pk for relation in duplicates]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_banking', '0011_user_account_asset'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_relations, migrations.RunPython.noop),
+        *[
+            migrations.AlterField(
+                model_name=model_name,
+                name='asset',
+                field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='django_banking.Asset'),
+            )
+            for model_name in USER_ACCOUNT_MODELS
+        ],
+        *[
+            migrations.AddConstraint(
+                model_name=model_name,
+                constraint=models.UniqueConstraint(fields=('user', 'asset'), name=f'django_banking_{model_name}_unique_user_asset'),
+            )
+            for model_name in USER_ACCOUNT_MODELS
+        ],
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.0.3 on 2026-10-18 02:04
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_banking', '0012_user_account_unique_asset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='operation',
+            name='reference_code',
+            field=models.CharField(db_index=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='operation',
+            name='refunded_deposit',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='refunds', to='django_banking.Operation'),
+        ),
+        migrations.AddField(
+            model_name='operation',
+            name='user_bank_account_uuid',
+            field=models.UUIDField(db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='operation',
+            name='references',
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.0.3 on 2026-10-18 03:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_banking', '0013_operation_reference_columns'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            UPDATE django_banking_operation refund
+            SET refunded_deposit_id = deposit.uuid
+            FROM django_banking_operation deposit
+            WHERE refund."references" ? 'deposit'
+              AND deposit.uuid::text = refund."references"->>'deposit';
+
+            UPDATE django_banking_operation
+            SET user_bank_account_uuid = ("references"->>'user_bank_account_uuid')::uuid
+            WHERE "references"->>'user_bank_account_uuid' ~* '^[0-9a-f]{8}-([0-9a-f]{4}-){3}[0-9a-f]{12}$';
+
+            UPDATE django_banking_operation
+            SET reference_code = "references"->>'reference_code'
+            WHERE "references" ? 'reference_code';
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.0.3 on 2026-10-18 02:30
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_banking', '0014_operation_reference_columns_backfill'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE django_banking_transaction tx
+            SET created_at = operation.created_at
+            FROM django_banking_operation operation
+            WHERE operation.uuid = tx.operation_id;
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,98 @@
+from django.db import migrations
+
+COLUMNS = '"uuid", "amount", "references", "account_id", "operation_id", "created_at"'
+
+CONSTRAINTS = """
+    ALTER TABLE django_banking_transaction
+        ADD CONSTRAINT "django_banking_trans_account_id_d14851f1_fk_django_ba"
+        FOREIGN KEY ("account_id") REFERENCES "django_banking_account" ("uuid")
+        DEFERRABLE INITIALLY DEFERRED;
+    ALTER TABLE django_banking_transaction
+        ADD CONSTRAINT "django_banking_trans_operation_id_f0396b01_fk_django_ba"
+        FOREIGN KEY ("operation_id") REFERENCES "django_banking_operation" ("uuid")
+        DEFERRABLE INITIALLY DEFERRED;
+    CREATE INDEX "django_banking_transaction_references_5168a9fc"
+        ON django_banking_transaction ("references");
+    CREATE INDEX "django_banking_transaction_account_id_d14851f1"
+        ON django_banking_transaction ("account_id");
+    CREATE INDEX "django_banking_transaction_operation_id_f0396b01"
+        ON django_banking_transaction ("operation_id");
+"""
+
+PARTITION = f"""
+    ALTER TABLE django_banking_transaction RENAME TO django_banking_transaction_unpartitioned;
+    ALTER INDEX django_banking_transaction_pkey RENAME TO django_banking_transaction_unpartitioned_pkey;
+
+    CREATE TABLE django_banking_transaction (
+        "uuid" uuid NOT NULL,
+        "amount" numeric(16, 6) NOT NULL,
+        "references" jsonb NOT NULL,
+        "account_id" uuid NOT NULL,
+        "operation_id" uuid NOT NULL,
+        "created_at" timestamp with time zone NOT NULL,
+        PRIMARY KEY ("uuid", "created_at")
+    ) PARTITION BY RANGE ("created_at");
+
+    CREATE TABLE django_banking_transaction_default
+        PARTITION OF django_banking_transaction DEFAULT;
+
+    DO $$
+    DECLARE
+        month date;
+    BEGIN
+        FOR month IN
+            SELECT generate_series(
+                date_trunc('month', coalesce(
+                    (SELECT min(created_at) FROM django_banking_transaction_unpartitioned), now()
+                ) AT TIME ZONE 'UTC'),
+                date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+                interval '1 month'
+            )::date
+        LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF django_banking_transaction '
+                'FOR VALUES FROM (%L) TO (%L)',
+                'django_banking_transaction_' || to_char(month, 'YYYY_MM'),
+                month::timestamp AT TIME ZONE 'UTC',
+                (month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+            );
+        END LOOP;
+    END $$;
+
+    INSERT INTO django_banking_transaction ({COLUMNS})
+    SELECT {COLUMNS} FROM django_banking_transaction_unpartitioned;
+
+    DROP TABLE django_banking_transaction_unpartitioned;
+    {CONSTRAINTS}
+"""
+
+UNPARTITION = f"""
+    ALTER TABLE django_banking_transaction RENAME TO django_banking_transaction_partitioned;
+    ALTER INDEX django_banking_transaction_pkey RENAME TO django_banking_transaction_partitioned_pkey;
+
+    CREATE TABLE django_banking_transaction (
+        "uuid" uuid NOT NULL PRIMARY KEY,
+        "amount" numeric(16, 6) NOT NULL,
+        "references" jsonb NOT NULL,
+        "account_id" uuid NOT NULL,
+        "operation_id" uuid NOT NULL,
+        "created_at" timestamp with time zone NOT NULL
+    );
+
+    INSERT INTO django_banking_transaction ({COLUMNS})
+    SELECT {COLUMNS} FROM django_banking_transaction_partitioned;
+
+    DROP TABLE django_banking_transaction_partitioned;
+    {CONSTRAINTS}
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_banking', '0015_transaction_created_at'),
+    ]
+
+    operations = [
+        migrations.RunSQL(PARTITION, UNPARTITION),
+    ]
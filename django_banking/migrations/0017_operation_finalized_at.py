@@ -0,0 +1,28 @@
+# Generated by Django 3.0.3 on 2026-10-18 03:02
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_finalized_at(apps, schema_editor):
+    # existing checkpoints were keyed on `updated_at`, keep them consistent
+    Operation = apps.get_model('django_banking', 'Operation')
+    Operation.objects.filter(status__in=['committed', 'cancelled', 'deleted']).update(
+        finalized_at=F('updated_at')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_banking', '0016_transaction_partitioning'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='operation',
+            name='finalized_at',
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_finalized_at, migrations.RunPython.noop),
+    ]
@@ -3,9 +3,14 @@ from .accounts.models import (  # NOQA
     UserAccount
 )
 from .assets.models import Asset  # NOQA
+from .balances.models import (  # NOQA
+    AccountBalance,
+    BalanceCheckpoint
+)
 from .fee.models import Fee  # NOQA
 from .transactions.models import (  # NOQA
     Operation,
+    OperationSummary,
     PaymentOperation,
     Transaction
 )
@@ -1,15 +1,22 @@
 from typing import (
     Any,
     Dict,
+    Iterable,
     List
 )
 
-from django.db import models
+from django.db import (
+    models,
+    transaction
+)
 from django.utils.functional import cached_property
 
 from django_banking import logger
 from django_banking.models.accounts.enum import AccountType
-from django_banking.user import User
+from django_banking.user import (
+    User,
+    get_financial_context
+)
 
 from ..assets.models import Asset
 
@@ -22,11 +29,71 @@ def user_account_queryset(user, assets=None):
     return qs.with_balances()
 
 
-class UserAccountManager(models.Manager):
+class AbstractUserAccountManager(models.Manager):
+
+    """Common user accounts provisioning.
+    """
+
+    _account_creation_kwargs: Dict[str, Any] = {}
+
+    @cached_property
+    def _related_name_from_account(self):
+        return self.model._meta.get_field('account').related_query_name()
+
+    def provision(self, user: User, assets: Iterable[Asset]) -> int:  # type: ignore
+        """Create user bookkeeping accounts for specified assets if they don't exist yet.
+
+        Accounts and their relations to user are inserted in bulk. Relations
+        conflicting by user and asset, created by concurrent request, are
+        skipped and accounts created for them are dropped.
+
+        :param user: user instance
+        :param assets: assets to create accounts for
+        :return: number of created accounts
+        """
+        from .models import Account
+        accounts = [Account(asset=asset, **self._account_creation_kwargs) for asset in assets]
+        if not accounts:
+            return 0
+
+        with transaction.atomic(using=self.db):
+            Account.objects.db_manager(self.db).bulk_create(accounts)
+            self.bulk_create(
+                [self.model(user=user, account=acc, asset_id=acc.asset_id) for acc in accounts],
+                ignore_conflicts=True,
+            )
+            dropped, _ = Account.objects.db_manager(self.db).filter(**{
+                'pk__in': [acc.pk for acc in accounts],
+                f'{self._related_name_from_account}__isnull': True,
+            }).delete()
+        get_financial_context(user).reset_accounts()
+
+        logger.info(
+            "%s %s accounts for user %s created",
+            len(accounts) - dropped, self.model.__name__, user
+        )
+        return len(accounts) - dropped
+
+    def for_customer(self, user: User, asset: Asset) -> 'Account':  # type: ignore # NOQA
+        """Get user' bookkeeping account for specified asset.
+
+        New account will be created if user account for specified asset
+        didn't found.
+        """
+        try:
+            return self.select_related('account').get(user=user, asset=asset).account
+        except self.model.DoesNotExist:
+            self.provision(user, [asset])
+            return self.select_related('account').get(user=user, asset=asset).account
+
+
+class UserAccountManager(AbstractUserAccountManager):
 
     """User account model manager.
     """
 
+    _account_creation_kwargs = dict(type=AccountType.TYPE_ACTIVE, strict=False)
+
     def get_user_accounts(self,
                           user: User,  # type: ignore
                           only_allowed_assets: bool = True) -> List['Account']:  # type: ignore # NOQA
@@ -43,53 +110,21 @@ class UserAccountManager(models.Manager):
             allowed_assets if only_allowed_assets else None
         )
 
-        clear = True
-
-        # create missed accounts
-        found_assets = {uac.asset for uac in user_accounts}
-        for asset in allowed_assets:
-            if asset not in found_assets:
-                self.for_customer(user, asset)
-                clear = False
-
-        if clear:
+        found_assets = {uac.asset_id for uac in user_accounts}
+        missed_assets = [asset for asset in allowed_assets if asset.pk not in found_assets]
+        if not missed_assets:
             return user_accounts
-        else:
-            # query db again if new accounts created
-            return user_account_queryset(
-                user,
-                allowed_assets if only_allowed_assets else None
-            )
 
-    def for_customer(self, user: User, asset: Asset) -> 'Account':  # type: ignore # NOQA
-        """Get user' bookkeeping account for specified asset.
-
-        New account will be created if user account for specified asset
-        didn't found.
-        """
-        from .models import Account
-        try:
-            obj = self.get(user=user, account__asset=asset).account
-            logger.debug("UserAccount account %s used as UserAccount "
-                         "for user %s and asset %s",
-                         obj, user, asset)
-            return obj
-        except self.model.DoesNotExist:
-            acc = Account.objects.create(
-                asset=asset,
-                type=AccountType.TYPE_ACTIVE,
-                strict=False
-            )
-            self.create(user=user, account=acc)
-            logger.info(
-                "UserAccount account %s for currency %s, user %s created",
-                acc, asset, user
-            )
-            return acc
+        self.provision(user, missed_assets)
 
+        # query db again if new accounts created
+        return user_account_queryset(
+            user,
+            allowed_assets if only_allowed_assets else None
+        )
 
 
-class BaseUserAccountManager(models.Manager):
+class BaseUserAccountManager(AbstractUserAccountManager):
     """Base user account model manager.
     """
 
@@ -99,10 +134,6 @@ class BaseUserAccountManager(models.Manager):
             account_creation_kwargs = {}
         self._account_creation_kwargs = account_creation_kwargs
 
-    @cached_property
-    def _related_name_from_account(self):
-        return self.model._meta.get_field('account').related_query_name()
-
     def _get_user_account_queryset(self, user, assets):
         from .models import Account
         return Account.objects.filter(**{
@@ -122,34 +153,12 @@ class BaseUserAccountManager(models.Manager):
 
         user_accounts = self._get_user_account_queryset(user, available_assets)
 
-        clear = True
-
-        # create missed accounts
-        found_assets = {uac.asset for uac in user_accounts}
-        for asset in available_assets:
-            if asset not in found_assets:
-                self.for_customer(user, asset)
-                clear = False
-
-        if clear:
+        found_assets = {uac.asset_id for uac in user_accounts}
+        missed_assets = [asset for asset in available_assets if asset.pk not in found_assets]
+        if not missed_assets:
             return user_accounts
-        else:
-            # query db again if new accounts created
-            return self._get_user_account_queryset(user, available_assets)
 
-    def for_customer(self, user: User, asset: Asset) -> 'Account':  # type: ignore # NOQA
-        """Get user' bookkeeping account for specified asset.
+        self.provision(user, missed_assets)
 
-        New account will be created if user account for specified asset
-        didn't found.
-        """
-        from .models import Account
-        try:
-            return self.get(user=user, account__asset=asset).account
-        except self.model.DoesNotExist:
-            acc = Account.objects.create(
-                asset=asset,
-                **self._account_creation_kwargs
-            )
-            self.create(user=user, account=acc)
-            return acc
+        # query db again if new accounts created
+        return self._get_user_account_queryset(user, available_assets)
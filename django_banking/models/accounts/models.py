@@ -2,7 +2,11 @@ from uuid import uuid4
 
 from django.contrib.postgres.fields import JSONField
 from django.db import models
-from django.db.models import Sum
+from django.db.models import (
+    F,
+    Sum,
+    UniqueConstraint
+)
 from django.db.models.functions import Coalesce
 from kombu.utils import cached_property
 
@@ -11,6 +15,7 @@ from django_banking.exceptions import AccountBalanceException
 from ...core.db.fields import DecimalField
 from ...settings import USER_MODEL
 from ..assets.models import Asset
+from ..assets.registry import asset_registry
 from ..transactions.enum import OperationStatus
 from .enum import AccountType
 from .managers import (
@@ -51,8 +56,11 @@ class Account(models.Model):
         if self.type == AccountType.TYPE_NORMAL:
             return True
 
-        balance = self.calculate_balance(include_new)
+        return self.validate_balance(self.calculate_balance(include_new))
 
+    def validate_balance(self, balance):
+        """Check balance against account type rules.
+        """
         if self.type == AccountType.TYPE_ACTIVE and balance < 0:
             raise AccountBalanceException(
                 self, "Balance of active account is less than 0"
@@ -65,30 +73,39 @@ class Account(models.Model):
         return True
 
     def calculate_balance(self, include_new=True):
-        from django_banking.models import Transaction
-        balance_qs = Transaction.objects.filter(account=self)
-
-        exclude_op_statuses = [
-            OperationStatus.DELETED,
-            OperationStatus.CANCELLED
-        ]
-
-        if include_new is False:
-            exclude_op_statuses.append(OperationStatus.NEW)
-
-        balance_qs = balance_qs.exclude(
-            operation__status__in=exclude_op_statuses)
+        """Calculate balance of held and committed operations.
 
-        return balance_qs.aggregate(
+        Persisted balance is used, so only transactions of new operations are
+        aggregated.
+        """
+        from django_banking.models import (
+            AccountBalance,
+            Transaction
+        )
+        balance = AccountBalance.objects.filter(account=self).aggregate(
             balance=Coalesce(
-                Sum('amount'),
+                Sum(F('hold') + F('committed')),
                 0,
                 output_field=DecimalField()
             )
         )['balance']
 
+        if include_new:
+            balance += Transaction.objects.filter(
+                account=self,
+                operation__status=OperationStatus.NEW,
+            ).aggregate(
+                balance=Coalesce(
+                    Sum('amount'),
+                    0,
+                    output_field=DecimalField()
+                )
+            )['balance']
+
+        return balance
+
     def __str__(self) -> str:
-        return f'Account(asset={self.asset.symbol})'
+        return f'Account(asset={asset_registry.get(self.asset_id).symbol})'
 
     @cached_property
     def is_active(self):
@@ -103,11 +120,24 @@ class AbstractUserAccount(models.Model):
     user = models.ForeignKey(to=USER_MODEL, on_delete=models.PROTECT)
     uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     account = models.ForeignKey(Account, on_delete=models.PROTECT)
+    #: copy of account asset to keep single account per asset
+    asset = models.ForeignKey(Asset, on_delete=models.PROTECT, related_name='+')
 
     objects = UserAccountManager()
 
     class Meta:
         abstract = True
+        constraints = [
+            UniqueConstraint(
+                fields=['user', 'asset'],
+                name='%(app_label)s_%(class)s_unique_user_asset'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.asset_id is None:
+            self.asset_id = self.account.asset_id
+        super().save(*args, **kwargs)
 
 
 class UserAccount(AbstractUserAccount):
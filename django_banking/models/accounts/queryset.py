@@ -1,49 +1,81 @@
+from typing import List
+
 from django.db import models
 from django.db.models import (
-    Q,
+    F,
+    OuterRef,
+    Subquery,
     Sum,
     Value
 )
 from django.db.models.functions import Coalesce
 
-from django_banking.models.assets.enum import AssetType
-from django_banking.models.transactions.enum import (
-    OperationStatus,
-    OperationType
-)
+from ...core.db.fields import DecimalField
+from ..transactions.enum import OperationStatus
+from .enum import AccountType
 
 
 class AccountQuerySet(models.QuerySet):
 
     def with_balances(self):
+        """Annotate user available balance from persisted account balances.
+        """
         return self.annotate(
-           balance=Coalesce(
-               Sum(
-                   'transaction__amount',
-                   filter=Q(
-                       transaction__operation__type=OperationType.DEPOSIT,
-                       transaction__operation__status=OperationStatus.COMMITTED,
-                   ) | Q(
-                       transaction__operation__type=OperationType.WITHDRAWAL,
-                       transaction__operation__status__in=[OperationStatus.HOLD, OperationStatus.COMMITTED],
-                   ) | Q(
-                       transaction__operation__type=OperationType.BUY,
-                       transaction__account__asset__type=AssetType.CRYPTO,
-                       transaction__operation__status=OperationStatus.COMMITTED,
-                   ) | Q(
-                       transaction__operation__type=OperationType.BUY,
-                       transaction__account__asset__type=AssetType.FIAT,
-                       transaction__operation__status__in=[OperationStatus.HOLD, OperationStatus.COMMITTED],
-                   ) | Q(
-                       transaction__operation__type=OperationType.SELL,
-                       asset__type=AssetType.FIAT,
-                       transaction__operation__status=OperationStatus.COMMITTED,
-                   ) | Q(
-                       transaction__operation__type=OperationType.SELL,
-                       asset__type=AssetType.CRYPTO,
-                       transaction__operation__status__in=[OperationStatus.HOLD, OperationStatus.COMMITTED],
-                   )
-               ),
-               Value(0)
-           )
+            balance=Coalesce(F('live_balance__available'), Value(0))
+        )
+
+    def with_total_balance(self, include_new=True):
+        """Annotate balance of held and committed operations, see `Account.calculate_balance`.
+
+        Subqueries are used instead of joins, so balances of any number of
+        accounts are calculated with single query.
+        """
+        from ..balances.models import AccountBalance
+        from ..transactions.models import Transaction
+
+        persisted = AccountBalance.objects.filter(
+            account=OuterRef('pk'),
+        ).annotate(
+            total=F('hold') + F('committed'),
+        ).values('total')[:1]
+        balance = Coalesce(Subquery(persisted, output_field=DecimalField()), Value(0))
+
+        if include_new:
+            new = Transaction.objects.filter(
+                account=OuterRef('pk'),
+                operation__status=OperationStatus.NEW,
+            ).order_by().values('account').annotate(
+                total=Sum('amount'),
+            ).values('total')
+            balance += Coalesce(Subquery(new, output_field=DecimalField()), Value(0))
+
+        return self.annotate(total_balance=balance)
+
+    def lock_for_validation(self) -> List:
+        """Lock rows of accounts whose balances are validated and return their ids.
+
+        Normal accounts aren't validated and are shared by all users, so they
+        are never locked. Rows are locked in primary key order, so concurrent
+        operations sharing accounts can't deadlock.
+        """
+        return list(
+            self.exclude(type=AccountType.TYPE_NORMAL)
+                .select_for_update()
+                .order_by('pk')
+                .values_list('pk', flat=True)
         )
+
+    def validate_balances(self, include_new=True):
+        """Lock accounts and check their balances against type rules.
+
+        Balances are calculated by separate statement after locks are acquired,
+        so it sees results of concurrent operations committed while waiting.
+        """
+        locked = self.lock_for_validation()
+        qs = self.model.objects.db_manager(self.db) \
+            .filter(pk__in=locked) \
+            .with_total_balance(include_new) \
+            .order_by('pk')
+        for account in qs:
+            account.validate_balance(account.total_balance)
+        return True
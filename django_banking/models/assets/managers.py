@@ -1,21 +1,20 @@
-from django.db import models
-from django.db.models import Q
+from typing import List
 
-from .enum import AssetType
+from django.db import models
 
 
 class AssetManager(models.Manager):
-    def for_customer(self, user) -> models.QuerySet:
-        user_country = user.get_residency_country_code()
-        return self.filter(
-            Q(type=AssetType.CRYPTO) |
-            Q(type=AssetType.FIAT, country=user_country) |
-            Q(type=AssetType.FIAT, country__isnull=True),
-        )
+
+    """Assets manager.
+
+    Customer lookups are answered from user financial context and in-process
+    registry without queries.
+    """
+
+    def for_customer(self, user) -> List['Asset']:  # type: ignore # NOQA
+        from django_banking.user import get_financial_context
+        return list(get_financial_context(user).allowed_assets)
 
     def main_fiat_for_customer(self, user) -> 'Asset':  # type: ignore # NOQA
-        user_country = user.get_residency_country_code()
-        return self.filter(
-            Q(country=user_country) | Q(country__isnull=True),
-            type=AssetType.FIAT,
-        ).order_by('country').last()
+        from django_banking.user import get_financial_context
+        return get_financial_context(user).main_fiat_asset
@@ -0,0 +1,81 @@
+from collections import defaultdict
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple
+)
+from uuid import UUID
+
+from ...core.registry import Registry
+
+if TYPE_CHECKING:
+    from .models import Asset  # NOQA
+
+
+class AssetIndex:
+
+    """Lookup tables over loaded assets.
+    """
+
+    def __init__(self, assets: Iterable['Asset']):
+        self.assets = list(assets)
+        self.by_pk: Dict[UUID, 'Asset'] = {}
+        self.by_symbol: Dict[str, 'Asset'] = {}
+        self.by_type: Dict[str, List['Asset']] = defaultdict(list)
+        self.by_type_country: Dict[Tuple[str, Optional[str]], List['Asset']] = defaultdict(list)
+        for asset in self.assets:
+            self.by_pk[asset.pk] = asset
+            self.by_symbol[asset.symbol] = asset
+            self.by_type[asset.type].append(asset)
+            self.by_type_country[asset.type, asset.country].append(asset)
+
+
+class AssetRegistry(Registry):
+
+    """In-process registry of assets.
+
+    Dropped on any asset save or delete.
+    """
+
+    version_cache_key = 'django_banking:asset_registry:version'
+
+    def load(self) -> AssetIndex:
+        from .models import Asset
+        return AssetIndex(Asset.objects.order_by('symbol'))
+
+    def all(self) -> List['Asset']:
+        return list(self.get_index().assets)
+
+    def get(self, pk) -> 'Asset':
+        from .models import Asset
+
+        try:
+            return self.get_index().by_pk[pk if isinstance(pk, UUID) else UUID(str(pk))]
+        except (KeyError, ValueError):
+            raise Asset.DoesNotExist(f'Asset {pk} does not exist')
+
+    def get_by_symbol(self, symbol: str) -> 'Asset':
+        from .models import Asset
+
+        try:
+            return self.get_index().by_symbol[symbol]
+        except KeyError:
+            raise Asset.DoesNotExist(f'Asset {symbol} does not exist')
+
+    def filter(self, type: str, countries: Iterable[Optional[str]] = None) -> List['Asset']:
+        """Get assets of specified type issued in any of provided countries, `None` for global ones.
+        """
+        index = self.get_index()
+        if countries is None:
+            return list(index.by_type.get(type, []))
+        return [
+            asset
+            for country in dict.fromkeys(countries)
+            for asset in index.by_type_country.get((type, country), [])
+        ]
+
+
+asset_registry = AssetRegistry()
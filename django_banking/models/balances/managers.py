@@ -0,0 +1,232 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional
+)
+
+from django.db import (
+    connections,
+    models,
+    transaction
+)
+from django.db.models import (
+    F,
+    Max
+)
+from django.utils.timezone import now
+
+from django_banking import logger
+
+from ...settings import BALANCE_CHECKPOINT_LAG
+from .utils import (
+    FINAL_STATUSES,
+    BalanceDelta,
+    aggregate_balances,
+    empty_balance
+)
+
+if TYPE_CHECKING:
+    from ..transactions.models import Operation  # NOQA
+
+
+class BalanceMismatch(NamedTuple):
+    account_id: str
+    field: str
+    stored: Decimal
+    actual: Decimal
+
+
+class AccountBalanceManager(models.Manager):
+
+    """Persisted account balances manager.
+
+    Balances are changed incrementally on every operation status transition, so
+    they must be applied inside the same db transaction as status change.
+    """
+
+    def apply_transition(self, operation: 'Operation', from_status: str, to_status: str):
+        """Move operation transactions amounts between balance buckets.
+        """
+        if from_status == to_status:
+            return
+        delta = BalanceDelta()
+        rows = operation.transactions.values_list('account_id', 'account__asset__type', 'amount')
+        for account_id, asset_type, amount in rows:
+            delta.add_transition(
+                account_id=account_id,
+                asset_type=asset_type,
+                operation_type=operation.type,
+                amount=amount,
+                from_status=from_status,
+                to_status=to_status,
+            )
+        self.apply_delta(delta)
+
+    def apply_delta(self, delta: BalanceDelta):
+        """Apply accumulated changes to persisted balances.
+
+        Rows are updated in account id order to avoid deadlocks between
+        concurrent operations sharing accounts.
+        """
+        items = list(delta.items())
+        if not items:
+            return
+        with transaction.atomic(using=self.db):
+            self.bulk_create(
+                [self.model(account_id=account_id) for account_id, _ in items],
+                ignore_conflicts=True,
+            )
+            for account_id, changes in items:
+                self.filter(account_id=account_id).update(
+                    updated_at=now(),
+                    **{field: F(field) + value for field, value in changes.items() if value}
+                )
+
+    def rebuild(self, accounts: Iterable = None) -> int:
+        """Recalculate persisted balances from the latest checkpoints and transactions after them.
+
+        :param accounts: accounts to rebuild, all accounts by default
+        :return: number of rebuilt balances
+        """
+        from .models import BalanceCheckpoint
+        with transaction.atomic(using=self.db):
+            actual = BalanceCheckpoint.objects.calculate_balances(accounts)
+            stored_qs = self.all()
+            if accounts is not None:
+                stored_qs = stored_qs.filter(account__in=accounts)
+            stored_qs.delete()
+            self.bulk_create(
+                [
+                    self.model(account_id=account_id, **values)
+                    for account_id, values in actual.items()
+                ],
+                batch_size=1000,
+            )
+        logger.info("%s account balances rebuilt", len(actual))
+        return len(actual)
+
+    def check_consistency(self, accounts: Iterable = None) -> List[BalanceMismatch]:
+        """Compare persisted balances with ones calculated from checkpoints and transactions.
+        """
+        from .models import BalanceCheckpoint
+        stored_qs = self.all()
+        if accounts is not None:
+            stored_qs = stored_qs.filter(account__in=accounts)
+
+        actual = BalanceCheckpoint.objects.calculate_balances(accounts)
+        stored: Dict = {
+            obj.account_id: {field: getattr(obj, field) for field in BalanceDelta.FIELDS}
+            for obj in stored_qs
+        }
+
+        mismatches = []
+        for account_id in sorted(set(actual) | set(stored), key=str):
+            actual_values = actual.get(account_id, empty_balance())
+            stored_values = stored.get(account_id, empty_balance())
+            for field in BalanceDelta.FIELDS:
+                if actual_values[field] != stored_values[field]:
+                    mismatches.append(BalanceMismatch(
+                        account_id=account_id,
+                        field=field,
+                        stored=stored_values[field],
+                        actual=actual_values[field],
+                    ))
+        return mismatches
+
+
+class BalanceCheckpointManager(models.Manager):
+
+    """Balance checkpoints manager.
+
+    Checkpoint keeps account balance of operations finalized before its cutoff.
+    Account gets new checkpoint only if it had finalized operations since the
+    previous one, so the latest checkpoint of account is valid for the latest
+    cutoff overall.
+    """
+
+    def latest_cutoff(self) -> Optional[datetime]:
+        return self.aggregate(cutoff=Max('cutoff'))['cutoff']
+
+    def latest_for_accounts(self, accounts: Iterable = None) -> models.QuerySet:
+        qs = self.order_by('account_id', '-cutoff').distinct('account_id')
+        if accounts is not None:
+            qs = qs.filter(account__in=accounts)
+        return qs
+
+    def roll_forward(self, cutoff: datetime = None) -> int:
+        """Create checkpoints for accounts affected by operations finalized since the latest cutoff.
+
+        :param cutoff: new cutoff, `BALANCE_CHECKPOINT_LAG` before now by default
+        :return: number of created checkpoints
+        """
+        from ..transactions.models import Transaction
+        cutoff = cutoff or now() - BALANCE_CHECKPOINT_LAG
+
+        with transaction.atomic(using=self.db):
+            # concurrent rolls would count the same window twice
+            with connections[self.db].cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {self.model._meta.db_table} IN EXCLUSIVE MODE')
+
+            previous_cutoff = self.latest_cutoff()
+            if previous_cutoff is not None and cutoff <= previous_cutoff:
+                return 0
+
+            window = Transaction.objects.filter(
+                operation__status__in=FINAL_STATUSES,
+                operation__finalized_at__lt=cutoff,
+            )
+            if previous_cutoff is not None:
+                window = window.filter(operation__finalized_at__gte=previous_cutoff)
+            deltas = aggregate_balances(window)
+
+            previous = {
+                checkpoint.account_id: checkpoint
+                for checkpoint in self.latest_for_accounts(list(deltas))
+            }
+            checkpoints = []
+            for account_id, delta in deltas.items():
+                checkpoint = self.model(
+                    account_id=account_id,
+                    cutoff=cutoff,
+                    committed=delta['committed'],
+                    available=delta['available'],
+                )
+                if account_id in previous:
+                    checkpoint.committed += previous[account_id].committed
+                    checkpoint.available += previous[account_id].available
+                checkpoints.append(checkpoint)
+            self.bulk_create(checkpoints, batch_size=1000)
+
+        logger.info("%s balance checkpoints created at %s", len(checkpoints), cutoff)
+        return len(checkpoints)
+
+    def calculate_balances(self, accounts: Iterable = None) -> Dict:
+        """Calculate account balances from the latest checkpoints and transactions after them.
+
+        :param accounts: accounts to calculate, all accounts by default
+        :return: mapping of account id to balance buckets
+        """
+        from ..transactions.models import Transaction
+        transactions = Transaction.objects.db_manager(self.db).all()
+        if accounts is not None:
+            transactions = transactions.filter(account__in=accounts)
+
+        cutoff = self.latest_cutoff()
+        if cutoff is not None:
+            transactions = transactions.exclude(
+                operation__status__in=FINAL_STATUSES,
+                operation__finalized_at__lt=cutoff,
+            )
+
+        balances = aggregate_balances(transactions)
+        if cutoff is not None:
+            for checkpoint in self.latest_for_accounts(accounts):
+                values = balances.setdefault(checkpoint.account_id, empty_balance())
+                values['committed'] += checkpoint.committed
+                values['available'] += checkpoint.available
+        return balances
@@ -0,0 +1,79 @@
+from uuid import uuid4
+
+from django.db import models
+
+from django_banking.core.db.fields import DecimalField
+
+from ..accounts.models import Account
+from .managers import (
+    AccountBalanceManager,
+    BalanceCheckpointManager
+)
+
+
+class AccountBalance(models.Model):
+
+    """Persisted account balance.
+
+    Maintained incrementally on operation status transitions, see
+    `AccountBalanceManager.apply_transition`. Transactions of new operations
+    aren't counted here.
+    """
+
+    account = models.OneToOneField(
+        Account,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='live_balance',
+    )
+
+    #: sum of transactions of held operations
+    hold = DecimalField(default=0)
+    #: sum of transactions of committed operations
+    committed = DecimalField(default=0)
+    #: balance available to user, see `AVAILABLE_BALANCE_RULES`
+    available = DecimalField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = AccountBalanceManager()
+
+    def __str__(self) -> str:
+        return f'AccountBalance(account={self.account_id}, available={self.available})'
+
+
+class BalanceCheckpoint(models.Model):
+
+    """Account balance of operations finalized before cutoff.
+
+    Created periodically, see `BalanceCheckpointManager.roll_forward`. Balance
+    calculation from history has to aggregate only transactions after the latest
+    cutoff.
+    """
+
+    uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        related_name='balance_checkpoints',
+    )
+    #: operations with `finalized_at` before cutoff are counted
+    cutoff = models.DateTimeField(db_index=True)
+
+    committed = DecimalField(default=0)
+    available = DecimalField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = BalanceCheckpointManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['account', 'cutoff'], name='unique_account_balance_checkpoint',
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f'BalanceCheckpoint(account={self.account_id}, cutoff={self.cutoff})'
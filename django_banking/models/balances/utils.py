@@ -0,0 +1,132 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Optional,
+    Tuple
+)
+
+from django.db.models import (
+    Q,
+    QuerySet,
+    Sum
+)
+
+from ..assets.enum import AssetType
+from ..transactions.enum import (
+    OperationStatus,
+    OperationType
+)
+
+#: operation statuses which can't be changed once covered by balance checkpoint
+FINAL_STATUSES = frozenset({
+    OperationStatus.COMMITTED,
+    OperationStatus.CANCELLED,
+    OperationStatus.DELETED,
+})
+SETTLED_STATUSES = frozenset({OperationStatus.COMMITTED})
+RESERVED_STATUSES = frozenset({OperationStatus.HOLD, OperationStatus.COMMITTED})
+
+#: operation statuses which make a transaction visible in the user available balance.
+#: incoming funds are counted once committed, outgoing funds as soon as they are held.
+#: `None` asset type matches accounts of any asset.
+AVAILABLE_BALANCE_RULES: Dict[Tuple[str, Optional[str]], FrozenSet[str]] = {
+    (OperationType.DEPOSIT, None): SETTLED_STATUSES,
+    (OperationType.WITHDRAWAL, None): RESERVED_STATUSES,
+    (OperationType.BUY, AssetType.CRYPTO): SETTLED_STATUSES,
+    (OperationType.BUY, AssetType.FIAT): RESERVED_STATUSES,
+    (OperationType.SELL, AssetType.FIAT): SETTLED_STATUSES,
+    (OperationType.SELL, AssetType.CRYPTO): RESERVED_STATUSES,
+}
+
+
+def is_available(operation_type: str, operation_status: str, asset_type: str) -> bool:
+    """Check if transaction affects user available balance.
+    """
+    statuses = AVAILABLE_BALANCE_RULES.get(
+        (operation_type, asset_type),
+        AVAILABLE_BALANCE_RULES.get((operation_type, None), ())
+    )
+    return operation_status in statuses
+
+
+def available_balance_q(prefix: str = '') -> Q:
+    """Build transactions filter matching `AVAILABLE_BALANCE_RULES`.
+
+    :param prefix: lookup path from queried model to `Transaction`, e.g. `transaction__`
+    """
+    q = Q()
+    for (operation_type, asset_type), statuses in AVAILABLE_BALANCE_RULES.items():
+        lookups = {
+            f'{prefix}operation__type': operation_type,
+            f'{prefix}operation__status__in': sorted(statuses),
+        }
+        if asset_type is not None:
+            lookups[f'{prefix}account__asset__type'] = asset_type
+        q |= Q(**lookups)
+    return q
+
+
+class BalanceDelta:
+
+    """Accumulator of account balance changes grouped by bucket.
+    """
+
+    FIELDS = ('hold', 'committed', 'available')
+
+    def __init__(self):
+        self._deltas: Dict = defaultdict(empty_balance)
+
+    def add(self, account_id, field: str, amount: Decimal):
+        self._deltas[account_id][field] += amount
+
+    def add_transition(self,
+                       account_id,
+                       asset_type: str,
+                       operation_type: str,
+                       amount: Decimal,
+                       from_status: str,
+                       to_status: str):
+        """Move transaction amount between buckets according to operation status transition.
+        """
+        for status, sign in ((from_status, -1), (to_status, 1)):
+            if status == OperationStatus.HOLD:
+                self.add(account_id, 'hold', sign * amount)
+            elif status == OperationStatus.COMMITTED:
+                self.add(account_id, 'committed', sign * amount)
+            if is_available(operation_type, status, asset_type):
+                self.add(account_id, 'available', sign * amount)
+
+    def items(self) -> Iterable:
+        """Iterate over non-zero deltas ordered by account id.
+        """
+        for account_id in sorted(self._deltas, key=str):
+            delta = self._deltas[account_id]
+            if any(delta.values()):
+                yield account_id, delta
+
+
+def aggregate_balances(transactions: QuerySet) -> Dict:
+    """Calculate balance buckets for accounts from transactions history.
+
+    Works with historical models as well, so it could be used in migrations.
+
+    :param transactions: `Transaction` queryset
+    :return: mapping of account id to bucket values
+    """
+    qs = transactions.order_by().values('account_id').annotate(
+        hold=Sum('amount', filter=Q(operation__status=OperationStatus.HOLD)),
+        committed=Sum('amount', filter=Q(operation__status=OperationStatus.COMMITTED)),
+        available=Sum('amount', filter=available_balance_q()),
+    )
+    return {
+        row['account_id']: {
+            field: row[field] or Decimal(0) for field in BalanceDelta.FIELDS
+        } for row in qs
+    }
+
+
+def empty_balance() -> Dict:
+    return dict.fromkeys(BalanceDelta.FIELDS, Decimal(0))
@@ -0,0 +1,41 @@
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Optional,
+    Tuple
+)
+from uuid import UUID
+
+from ...core.registry import Registry
+
+if TYPE_CHECKING:
+    from ..assets.models import Asset  # NOQA
+    from .models import Fee  # NOQA
+
+
+class FeeSchedule(Registry):
+
+    """In-process registry of fees by operation type and asset.
+
+    Fee without asset is used for assets which don't have own fee of the
+    operation type. Dropped on any fee save or delete in every process
+    sharing default cache, including admin one.
+    """
+
+    version_cache_key = 'django_banking:fee_schedule:version'
+
+    def load(self) -> Dict[Tuple[str, Optional[UUID]], 'Fee']:
+        from .models import Fee
+        return {(fee.operation_type, fee.asset_id): fee for fee in Fee.objects.all()}
+
+    def get(self, operation_type: str, asset: 'Asset') -> 'Fee':
+        from .models import Fee
+
+        fees = self.get_index()
+        fee = fees.get((operation_type, asset.pk)) or fees.get((operation_type, None))
+        if fee is None:
+            raise Fee.DoesNotExist(f'Fee of {operation_type} for {asset} does not exist')
+        return fee
+
+
+fee_schedule = FeeSchedule()
@@ -3,12 +3,30 @@ from decimal import (
     ROUND_DOWN,
     Decimal
 )
+from typing import (
+    Iterable,
+    List
+)
 
 from django_banking.core.data import Amount
 from django_banking.models.fee.enum import FeeOperationType
 
 from ..assets.models import Asset
-from ..fee.models import Fee
+from .schedule import fee_schedule
+
+
+def calculate_fees(
+    amounts: Iterable[Decimal],
+    asset: Asset,
+    operation_type: str,
+) -> List[Amount]:
+    """Calculate fees of many amounts with single fee lookup in cached schedule.
+    """
+    fee = fee_schedule.get(operation_type, asset)
+    return [
+        Amount.quantize(fee.calculate(amount), decimals=asset.decimals, rounding=ROUND_DOWN)
+        for amount in amounts
+    ]
 
 
 def calculate_fee(
@@ -16,12 +34,7 @@ def calculate_fee(
     asset: Asset,
     operation_type: str,
 ) -> Amount:
-    try:
-        fee = Fee.objects.get(operation_type=operation_type, asset=asset)
-    except Fee.DoesNotExist:
-        fee = Fee.objects.get(operation_type=operation_type, asset__isnull=True)
-    fee_amount = fee.calculate(amount)
-    return Amount.quantize(fee_amount, decimals=asset.decimals, rounding=ROUND_DOWN)
+    return calculate_fees([amount], asset, operation_type)[0]
 
 
 calculate_fee_crypto_withdrawal = functools.partial(
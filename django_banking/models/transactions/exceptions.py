@@ -18,6 +18,13 @@ class OperationBalanceException(OperationException):
         )
 
 
+class OperationArchivedException(OperationException):
+    reason = "Operation transactions are moved to archive."
+
+    def __init__(self, operation):
+        super().__init__(operation)
+
+
 class TransactionException(AccountingException):
     def __init__(self, transaction, reason=None):
         self.transaction = transaction
@@ -1,20 +1,32 @@
 from decimal import Decimal
 from typing import (
     TYPE_CHECKING,
-    Dict
+    Dict,
+    Iterable,
+    List
 )
 
 from django.db import (
     models,
     transaction
 )
+from django.utils.timezone import now
 
+from ...limitations.cache import invalidate_limits_usage
 from .. import Account
 from ..assets.enum import AssetType
+from ..assets.models import Asset
+from ..balances.utils import BalanceDelta
 from .enum import (
     OperationStatus,
     OperationType
 )
+from .exceptions import OperationArchivedException
+from .posting import Posting
+from .utils import (
+    get_operation_asset_type,
+    summarize_operations
+)
 
 if TYPE_CHECKING:
     from .models import Operation
@@ -57,27 +69,25 @@ class OperationManager(models.Manager):
                'user_bank_account_uuid' in references, \
             "Bank account ID must be provided"
 
-        with transaction.atomic():
-            operation = self.create(
-                type=OperationType.DEPOSIT,
-                references=references or {},
-                metadata=metadata or {},
-            )
-
-            operation.transactions.create(account=payment_method_account, amount=-amount)
-            operation.transactions.create(account=user_account, amount=amount)
+        posting = Posting(
+            type=OperationType.DEPOSIT,
+            references=references,
+            metadata=metadata,
+            model=self.model,
+        )
+        posting.add(payment_method_account, -amount)
+        posting.add(user_account, amount)
 
-            if fee_account and fee_amount:
-                operation.transactions.create(account=user_account, amount=-fee_amount)
-                operation.transactions.create(account=fee_account, amount=fee_amount)
+        if fee_account and fee_amount:
+            posting.add(user_account, -fee_amount)
+            posting.add(fee_account, fee_amount)
 
-            if rounding_amount and rounding_account:
-                operation.transactions.create(account=payment_method_account, amount=rounding_amount)
-                operation.transactions.create(account=rounding_account, amount=-rounding_amount)
+        if rounding_amount and rounding_account:
+            posting.add(payment_method_account, rounding_amount)
+            posting.add(rounding_account, -rounding_amount)
 
-        return self._validate_hold_or_delete(operation, hold)
+        return self.post([posting], hold=hold)[0]
 
-    @transaction.atomic()
     def create_withdrawal(self,
                           user_account: Account,
                           payment_method_account: Account,
@@ -104,24 +114,24 @@ class OperationManager(models.Manager):
         """
         assert amount > 0, "Withdrawal amount must be greater than 0"
 
-        operation = self.create(
+        posting = Posting(
             type=OperationType.WITHDRAWAL,
-            references=references or {},
-            metadata=metadata or {},
+            references=references,
+            metadata=metadata,
+            model=self.model,
         )
-
-        operation.transactions.create(account=user_account, amount=-amount)
-        operation.transactions.create(account=payment_method_account, amount=amount)
+        posting.add(user_account, -amount)
+        posting.add(payment_method_account, amount)
 
         if fee_amount and fee_account:
-            operation.transactions.create(account=user_account, amount=-fee_amount)
-            operation.transactions.create(account=fee_account, amount=fee_amount)
+            posting.add(user_account, -fee_amount)
+            posting.add(fee_account, fee_amount)
 
         if rounding_amount and rounding_account:
-            operation.transactions.create(account=payment_method_account, amount=rounding_amount)
-            operation.transactions.create(account=rounding_account, amount=-rounding_amount)
+            posting.add(payment_method_account, rounding_amount)
+            posting.add(rounding_account, -rounding_amount)
 
-        return self._validate_hold_or_delete(operation, hold)
+        return self.post([posting], hold=hold)[0]
 
     def create_exchange(
         self,
@@ -143,27 +153,26 @@ class OperationManager(models.Manager):
     ) -> 'Operation':
         assert base_amount * quote_amount < 0, 'Exchange operation must decrease one account and increase another'
         assert fee_amount >= 0, 'Fee can\'t be negative'
-        with transaction.atomic():
-            operation = self.create(
-                type=OperationType.BUY if base_amount > 0 else OperationType.SELL,
-                references=references or {},
-                metadata=metadata or {},
-            )
-
-            operation.transactions.create(account=base_account, amount=base_amount)
-            operation.transactions.create(account=base_exchange_account, amount=-base_amount)
-            operation.transactions.create(account=quote_account, amount=quote_amount)
-            operation.transactions.create(account=quote_exchange_account, amount=-quote_amount)
-            operation.transactions.create(account=quote_account, amount=-fee_amount)
-            operation.transactions.create(account=fee_account, amount=fee_amount)
-            if base_rounding_amount and base_rounding_account:
-                operation.transactions.create(account=base_exchange_account, amount=base_rounding_amount)
-                operation.transactions.create(account=base_rounding_account, amount=-base_rounding_amount)
-            if quote_rounding_amount and quote_rounding_account:
-                operation.transactions.create(account=quote_exchange_account, amount=quote_rounding_amount)
-                operation.transactions.create(account=quote_rounding_account, amount=-quote_rounding_amount)
-
-        return self._validate_hold_or_delete(operation, hold)
+        posting = Posting(
+            type=OperationType.BUY if base_amount > 0 else OperationType.SELL,
+            references=references,
+            metadata=metadata,
+            model=self.model,
+        )
+        posting.add(base_account, base_amount)
+        posting.add(base_exchange_account, -base_amount)
+        posting.add(quote_account, quote_amount)
+        posting.add(quote_exchange_account, -quote_amount)
+        posting.add(quote_account, -fee_amount)
+        posting.add(fee_account, fee_amount)
+        if base_rounding_amount and base_rounding_account:
+            posting.add(base_exchange_account, base_rounding_amount)
+            posting.add(base_rounding_account, -base_rounding_amount)
+        if quote_rounding_amount and quote_rounding_account:
+            posting.add(quote_exchange_account, quote_rounding_amount)
+            posting.add(quote_rounding_account, -quote_rounding_amount)
+
+        return self.post([posting], hold=hold)[0]
 
     def create_refund(
         self,
@@ -173,45 +182,133 @@ class OperationManager(models.Manager):
         hold: bool = True,
         metadata: Dict = None,
     ) -> 'Operation':
+        from .partitions import get_archived_operations
         assert deposit.is_committed, "Deposit must be committed first"
 
-        with transaction.atomic():
-            # refund can be made only the same way as deposit made
-            # as soon as the greatest amount transaction is always at the user account a
-            # and the highest negative value transaction made from payment_method_account
-            # do the following (in the terms of deposit)
-
-            transactions = deposit.transactions.order_by('amount')
-            user_account = transactions.first().account
-            payment_method_account = transactions.last().account
-
-            references = references or {}
-            references['deposit'] = str(deposit.pk)
-            operation = self.create(
-                type=OperationType.REFUND,
-                references=references,
-                metadata=metadata or {},
-            )
+        # refund can be made only the same way as deposit made
+        # as soon as the greatest amount transaction is always at the user account a
+        # and the highest negative value transaction made from payment_method_account
+        # do the following (in the terms of deposit)
+
+        transactions = list(deposit.transactions.select_related('account').order_by('amount'))
+        if not transactions and get_archived_operations([deposit.pk], using=self.db):
+            raise OperationArchivedException(deposit)
+        user_account = transactions[0].account
+        payment_method_account = transactions[-1].account
+
+        references = references or {}
+        references['deposit'] = str(deposit.pk)
+        posting = Posting(
+            type=OperationType.REFUND,
+            references=references,
+            metadata=metadata,
+            model=self.model,
+        )
+        posting.add(user_account, -amount)
+        posting.add(payment_method_account, amount)
+
+        return self.post([posting], hold=hold)[0]
 
-            operation.transactions.create(account=user_account, amount=-amount)
-            operation.transactions.create(account=payment_method_account, amount=amount)
+    def post(
+        self, postings: List[Posting], hold: bool = True, commit: bool = False
+    ) -> List['Operation']:
+        """Write operations with their transactions in bulk.
 
-        return self._validate_hold_or_delete(operation, hold)
+        Postings are validated in memory, written with one INSERT per table and
+        affected accounts are validated once for all postings. Nothing is
+        written if any posting is invalid.
 
-    @staticmethod
-    def _validate_hold_or_delete(operation, hold=True):
-        try:
-            operation.is_valid()
-        except:
-            operation.delete()
-            raise
+        :param postings: operation drafts
+        :param hold: operations will be automatically held
+        :param commit: operations will be committed right away, for already settled payments
+        :return: list of created operations
+        """
+        from ..balances.models import AccountBalance
+        from .models import (
+            OperationSummary,
+            Transaction
+        )
+
+        for posting in postings:
+            posting.validate()
+
+        operations = [posting.operation for posting in postings]
+        transactions = [tx for posting in postings for tx in posting.transactions]
+        accounts = {tx.account_id: tx.account for tx in transactions}
+        affected_accounts = Account.objects.db_manager(self.db).filter(pk__in=accounts)
+
+        asset_types = dict(
+            Asset.objects.db_manager(self.db).filter(
+                pk__in={account.asset_id for account in accounts.values()}
+            ).values_list('pk', 'type')
+        )
+        for posting in postings:
+            posting.operation.asset_type = get_operation_asset_type(
+                asset_types[tx.account.asset_id] for tx in posting.transactions
+            )
+
+        with transaction.atomic(using=self.db):
+            # lock before insert: FK checks of inserted transactions take
+            # shared locks on accounts rows which would conflict with it later
+            affected_accounts.lock_for_validation()
+            self.bulk_create(operations)
+            Transaction.objects.bulk_create(transactions)
+            affected_accounts.validate_balances()
+            OperationSummary.objects.db_manager(self.db).refresh(operations)
+
+            if hold or commit:
+                status = OperationStatus.COMMITTED if commit else OperationStatus.HOLD
+                delta = BalanceDelta()
+                for tx in transactions:
+                    delta.add_transition(
+                        account_id=tx.account_id,
+                        asset_type=asset_types[tx.account.asset_id],
+                        operation_type=tx.operation.type,
+                        amount=tx.amount,
+                        from_status=OperationStatus.NEW,
+                        to_status=status,
+                    )
+                updated_at = now()
+                finalized_at = updated_at if commit else None
+                self.model._base_manager.db_manager(self.db).filter(
+                    pk__in=[operation.pk for operation in operations]
+                ).update(status=status, updated_at=updated_at, finalized_at=finalized_at)
+                AccountBalance.objects.apply_delta(delta)
+                for operation in operations:
+                    operation.status = status
+                    operation.updated_at = updated_at
+                    operation.finalized_at = finalized_at
+
+        return operations
+
+
+class OperationSummaryManager(models.Manager):
+
+    """Operation summaries manager.
+    """
 
-        if hold:
-            try:
-                operation.hold()
+    def refresh(self, operations: Iterable['Operation']):
+        """Recalculate summaries of provided operations from their transactions.
 
-                return operation
-            finally:
-                if operation.status != OperationStatus.HOLD:
-                    operation.delete()
-        return operation
+        Summaries of operations which transactions are archived are kept as is.
+        """
+        from ..accounts.models import (
+            UserAccount,
+            UserFeeAccount
+        )
+        from .models import Transaction
+        from .partitions import get_archived_operations
+        operation_ids = [operation.pk for operation in operations]
+        summaries = summarize_operations(
+            Transaction.objects.db_manager(self.db).filter(operation__in=operation_ids),
+            UserAccount.objects.db_manager(self.db).all(),
+            UserFeeAccount.objects.db_manager(self.db).all(),
+        )
+        missing = set(operation_ids) - {values['operation_id'] for values in summaries}
+        if missing:
+            archived = get_archived_operations(missing, using=self.db)
+            operation_ids = [pk for pk in operation_ids if pk not in archived]
+        with transaction.atomic(using=self.db):
+            self.filter(operation__in=operation_ids).delete()
+            self.bulk_create([self.model(**values) for values in summaries])
+        invalidate_limits_usage([values['user_id'] for values in summaries], using=self.db)
@@ -2,32 +2,52 @@ from uuid import uuid4
 
 from django.contrib.postgres.fields import JSONField
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import models
+from django.db import (
+    models,
+    transaction
+)
 from django.db.models import Sum
 from django.utils.functional import cached_property
+from django.utils.timezone import now
 
 from django_banking.core.db.fields import DecimalField
 from django_banking.user import User
 
+from ...limitations.cache import invalidate_limits_usage
+from ...limitations.data import LIMITS_USAGE_STATUSES
 from ...settings import (
     CARD_BACKEND_ENABLED,
     CRYPTO_BACKEND_ENABLED,
+    USER_MODEL,
     WIRE_TRANSFER_BACKEND_ENABLED
 )
 from ...storages import operation_upload_storage
 from ..accounts.enum import AccountType
 from ..accounts.models import Account
 from ..assets.models import Asset
+from ..balances.models import (
+    AccountBalance,
+    BalanceCheckpoint
+)
+from ..balances.utils import FINAL_STATUSES
 from .enum import (
     OperationStatus,
     OperationType
 )
 from .exceptions import (
     AccountStrictnessException,
-    OperationBalanceException
+    OperationException
+)
+from .managers import (
+    OperationManager,
+    OperationSummaryManager
 )
-from .managers import OperationManager
 from .queryset import PaymentOperationQuerySet
+from .utils import (
+    get_operation_asset_type,
+    parse_uuid,
+    validate_transactions
+)
 
 
 class Operation(models.Model):
@@ -55,59 +75,144 @@ class Operation(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    #: time operation got its first final status, balance checkpoints are keyed on it
+    finalized_at = models.DateTimeField(null=True, db_index=True)
 
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=OperationStatus.NEW, db_index=True)
     type = models.CharField(max_length=10, choices=TYPE_CHOICES, db_index=True)
 
     description = models.TextField(default='')
-    references = JSONField(default=dict, db_index=True)
+    references = JSONField(default=dict)
+
+    #: typed copies of hot `references` keys for indexed lookups, see `denormalize_references`
+    refunded_deposit = models.ForeignKey(
+        'self', null=True, on_delete=models.PROTECT, related_name='refunds'
+    )
+    user_bank_account_uuid = models.UUIDField(null=True, db_index=True)
+    reference_code = models.CharField(max_length=100, null=True, db_index=True)
 
     metadata = JSONField(default=dict, db_index=True)
 
+    #: type of assets moved by operation, empty if it moves assets of different types
+    asset_type = models.CharField(max_length=10, choices=Asset.TYPE_CHOICES, null=True)
+
     objects = OperationManager()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['type', 'asset_type', '-created_at'], name='operation_type_asset_created',
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        self.denormalize_references()
+        super().save(*args, **kwargs)
+
+    def denormalize_references(self):
+        """Copy hot `references` keys to their columns.
+
+        Malformed ids and ids of missing deposits aren't copied.
+        """
+        references = self.references or {}
+        if 'deposit' in references:
+            deposit_id = parse_uuid(references['deposit'])
+            if deposit_id != self.refunded_deposit_id:
+                exists = deposit_id is not None and Operation.objects.db_manager(
+                    self._state.db
+                ).filter(pk=deposit_id).exists()
+                self.refunded_deposit_id = deposit_id if exists else None
+        if 'user_bank_account_uuid' in references:
+            self.user_bank_account_uuid = parse_uuid(references['user_bank_account_uuid'])
+        if 'reference_code' in references:
+            self.reference_code = references['reference_code']
+
     def is_valid(self, include_new=True):
         """Check if current operation is valid and can be safely held.
 
         Check total transactions balance by each affected asset/currency.
+        Balances of affected accounts are validated with single query after
+        their rows are locked, see `AccountQuerySet.validate_balances`.
         """
-        for asset, balance in self.get_per_asset_balances():
-            if balance != 0:
-                raise OperationBalanceException(self, asset)
-
-        qs = self.transactions.all()
-
-        for tx in qs.select_related('account'):
-            tx.is_valid()
-            tx.account.is_valid(include_new=include_new)
+        with transaction.atomic(using=self._state.db):
+            transactions = list(self.transactions.select_related('account'))
+            validate_transactions(self, transactions)
+            Account.objects.db_manager(self._state.db).filter(
+                pk__in={tx.account_id for tx in transactions},
+            ).validate_balances(include_new=include_new)
 
         return True
 
+    def lock_accounts(self):
+        """Lock rows of affected active and passive accounts.
+        """
+        Account.objects.db_manager(self._state.db).filter(
+            pk__in=Transaction.objects.filter(operation=self).values('account_id'),
+        ).lock_for_validation()
+
     def hold(self):
         """Validate and hold operation if valid.
         """
-        self.is_valid()
-        self.status = OperationStatus.HOLD
-        self.save(update_fields=('status',))
+        with transaction.atomic(using=self._state.db):
+            self.is_valid()
+            self._change_status(OperationStatus.HOLD)
 
     def commit(self):
         """Commit operation and all containing transactions.
         """
         assert self.status == OperationStatus.HOLD
-        self.is_valid(include_new=False)
-        self.status = OperationStatus.COMMITTED
-        self.save(update_fields=('status',))
+        with transaction.atomic(using=self._state.db):
+            self.is_valid(include_new=False)
+            self._change_status(OperationStatus.COMMITTED)
 
     def cancel(self):
         """Cancels operation and all containing transactions.
         """
-        self.status = OperationStatus.CANCELLED
-        self.save(update_fields=('status',))
+        self._change_status(OperationStatus.CANCELLED)
 
     def reject(self, reason):
-        self.status = OperationStatus.DELETED
         self.references['reject_reason'] = reason
-        self.save(update_fields=('status', 'references'))
+        self._change_status(OperationStatus.DELETED, update_fields=('status', 'references'))
+
+    def _change_status(self, status, update_fields=('status',)):
+        """Save new operation status and move its transactions between account balance buckets.
+
+        Previous status is taken from db, so stale instance can't corrupt persisted balances.
+        Finalized operation covered by balance checkpoint can't be changed anymore.
+        Affected accounts are locked before operation row, in the same order as
+        `is_valid` does, so status changes of operations sharing accounts are
+        serialized and can't deadlock.
+        """
+        with transaction.atomic(using=self._state.db):
+            self.lock_accounts()
+            previous_status, finalized_at = Operation.objects.db_manager(self._state.db) \
+                .select_for_update() \
+                .values_list('status', 'finalized_at') \
+                .get(pk=self.pk)
+            if previous_status in FINAL_STATUSES and previous_status != status:
+                cutoff = BalanceCheckpoint.objects.db_manager(self._state.db).latest_cutoff()
+                if cutoff is not None and finalized_at < cutoff:
+                    raise OperationException(self, "Operation is covered by balance checkpoint")
+            if status in FINAL_STATUSES and finalized_at is None:
+                self.finalized_at = now()
+                update_fields = (*update_fields, 'finalized_at')
+            # operations created without `OperationManager.post` get denormalized
+            # data here, transactions aren't changed after operation leaves new status
+            denormalize = previous_status == OperationStatus.NEW
+            if denormalize:
+                self.asset_type = get_operation_asset_type(
+                    self.transactions.values_list('account__asset__type', flat=True)
+                )
+                update_fields = (*update_fields, 'asset_type')
+            self.status = status
+            self.save(update_fields=(*update_fields, 'updated_at'))
+            AccountBalance.objects.apply_transition(self, previous_status, status)
+            if denormalize:
+                OperationSummary.objects.db_manager(self._state.db).refresh([self])
+            elif previous_status in LIMITS_USAGE_STATUSES and status not in LIMITS_USAGE_STATUSES:
+                invalidate_limits_usage(
+                    self.summaries.values_list('user_id', flat=True), using=self._state.db
+                )
 
     @property
     def is_committed(self):
@@ -140,10 +245,9 @@ class Operation(models.Model):
     @cached_property
     def refund(self):
         try:
-            return Operation.objects.get(
+            return self.refunds.get(
                 status__in=[OperationStatus.HOLD, OperationStatus.COMMITTED],
                 type=OperationType.REFUND,
-                references__deposit=str(self.pk)
             )
         except (ObjectDoesNotExist, AttributeError):
             return None
@@ -154,8 +258,7 @@ class Operation(models.Model):
             return None
         from ...contrib.wire_transfer.models import UserBankAccount
         try:
-            user_bank_account_id = self.references.get('user_bank_account_uuid')
-            return UserBankAccount.objects.filter(pk=user_bank_account_id).first()
+            return UserBankAccount.objects.filter(pk=self.user_bank_account_uuid).first()
         except ObjectDoesNotExist:
             return None
 
@@ -212,6 +315,9 @@ class Transaction(models.Model):
     #: can be used to backup references in case they were lost in the main system
     references = JSONField(default=dict, db_index=True)
 
+    #: table is partitioned by month of creation, see `partitions`
+    created_at = models.DateTimeField(auto_now_add=True)
+
     def is_valid(self):
         if self.account.strict:
             if self.account.type == AccountType.TYPE_ACTIVE and self.amount < 0:
@@ -227,6 +333,48 @@ class Transaction(models.Model):
         return True
 
 
+class OperationSummary(models.Model):
+
+    """Operation amounts shown to participating user.
+
+    Calculated from operation transactions when operation is posted or leaves
+    new status, so operations history doesn't aggregate transactions.
+    """
+
+    uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+
+    operation = models.ForeignKey(Operation, on_delete=models.CASCADE, related_name='summaries')
+    user = models.ForeignKey(
+        to=USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name='operation_summaries',
+    )
+
+    debit_amount = DecimalField()
+    debit_asset = models.ForeignKey(Asset, null=True, on_delete=models.PROTECT, related_name='+')
+    credit_amount = DecimalField()
+    credit_asset = models.ForeignKey(Asset, null=True, on_delete=models.PROTECT, related_name='+')
+    fee_amount = DecimalField()
+    fee_asset = models.ForeignKey(Asset, null=True, on_delete=models.PROTECT, related_name='+')
+
+    #: copy of operation creation time, user history is read by index on it
+    created_at = models.DateTimeField()
+
+    objects = OperationSummaryManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['operation', 'user'], name='unique_operation_user_summary',
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-created_at', '-operation'], name='operation_summary_history',
+            )
+        ]
+
+
 class PaymentOperation(Operation):
     objects = PaymentOperationQuerySet.as_manager()
 
@@ -235,6 +383,15 @@ class PaymentOperation(Operation):
 
 
 class OperationConfirmationDocument(models.Model):
+    #: constraints of direct uploads, same as of KYC documents
+    SUPPORTED_MIME_TYPES = (
+        'image/jpeg',
+        'image/pjpeg',
+        'image/png',
+        'application/pdf',
+    )
+    MAX_SIZE = 10 * 1024 * 1024
+
     operation = models.ForeignKey(Operation, on_delete=models.PROTECT)
     file = models.FileField(storage=operation_upload_storage)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,197 @@
+"""Maintenance of monthly partitions of transactions table.
+
+Transactions table is range partitioned by `created_at`, one partition per
+month named `<table>_YYYY_MM`, rows out of created partitions get into the
+default one. Partitions of months covered by balance checkpoint can be
+detached into archive schema, balances never read them after that. Readers
+of operation transactions check `get_archived_operations` for operations
+without transactions.
+"""
+from datetime import (
+    date,
+    datetime,
+    time
+)
+from typing import (
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple
+)
+
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+    transaction
+)
+from django.utils.timezone import (
+    now,
+    utc
+)
+
+from django_banking import logger
+
+from ...settings import (
+    TRANSACTION_ARCHIVE_AFTER_MONTHS,
+    TRANSACTION_ARCHIVE_SCHEMA,
+    TRANSACTION_PARTITIONS_AHEAD
+)
+from ..balances.models import BalanceCheckpoint
+from ..balances.utils import FINAL_STATUSES
+from .models import (
+    Operation,
+    Transaction
+)
+
+
+def month_start(value: date, shift: int = 0) -> date:
+    """Get first day of month, optionally shifted by number of months.
+    """
+    months = value.year * 12 + value.month - 1 + shift
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def month_bound(month: date) -> datetime:
+    return datetime.combine(month, time.min, tzinfo=utc)
+
+
+def partition_name(month: date) -> str:
+    return f'{Transaction._meta.db_table}_{month:%Y_%m}'
+
+
+def get_partitions(using: str = None) -> List[str]:
+    """Get names of monthly partitions attached to transactions table, oldest first.
+    """
+    with connections[using or DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s AND child.relname ~ '_\\d{4}_\\d{2}$'
+            ORDER BY child.relname
+            """,
+            [Transaction._meta.db_table],
+        )
+        return [name for name, in cursor.fetchall()]
+
+
+def get_archive_bound(using: str = None) -> Optional[datetime]:
+    """Get start of the first month which transactions aren't archived, `None` if none are.
+    """
+    with connections[using or DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT max(tablename)
+            FROM pg_tables
+            WHERE schemaname = %s AND tablename ~ ('^' || %s || '_\\d{4}_\\d{2}$')
+            """,
+            [TRANSACTION_ARCHIVE_SCHEMA, Transaction._meta.db_table],
+        )
+        name, = cursor.fetchone()
+    if name is None:
+        return None
+    return month_bound(month_start(datetime.strptime(name[-7:], '%Y_%m').date(), 1))
+
+
+def get_archived_operations(operation_ids: Iterable, using: str = None) -> Set:
+    """Get ids of provided operations which transactions are moved to archive.
+
+    Operation is archived if it's created before archive bound and has no
+    transactions attached to transactions table.
+    """
+    bound = get_archive_bound(using)
+    if bound is None:
+        return set()
+    return set(
+        Operation.objects.db_manager(using).filter(
+            pk__in=operation_ids, created_at__lt=bound,
+        ).exclude(
+            pk__in=Transaction.objects.db_manager(using).filter(
+                operation__in=operation_ids,
+            ).values('operation_id'),
+        ).values_list('pk', flat=True)
+    )
+
+
+def create_partitions(ahead: int, today: date = None, using: str = None) -> List[str]:
+    """Create partitions from current month up to specified number of months ahead.
+
+    :return: names of created partitions
+    """
+    using = using or DEFAULT_DB_ALIAS
+    today = today or now().date()
+    table = Transaction._meta.db_table
+    existing = set(get_partitions(using))
+    created = []
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        for shift in range(ahead + 1):
+            month = month_start(today, shift)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            cursor.execute(
+                f'CREATE TABLE "{name}" PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)',
+                [month_bound(month), month_bound(month_start(month, 1))],
+            )
+            created.append(name)
+    return created
+
+
+def is_archivable(month: date, cutoff: Optional[datetime], using: str = None) -> bool:
+    """Check if transactions of month are finalized and covered by balance checkpoint.
+    """
+    if cutoff is None or month_bound(month_start(month, 1)) > cutoff:
+        return False
+    return not Transaction.objects.db_manager(using).filter(
+        created_at__gte=month_bound(month),
+        created_at__lt=month_bound(month_start(month, 1)),
+    ).exclude(
+        operation__status__in=FINAL_STATUSES,
+        operation__finalized_at__lt=cutoff,
+    ).exists()
+
+
+def archive_partitions(before: date, using: str = None) -> List[str]:
+    """Detach partitions of months before specified date into archive schema.
+
+    Partitions with transactions not covered by the latest balance
+    checkpoint are kept.
+
+    :return: names of archived partitions
+    """
+    using = using or DEFAULT_DB_ALIAS
+    table = Transaction._meta.db_table
+    cutoff = BalanceCheckpoint.objects.db_manager(using).latest_cutoff()
+    archived = []
+    for name in get_partitions(using):
+        month = datetime.strptime(name[-7:], '%Y_%m').date()
+        if month_start(month, 1) > before:
+            break
+        if not is_archivable(month, cutoff, using):
+            logger.warning("Transaction partition %s isn't covered by balance checkpoint", name)
+            break
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{TRANSACTION_ARCHIVE_SCHEMA}"')
+            cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+            cursor.execute(f'ALTER TABLE "{name}" SET SCHEMA "{TRANSACTION_ARCHIVE_SCHEMA}"')
+        archived.append(name)
+    return archived
+
+
+def maintain_partitions(
+    ahead: int = TRANSACTION_PARTITIONS_AHEAD,
+    archive_after: Optional[int] = TRANSACTION_ARCHIVE_AFTER_MONTHS,
+    using: str = None,
+) -> Tuple[List[str], List[str]]:
+    """Create partitions in advance and archive ones older than specified number of months.
+
+    :return: names of created and archived partitions
+    """
+    created = create_partitions(ahead, using=using)
+    archived: List[str] = []
+    if archive_after is not None:
+        archived = archive_partitions(month_start(now().date(), -archive_after), using=using)
+    return created, archived
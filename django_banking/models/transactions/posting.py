@@ -0,0 +1,49 @@
+from decimal import Decimal
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List
+)
+
+from .utils import validate_transactions
+
+if TYPE_CHECKING:
+    from ..accounts.models import Account  # NOQA
+    from .models import (  # NOQA
+        Operation,
+        Transaction
+    )
+
+
+class Posting:
+
+    """Operation draft with its double-entry transactions.
+
+    Collects legs in memory, so operation could be validated before anything
+    is written. Use `OperationManager.post` to write postings.
+    """
+
+    def __init__(self, type: str, references: Dict = None, metadata: Dict = None, model=None):
+        from .models import Operation  # NOQA
+        model = model or Operation
+        self.operation: 'Operation' = model(
+            type=type,
+            references=references or {},
+            metadata=metadata or {},
+        )
+        self.operation.denormalize_references()
+        self.transactions: List['Transaction'] = []
+
+    def add(self, account: 'Account', amount: Decimal) -> 'Posting':
+        """Add transaction leg.
+        """
+        from .models import Transaction  # NOQA
+        self.transactions.append(
+            Transaction(operation=self.operation, account=account, amount=amount)
+        )
+        return self
+
+    def validate(self):
+        """Check total transactions balance by each affected asset and accounts strictness.
+        """
+        validate_transactions(self.operation, self.transactions)
@@ -1,6 +1,3 @@
-from decimal import Decimal
-
-from django.conf import settings
 from django.db import models
 from django.db.models import (
     Case,
@@ -17,33 +14,33 @@ from django.db.models.functions import (
     Coalesce
 )
 
-from django_banking.models.accounts.models import (
-    UserAccount,
-    UserFeeAccount
-)
+from django_banking.models.accounts.models import UserFeeAccount
 from django_banking.models.assets.enum import AssetType
 from django_banking.models.transactions.enum import OperationType
-from django_banking.user import User
+from django_banking.user import (
+    User,
+    get_financial_context
+)
 
 
 class OperationQuerySet(models.QuerySet):
     def deposit_wire_transfer(self):
         return self.filter(
-            transactions__account__asset__type=AssetType.FIAT,
-            type=OperationType.DEPOSIT
-        ).distinct()
+            type=OperationType.DEPOSIT,
+            asset_type=AssetType.FIAT,
+        )
 
     def withdrawal_wire_transfer(self):
         return self.filter(
-            transactions__account__asset__type=AssetType.FIAT,
             type=OperationType.WITHDRAWAL,
-        ).distinct()
+            asset_type=AssetType.FIAT,
+        )
 
     def refund_wire_transfer(self):
         return self.filter(
-            transactions__account__asset__type=AssetType.FIAT,
             type=OperationType.REFUND,
-        ).distinct()
+            asset_type=AssetType.FIAT,
+        )
 
     def deposit_card(self):
         raise NotImplementedError()
@@ -53,15 +50,15 @@ class OperationQuerySet(models.QuerySet):
 
     def deposit_crypto(self):
         return self.filter(
-            transactions__account__asset__type=AssetType.CRYPTO,
-            type=OperationType.DEPOSIT
-        ).distinct()
+            type=OperationType.DEPOSIT,
+            asset_type=AssetType.CRYPTO,
+        )
 
     def withdrawal_crypto(self):
         return self.filter(
-            transactions__account__asset__type=AssetType.CRYPTO,
             type=OperationType.WITHDRAWAL,
-        ).distinct()
+            asset_type=AssetType.CRYPTO,
+        )
 
     def with_asset(self):
         """Annotates asset symbol and asset id for Deposit/Withdrawal operations"""
@@ -148,104 +145,51 @@ class OperationQuerySet(models.QuerySet):
 
 class PaymentOperationQuerySet(models.QuerySet):
     def with_amounts(self, user: User):  # type: ignore
-        from .models import Transaction
-        user_accounts = UserAccount.objects.get_user_accounts(user)
-        fee_accounts = UserFeeAccount.objects.get_user_accounts(user)
-
-        user_transactions = Transaction.objects.filter(
-            operation=OuterRef('pk'),
-            account__in=user_accounts,
-        ).order_by().values('operation')
-        fee_transactions = Transaction.objects.filter(
-            operation=OuterRef('pk'),
-            account__in=fee_accounts,
-        ).order_by().values('operation')
-
-        default_user_amount = user_transactions.annotate(total=Sum('amount')).values('total')[:1]
-        default_user_asset_symbol = user_transactions.values('account__asset__symbol')[:1]
-        default_user_asset_id = user_transactions.values('account__asset_id')[:1]
-        default_fee_amount = fee_transactions.annotate(total=Sum('amount')).values('total')[:1]
-        default_fee_asset_symbol = fee_transactions.values('account__asset__symbol')[:1]
-        default_fee_asset_id = fee_transactions.values('account__asset_id')[:1]
-        default_if_none = Decimal(0).quantize(Decimal(10) ** -settings.ACCOUNTING_DECIMAL_PLACES)
-
-        debit_buy_amount = user_transactions.annotate(
-            total=Sum(
-                'amount',
-                filter=Q(amount__gt=0)  # we should query like for sell but
-                # filter by amount fits onto business logic and produces less JOINs
-            )
-        ).values('total')[:1]
-        debit_sell_amount = user_transactions.annotate(
-            total=Sum(
-                'amount',
-                filter=Q(account__asset__type=AssetType.FIAT)
-            )
-        ).values('total')[:1]
-
-        debit_buy_asset = user_transactions.filter(account__asset__type=AssetType.CRYPTO)
-        debit_sell_asset = user_transactions.filter(account__asset__type=AssetType.FIAT)
+        """Annotate debit/credit/fee amounts and assets shown to user.
+
+        Amounts are read from precomputed `OperationSummary`, so only operations
+        summarized for user are returned.
+        """
+        return self.filter(summaries__user=user).annotate(
+            debit_amount=F('summaries__debit_amount'),
+            debit_asset=F('summaries__debit_asset__symbol'),
+            debit_asset_id=F('summaries__debit_asset_id'),
+            credit_amount=F('summaries__credit_amount'),
+            credit_asset=F('summaries__credit_asset__symbol'),
+            credit_asset_id=F('summaries__credit_asset_id'),
+            fee_amount=F('summaries__fee_amount'),
+            fee_asset=F('summaries__fee_asset__symbol'),
+            fee_asset_id=F('summaries__fee_asset_id'),
+        )
 
-        credit_buy_amount = user_transactions.annotate(
-            total=Sum(
-                'amount',
-                filter=Q(amount__lt=0)  # we should query like for sell but
-                # filter by amount fits onto business logic and produces less JOINs
-            )
-        ).values('total')[:1]
-        credit_sell_amount = user_transactions.annotate(
-            total=Sum(
-                'amount',
-                filter=Q(account__asset__type=AssetType.CRYPTO)
-            )
-        ).values('total')[:1]
-        credit_buy_asset = user_transactions.filter(account__asset__type=AssetType.FIAT)
-        credit_sell_asset = user_transactions.filter(account__asset__type=AssetType.CRYPTO)
+    def history(self, user: User):  # type: ignore
+        """Operations history of user with amounts.
 
-        return self.annotate(
-            debit_amount=Coalesce(
-                Case(
-                    When(type=OperationType.BUY, then=Subquery(debit_buy_amount)),
-                    When(type=OperationType.SELL, then=Subquery(debit_sell_amount)),
-                    default=Subquery(default_user_amount),
-                    output_field=models.DecimalField()
-                ),
-                default_if_none
-            ),
-            debit_asset=Case(
-                When(type=OperationType.BUY, then=Subquery(debit_buy_asset.values('account__asset__symbol')[:1])),
-                When(type=OperationType.SELL, then=Subquery(debit_sell_asset.values('account__asset__symbol')[:1])),
-                default=Subquery(default_user_asset_symbol),
-            ),
-            debit_asset_id=Case(
-                When(type=OperationType.BUY, then=Subquery(debit_buy_asset.values('account__asset_id')[:1])),
-                When(type=OperationType.SELL, then=Subquery(debit_sell_asset.values('account__asset_id')[:1])),
-                default=Subquery(default_user_asset_id),
-            ),
-            credit_amount=Abs(Coalesce(
-                Case(
-                    When(type=OperationType.BUY, then=Subquery(credit_buy_amount)),
-                    When(type=OperationType.SELL, then=Subquery(credit_sell_amount)),
-                    default=Subquery(default_user_amount),
-                    output_field=models.DecimalField()
-                ),
-                default_if_none
-            )),
-            credit_asset=Case(
-                When(type=OperationType.BUY, then=Subquery(credit_buy_asset.values('account__asset__symbol')[:1])),
-                When(type=OperationType.SELL, then=Subquery(credit_sell_asset.values('account__asset__symbol')[:1])),
-                default=Subquery(default_user_asset_symbol),
-            ),
-            credit_asset_id=Case(
-                When(type=OperationType.BUY, then=Subquery(credit_buy_asset.values('account__asset_id')[:1])),
-                When(type=OperationType.SELL, then=Subquery(credit_sell_asset.values('account__asset_id')[:1])),
-                default=Subquery(default_user_asset_id),
-            ),
-            fee_amount=Coalesce(Subquery(default_fee_amount), default_if_none, output_field=models.DecimalField()),
-            fee_asset=Subquery(default_fee_asset_symbol),
-            fee_asset_id=Subquery(default_fee_asset_id),
+        Annotated keyset fields are `OperationSummary` columns covered by its
+        history index, so page is read without scanning the whole history.
+        """
+        return self.with_amounts(user).annotate(
+            history_created_at=F('summaries__created_at'),
+            history_operation_id=F('summaries__operation_id'),
         )
 
     def for_user(self, user: User, only_allowed_assets=True):  # type: ignore
-        user_accounts = UserAccount.objects.get_user_accounts(user, only_allowed_assets)
-        return self.filter(transactions__account__in=user_accounts).distinct()
+        """Filter operations affecting user accounts.
+
+        EXISTS is used instead of joins, so no DISTINCT is required and
+        ordering by operation index is kept.
+        """
+        from .models import (
+            OperationSummary,
+            Transaction
+        )
+        if only_allowed_assets:
+            return self.filter(Exists(
+                Transaction.objects.filter(
+                    operation=OuterRef('pk'),
+                    account__in=get_financial_context(user).allowed_account_ids,
+                )
+            ))
+        return self.filter(Exists(
+            OperationSummary.objects.filter(operation=OuterRef('pk'), user=user)
+        ))
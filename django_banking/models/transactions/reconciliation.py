@@ -0,0 +1,122 @@
+"""Full ledger reconciliation.
+
+Checks are grouped reductions run by db, only violating rows are streamed
+back with server-side cursor, so ledger of any size is checked in bounded
+memory. Partitions moved to archive aren't read.
+"""
+from decimal import Decimal
+from itertools import islice
+from typing import (
+    Iterator,
+    NamedTuple,
+    Optional
+)
+from uuid import UUID
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import (
+    Q,
+    Sum
+)
+
+from ...settings import LEDGER_RECONCILIATION_CHUNK_SIZE
+from ..accounts.enum import AccountType
+from ..accounts.models import Account
+from ..balances.models import BalanceCheckpoint
+from .enum import OperationStatus
+from .models import Transaction
+
+
+class LedgerViolationType:
+    UNBALANCED_OPERATION = 'unbalanced_operation'
+    STRICTNESS = 'strictness'
+    NEGATIVE_ACTIVE_BALANCE = 'negative_active_balance'
+    POSITIVE_PASSIVE_BALANCE = 'positive_passive_balance'
+
+
+class LedgerViolation(NamedTuple):
+    type: str
+    amount: Decimal
+    asset_id: UUID
+    operation_id: Optional[UUID] = None
+    account_id: Optional[UUID] = None
+
+
+def find_unbalanced_operations(using: str, chunk_size: int) -> Iterator[LedgerViolation]:
+    """Find committed operations which don't zero-sum per asset.
+    """
+    rows = Transaction.objects.db_manager(using).filter(
+        operation__status=OperationStatus.COMMITTED,
+    ).order_by().values('operation_id', 'account__asset_id').annotate(
+        total=Sum('amount'),
+    ).exclude(total=0).values_list('operation_id', 'account__asset_id', 'total')
+    for operation_id, asset_id, total in rows.iterator(chunk_size):
+        yield LedgerViolation(
+            type=LedgerViolationType.UNBALANCED_OPERATION,
+            amount=total,
+            asset_id=asset_id,
+            operation_id=operation_id,
+        )
+
+
+def find_strictness_violations(using: str, chunk_size: int) -> Iterator[LedgerViolation]:
+    """Find transactions of committed operations moving strict accounts in wrong direction.
+    """
+    rows = Transaction.objects.db_manager(using).filter(
+        Q(account__type=AccountType.TYPE_ACTIVE, amount__lt=0) |
+        Q(account__type=AccountType.TYPE_PASSIVE, amount__gt=0),
+        operation__status=OperationStatus.COMMITTED,
+        account__strict=True,
+    ).order_by().values_list('operation_id', 'account_id', 'account__asset_id', 'amount')
+    for operation_id, account_id, asset_id, amount in rows.iterator(chunk_size):
+        yield LedgerViolation(
+            type=LedgerViolationType.STRICTNESS,
+            amount=amount,
+            asset_id=asset_id,
+            operation_id=operation_id,
+            account_id=account_id,
+        )
+
+
+def find_balance_violations(using: str, chunk_size: int) -> Iterator[LedgerViolation]:
+    """Find active accounts with negative and passive ones with positive ledger balance.
+
+    Balance of held and committed operations is calculated from the latest
+    checkpoints and transactions after them, for chunk of accounts at once.
+    """
+    accounts = Account.objects.db_manager(using).exclude(
+        type=AccountType.TYPE_NORMAL,
+    ).order_by().values_list('pk', 'type', 'asset_id').iterator(chunk_size)
+    checkpoints = BalanceCheckpoint.objects.db_manager(using)
+    while True:
+        chunk = {pk: (type_, asset_id) for pk, type_, asset_id in islice(accounts, chunk_size)}
+        if not chunk:
+            break
+        for account_id, values in checkpoints.calculate_balances(list(chunk)).items():
+            type_, asset_id = chunk[account_id]
+            balance = values['hold'] + values['committed']
+            if type_ == AccountType.TYPE_ACTIVE and balance < 0:
+                violation_type = LedgerViolationType.NEGATIVE_ACTIVE_BALANCE
+            elif type_ == AccountType.TYPE_PASSIVE and balance > 0:
+                violation_type = LedgerViolationType.POSITIVE_PASSIVE_BALANCE
+            else:
+                continue
+            yield LedgerViolation(
+                type=violation_type,
+                amount=balance,
+                asset_id=asset_id,
+                account_id=account_id,
+            )
+
+
+def reconcile_ledger(using: str = None, chunk_size: int = None) -> Iterator[LedgerViolation]:
+    """Check that committed operations balance and account balances follow account type rules.
+
+    :param using: db alias, replica can be used
+    :param chunk_size: rows fetched from db at once
+    """
+    using = using or DEFAULT_DB_ALIAS
+    chunk_size = chunk_size or LEDGER_RECONCILIATION_CHUNK_SIZE
+    yield from find_unbalanced_operations(using, chunk_size)
+    yield from find_strictness_violations(using, chunk_size)
+    yield from find_balance_violations(using, chunk_size)
@@ -0,0 +1,161 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional
+)
+from uuid import UUID
+
+from django.db.models import QuerySet
+
+from ..assets.enum import AssetType
+from ..assets.registry import asset_registry
+from .enum import OperationType
+from .exceptions import OperationBalanceException
+
+if TYPE_CHECKING:
+    from .models import (  # NOQA
+        Operation,
+        Transaction
+    )
+
+
+def parse_uuid(value) -> Optional[UUID]:
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def validate_transactions(operation: 'Operation', transactions: Iterable['Transaction']) -> bool:
+    """Check total transactions balance by each affected asset and accounts strictness.
+
+    Transactions must have accounts loaded, db isn't queried.
+    """
+    transactions = list(transactions)
+    balances: Dict = defaultdict(Decimal)
+    for tx in transactions:
+        balances[tx.account.asset_id] += tx.amount
+
+    for asset_id, balance in balances.items():
+        if balance != 0:
+            raise OperationBalanceException(operation, asset_registry.get(asset_id))
+
+    for tx in transactions:
+        tx.is_valid()
+    return True
+
+
+def get_operation_asset_type(asset_types: Iterable[str]) -> Optional[str]:
+    """Get type of assets moved by operation, `None` if it moves assets of different types.
+    """
+    types = set(asset_types)
+    return types.pop() if len(types) == 1 else None
+
+
+def _first_asset(transactions, asset_type=None):
+    for asset_id, type_, _ in transactions:
+        if asset_type is None or type_ == asset_type:
+            return asset_id
+    return None
+
+
+def _sum_amounts(transactions, condition=lambda asset_type, amount: True):
+    return sum(
+        (amount for _, asset_type, amount in transactions if condition(asset_type, amount)),
+        Decimal(0)
+    )
+
+
+def summarize_user_transactions(operation_type: str,
+                                user_transactions: List,
+                                fee_transactions: List) -> Dict:
+    """Calculate debit/credit/fee amounts and assets of operation shown to user.
+
+    :param operation_type: operation type
+    :param user_transactions: (asset id, asset type, amount) of user accounts transactions
+    :param fee_transactions: (asset id, asset type, amount) of user fee accounts transactions
+    """
+    total = _sum_amounts(user_transactions)
+    if operation_type == OperationType.BUY:
+        debit_amount = _sum_amounts(user_transactions, lambda _, amount: amount > 0)
+        debit_asset_id = _first_asset(user_transactions, AssetType.CRYPTO)
+        credit_amount = _sum_amounts(user_transactions, lambda _, amount: amount < 0)
+        credit_asset_id = _first_asset(user_transactions, AssetType.FIAT)
+    elif operation_type == OperationType.SELL:
+        debit_amount = _sum_amounts(user_transactions, lambda type_, _: type_ == AssetType.FIAT)
+        debit_asset_id = _first_asset(user_transactions, AssetType.FIAT)
+        credit_amount = _sum_amounts(
+            user_transactions, lambda type_, _: type_ == AssetType.CRYPTO
+        )
+        credit_asset_id = _first_asset(user_transactions, AssetType.CRYPTO)
+    else:
+        debit_amount = credit_amount = total
+        debit_asset_id = credit_asset_id = _first_asset(user_transactions)
+
+    return {
+        'debit_amount': debit_amount,
+        'debit_asset_id': debit_asset_id,
+        'credit_amount': abs(credit_amount),
+        'credit_asset_id': credit_asset_id,
+        'fee_amount': _sum_amounts(fee_transactions),
+        'fee_asset_id': _first_asset(fee_transactions),
+    }
+
+
+def summarize_operations(transactions: QuerySet,
+                         user_accounts: QuerySet,
+                         fee_accounts: QuerySet) -> List[Dict]:
+    """Calculate summaries for every user having account in operations transactions.
+
+    Works with historical models as well, so it can be used in migrations.
+
+    :param transactions: transactions of summarized operations
+    :param user_accounts: `UserAccount` queryset
+    :param fee_accounts: `UserFeeAccount` queryset
+    :return: list of `OperationSummary` fields values
+    """
+    rows = list(transactions.values_list(
+        'operation_id',
+        'operation__type',
+        'operation__created_at',
+        'account_id',
+        'account__asset_id',
+        'account__asset__type',
+        'amount',
+    ))
+    account_ids = {row[3] for row in rows}
+    owners = dict(
+        user_accounts.filter(account__in=account_ids).values_list('account_id', 'user_id')
+    )
+    fee_owners = dict(
+        fee_accounts.filter(account__in=account_ids).values_list('account_id', 'user_id')
+    )
+
+    operations = {}
+    user_transactions: Dict = defaultdict(list)
+    fee_transactions: Dict = defaultdict(list)
+    for operation_id, operation_type, created_at, account_id, asset_id, asset_type, amount in rows:
+        operations[operation_id] = operation_type, created_at
+        leg = (asset_id, asset_type, amount)
+        if account_id in owners:
+            user_transactions[operation_id, owners[account_id]].append(leg)
+        if account_id in fee_owners:
+            fee_transactions[operation_id, fee_owners[account_id]].append(leg)
+
+    return [
+        dict(
+            operation_id=operation_id,
+            user_id=user_id,
+            created_at=operations[operation_id][1],
+            **summarize_user_transactions(
+                operations[operation_id][0],
+                user_transactions[operation_id, user_id],
+                fee_transactions.get((operation_id, user_id), []),
+            )
+        )
+        for operation_id, user_id in list(user_transactions)
+    ]
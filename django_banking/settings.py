@@ -1,3 +1,4 @@
+from datetime import timedelta
 from decimal import Decimal
 
 from django.conf import settings
@@ -24,7 +25,12 @@ AWS_STORAGE_BUCKET_NAME = getattr(settings, f'{module_name}_AWS_STORAGE_BUCKET_N
 AWS_S3_REGION_NAME = getattr(settings, f'{module_name}_AWS_S3_REGION_NAME', settings.AWS_S3_REGION_NAME)
 AWS_QUERYSTRING_EXPIRE = getattr(settings, f'{module_name}_AWS_QUERYSTRING_EXPIRE', settings.AWS_QUERYSTRING_EXPIRE)
 
+#: operations finalized later than this before now aren't covered by balance checkpoints
+BALANCE_CHECKPOINT_LAG = getattr(settings, f'{module_name}_BALANCE_CHECKPOINT_LAG', timedelta(hours=1))
+
 OPERATION_UPLOAD_LOCATION = getattr(settings, f'{module_name}_OPERATION_UPLOAD_LOCATION', 'operations')
+#: seconds presigned direct upload form is valid, upload should be finalized within twice of it
+DIRECT_UPLOAD_LIFETIME = getattr(settings, f'{module_name}_DIRECT_UPLOAD_LIFETIME', AWS_QUERYSTRING_EXPIRE)
 
 LIMITS = limit_parser(getattr(settings, f'{module_name}_LIMITS', {
     None: [
@@ -43,6 +49,44 @@ LIMITS_MINIMAL_OPERATION = limit_parser(getattr(settings, f'{module_name}_LIMITS
         'interval': 'OPERATION'
     }
 ]))
+#: seconds to keep user limits usage cached, it is dropped on user operations changes too
+LIMITS_USAGE_CACHE_TIMEOUT = getattr(settings, f'{module_name}_LIMITS_USAGE_CACHE_TIMEOUT', 3600)
 CARD_BACKEND_ENABLED = f'{module_name.lower()}.contrib.card' in settings.INSTALLED_APPS
 CRYPTO_BACKEND_ENABLED = f'{module_name.lower()}.contrib.crypto' in settings.INSTALLED_APPS
 WIRE_TRANSFER_BACKEND_ENABLED = f'{module_name.lower()}.contrib.wire_transfer' in settings.INSTALLED_APPS
+
+#: class matching imported bank statement lines to pending payments
+WIRE_TRANSFER_STATEMENT_MATCHER = getattr(
+    settings, f'{module_name}_WIRE_TRANSFER_STATEMENT_MATCHER',
+    'django_banking.contrib.wire_transfer.matching.StatementMatcher',
+)
+#: matched payments settled in single db transaction
+STATEMENT_IMPORT_BATCH_SIZE = getattr(settings, f'{module_name}_STATEMENT_IMPORT_BATCH_SIZE', 500)
+
+#: refill of crypto deposit addresses pool is scheduled when less free addresses left
+CRYPTO_ADDRESS_POOL_LOW_WATER_MARK = getattr(settings, f'{module_name}_CRYPTO_ADDRESS_POOL_LOW_WATER_MARK', 100)
+#: number of free addresses per asset pool is refilled up to
+CRYPTO_ADDRESS_POOL_SIZE = getattr(settings, f'{module_name}_CRYPTO_ADDRESS_POOL_SIZE', 1000)
+#: dotted path to callable taking asset and count and returning pre-generated addresses
+CRYPTO_ADDRESS_GENERATOR = getattr(settings, f'{module_name}_CRYPTO_ADDRESS_GENERATOR', None)
+#: chain deposits with fewer confirmations are ignored until they are reported again
+CRYPTO_DEPOSIT_CONFIRMATIONS = getattr(settings, f'{module_name}_CRYPTO_DEPOSIT_CONFIRMATIONS', 6)
+#: chain deposit events posted in single db transaction
+CRYPTO_DEPOSIT_BATCH_SIZE = getattr(settings, f'{module_name}_CRYPTO_DEPOSIT_BATCH_SIZE', 500)
+
+#: dotted path to price source class, instantiated with `PRICE_SOURCE_OPTIONS`
+PRICE_SOURCE = getattr(settings, f'{module_name}_PRICE_SOURCE', 'django_banking.core.prices.FilePriceSource')
+PRICE_SOURCE_OPTIONS = getattr(settings, f'{module_name}_PRICE_SOURCE_OPTIONS', {})
+#: seconds refreshed prices are used, prices are unavailable if they aren't refreshed again in time
+PRICE_SNAPSHOT_TIMEOUT = getattr(settings, f'{module_name}_PRICE_SNAPSHOT_TIMEOUT', 300)
+#: seconds price offered to user is kept
+PRICE_OFFER_LIFETIME = getattr(settings, f'{module_name}_PRICE_OFFER_LIFETIME', 60)
+
+#: monthly transaction partitions created in advance
+TRANSACTION_PARTITIONS_AHEAD = getattr(settings, f'{module_name}_TRANSACTION_PARTITIONS_AHEAD', 3)
+#: transaction partitions older than this number of months are moved to archive, never if `None`
+TRANSACTION_ARCHIVE_AFTER_MONTHS = getattr(settings, f'{module_name}_TRANSACTION_ARCHIVE_AFTER_MONTHS', None)
+#: db schema detached transaction partitions are moved to
+TRANSACTION_ARCHIVE_SCHEMA = getattr(settings, f'{module_name}_TRANSACTION_ARCHIVE_SCHEMA', 'django_banking_archive')
+#: rows fetched from server-side cursor at once by ledger reconciliation
+LEDGER_RECONCILIATION_CHUNK_SIZE = getattr(settings, f'{module_name}_LEDGER_RECONCILIATION_CHUNK_SIZE', 10000)
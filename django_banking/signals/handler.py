@@ -0,0 +1,24 @@
+from django.db.models.signals import (
+    post_delete,
+    post_save
+)
+from django.dispatch import receiver
+
+from django_banking.models import (
+    Asset,
+    Fee
+)
+from django_banking.models.assets.registry import asset_registry
+from django_banking.models.fee.schedule import fee_schedule
+
+
+@receiver(post_save, sender=Asset)
+@receiver(post_delete, sender=Asset)
+def invalidate_asset_registry(sender, using, **kwargs):
+    asset_registry.invalidate(using=using)
+
+
+@receiver(post_save, sender=Fee)
+@receiver(post_delete, sender=Fee)
+def invalidate_fee_schedule(sender, using, **kwargs):
+    fee_schedule.invalidate(using=using)
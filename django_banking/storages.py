@@ -1,3 +1,12 @@
+from typing import (
+    Dict,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+
+from botocore.exceptions import ClientError
+from django.core.files import File
 from storages.backends.s3boto3 import S3Boto3Storage
 
 from django_banking.settings import (
@@ -10,6 +19,12 @@ from django_banking.settings import (
 )
 
 
+class ObjectInfo(NamedTuple):
+    size: int
+    #: hex MD5 digest of content for objects uploaded in single part without SSE-KMS
+    etag: str
+
+
 class AmazonS3Storage(S3Boto3Storage):
     access_key = AWS_ACCESS_KEY_ID
     secret_key = AWS_SECRET_ACCESS_KEY
@@ -18,5 +33,63 @@ class AmazonS3Storage(S3Boto3Storage):
     querystring_expire = AWS_QUERYSTRING_EXPIRE
     file_overwrite = False
 
+    def presigned_post(
+        self, name: str, content_type: str, min_size: int, max_size: int, expire: int = None
+    ) -> Tuple[str, Dict[str, str]]:
+        """Sign form uploading file with specified name directly to bucket.
+
+        Content type and size range are part of signed policy, so bucket rejects
+        any other file.
+
+        :return: form action url and fields to be sent along with file
+        """
+        params = self.bucket.meta.client.generate_presigned_post(
+            Bucket=self.bucket_name,
+            Key=self._normalize_name(self._clean_name(name)),
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', min_size, max_size],
+            ],
+            ExpiresIn=expire or self.querystring_expire,
+        )
+        return params['url'], params['fields']
+
+    def open_stream(self, name: str) -> File:
+        """Open file for sequential reading straight from bucket response body.
+
+        Unlike `open` content isn't copied to local buffer, so file can be read
+        once only and isn't seekable.
+        """
+        response = self.bucket.Object(self._normalize_name(self._clean_name(name))).get()
+        file = File(response['Body'], name=name)
+        file.size = response['ContentLength']
+        return file
+
+    def get_object_info(self, name: str) -> Optional[ObjectInfo]:
+        """Get size and ETag of object with single HEAD request, `None` if it doesn't exist.
+        """
+        try:
+            response = self.bucket.meta.client.head_object(
+                Bucket=self.bucket_name, Key=self._normalize_name(self._clean_name(name))
+            )
+        except ClientError as exc:
+            if exc.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                return None
+            raise
+        return ObjectInfo(size=response['ContentLength'], etag=response['ETag'].strip('"'))
+
+    def read_head(self, name: str, size: int) -> bytes:
+        """Read first `size` bytes of object with ranged GET.
+        """
+        response = self.bucket.Object(self._normalize_name(self._clean_name(name))).get(
+            Range=f'bytes=0-{size - 1}'
+        )
+        body = response['Body']
+        try:
+            return body.read()
+        finally:
+            body.close()
+
 
-operation_upload_storage = AmazonS3Storage(location=OPERATION_UPLOAD_LOCATION)
+operation_upload_storage = AmazonS3Storage(location=OPERATION_UPLOAD_LOCATION)
\ No newline at end of file
@@ -1,9 +1,23 @@
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    Optional
+)
+from uuid import UUID
+
 from django.apps import apps as django_apps
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import cached_property
 
+from .models.assets.enum import AssetType
+from .models.assets.registry import asset_registry
 from .settings import USER_MODEL
 
+if TYPE_CHECKING:
+    from .models import Asset  # NOQA
+
 try:
     User = django_apps.get_model(USER_MODEL, require_ready=False)
 except ValueError:
@@ -15,3 +29,58 @@ except LookupError:
 
 if not callable(getattr(User, 'get_residency_country_code', None)):
     raise ImproperlyConfigured('User must provide get_residency_country_code method')
+
+
+class UserFinancialContext:
+
+    """User financial data memoized for the request.
+
+    Context is attached to user instance, which is loaded by authentication
+    for every request, so it doesn't outlive the request.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def residency_country(self) -> str:
+        return self.user.get_residency_country_code()
+
+    @cached_property
+    def allowed_assets(self) -> List['Asset']:
+        return asset_registry.filter(AssetType.CRYPTO) + \
+            asset_registry.filter(AssetType.FIAT, [self.residency_country, None])
+
+    @cached_property
+    def main_fiat_asset(self) -> Optional['Asset']:
+        # global asset takes precedence over national one
+        assets = asset_registry.filter(AssetType.FIAT, [None, self.residency_country])
+        return assets[0] if assets else None
+
+    @cached_property
+    def account_ids(self) -> Dict[UUID, UUID]:
+        """User bookkeeping account ids by asset id.
+        """
+        from .models import UserAccount
+        return dict(
+            UserAccount.objects.filter(user=self.user).values_list('asset_id', 'account_id')
+        )
+
+    @property
+    def allowed_account_ids(self) -> List[UUID]:
+        return [
+            self.account_ids[asset.pk]
+            for asset in self.allowed_assets
+            if asset.pk in self.account_ids
+        ]
+
+    def reset_accounts(self):
+        self.__dict__.pop('account_ids', None)
+
+
+def get_financial_context(user) -> UserFinancialContext:
+    context = getattr(user, '_financial_context', None)
+    if context is None:
+        context = UserFinancialContext(user)
+        setattr(user, '_financial_context', context)
+    return context
@@ -30,6 +30,17 @@ SHARED_ROUTER_CONFIG = {
         'queue': 'default'
     },
 
+    # accounting
+    'jibrel.payments.tasks.roll_balance_checkpoints_task': {
+        'queue': 'default'
+    },
+    'jibrel.payments.tasks.maintain_transaction_partitions_task': {
+        'queue': 'default'
+    },
+    'jibrel.payments.tasks.refresh_prices_task': {
+        'queue': 'default'
+    },
+
     # DocuSign
     'jibrel.investment.tasks.docu_sign_start_task': {
         'queue': 'default'
@@ -77,6 +88,10 @@ SHARED_ROUTER_CONFIG = {
         'queue': 'onfido'
     },
 
+    'jibrel.kyc.tasks.onfido_collect_check_results_task': {
+        'queue': 'default'
+    },
+
     # Tap-related tasks
     'jibrel.payments.tasks.process_charge': {
         'queue': 'tap_payments'
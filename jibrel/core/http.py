@@ -0,0 +1,137 @@
+"""Shared outbound HTTP layer.
+
+Each integration gets its own connection pool per process, so TCP and TLS
+connections are kept alive between calls instead of being opened for every
+request. Pools are created lazily and keyed by process id, forked workers
+never share connections of parent process.
+
+Connection errors are retried with backoff for any method, 5xx responses and
+read errors only for idempotent ones. Requests are counted and timed per
+integration.
+"""
+import os
+import time
+from typing import (
+    Any,
+    Dict,
+    Tuple
+)
+
+import certifi
+import requests
+import urllib3
+from django.conf import settings
+from prometheus_client import (
+    Counter,
+    Histogram
+)
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+REQUESTS = Counter(
+    'outbound_http_requests_total',
+    'Outbound HTTP requests by integration, method and response status',
+    ['integration', 'method', 'status'],
+)
+DURATION = Histogram(
+    'outbound_http_request_duration_seconds',
+    'Outbound HTTP request duration by integration',
+    ['integration'],
+)
+
+RETRY_STATUSES = (502, 503, 504)
+
+
+def get_config(integration: str) -> Dict[str, Any]:
+    return {
+        'timeout': settings.OUTBOUND_HTTP_TIMEOUT,
+        'pool_size': settings.OUTBOUND_HTTP_POOL_SIZE,
+        'retries': settings.OUTBOUND_HTTP_RETRIES,
+        'backoff_factor': settings.OUTBOUND_HTTP_BACKOFF_FACTOR,
+        **settings.OUTBOUND_HTTP_INTEGRATIONS.get(integration, {}),
+    }
+
+
+def _get_retry(config: Dict[str, Any]) -> Retry:
+    return Retry(
+        total=config['retries'],
+        backoff_factor=config['backoff_factor'],
+        status_forcelist=RETRY_STATUSES,
+        raise_on_status=False,
+    )
+
+
+def _observe(integration: str, method: str, status: Any, started: float) -> None:
+    REQUESTS.labels(integration, method.upper(), str(status)).inc()
+    DURATION.labels(integration).observe(time.monotonic() - started)
+
+
+class IntegrationSession(requests.Session):
+
+    """Session with pooled connections, retries and default timeout of integration.
+    """
+
+    def __init__(self, integration: str):
+        super().__init__()
+        self.integration = integration
+        config = get_config(integration)
+        self.timeout = config['timeout']
+        adapter = HTTPAdapter(pool_maxsize=config['pool_size'], max_retries=_get_retry(config))
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, *args, **kwargs):  # type: ignore
+        kwargs.setdefault('timeout', self.timeout)
+        started = time.monotonic()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.RequestException:
+            _observe(self.integration, method, 'error', started)
+            raise
+        _observe(self.integration, method, response.status_code, started)
+        return response
+
+
+class IntegrationPoolManager(urllib3.PoolManager):
+
+    """Pool manager for SDKs built on urllib3, configured like `IntegrationSession`.
+    """
+
+    def __init__(self, integration: str):
+        config = get_config(integration)
+        super().__init__(
+            maxsize=config['pool_size'],
+            retries=_get_retry(config),
+            timeout=config['timeout'],
+            cert_reqs='CERT_REQUIRED',
+            ca_certs=certifi.where(),
+        )
+        self.integration = integration
+
+    def urlopen(self, method, url, redirect=True, **kw):
+        started = time.monotonic()
+        try:
+            response = super().urlopen(method, url, redirect=redirect, **kw)
+        except urllib3.exceptions.HTTPError:
+            _observe(self.integration, method, 'error', started)
+            raise
+        _observe(self.integration, method, response.status, started)
+        return response
+
+
+_sessions: Dict[Tuple[str, int], IntegrationSession] = {}
+_pool_managers: Dict[Tuple[str, int], IntegrationPoolManager] = {}
+
+
+def get_session(integration: str) -> IntegrationSession:
+    key = (integration, os.getpid())
+    if key not in _sessions:
+        _sessions[key] = IntegrationSession(integration)
+    return _sessions[key]
+
+
+def get_pool_manager(integration: str) -> IntegrationPoolManager:
+    key = (integration, os.getpid())
+    if key not in _pool_managers:
+        _pool_managers[key] = IntegrationPoolManager(integration)
+    return _pool_managers[key]
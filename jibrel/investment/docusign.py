@@ -21,6 +21,8 @@ from docusign_esign import (
     Text
 )
 
+from jibrel.core.http import get_pool_manager
+
 
 def get_envelope_definition(
     signer_email,
@@ -96,12 +98,14 @@ class DocuSignAPI:
 
     def __init__(self, api_host=settings.DOCUSIGN_API_HOST, oauth_host_name=settings.DOCUSIGN_OAUTH_HOST):
         self._api_client = ApiClient(host=api_host, oauth_host_name=oauth_host_name)
+        self._api_client.rest_client.pool_manager = get_pool_manager('docusign')
         self._envelope_api = EnvelopesApi(self._api_client)
         self.authenticate()
 
     def authenticate(self):
         if DocuSignAPI._last_request is not None:
-            if self._last_request >= (timezone.now() + timedelta(seconds=int(self.EXPIRES_IN * 3/4))):
+            reuse_until = self._last_request + timedelta(seconds=int(self.EXPIRES_IN * 3 / 4))
+            if reuse_until >= timezone.now():
                 self._api_client.set_default_header('Authorization', DocuSignAPI._header_value)
                 return
 
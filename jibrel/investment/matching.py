@@ -0,0 +1,75 @@
+from typing import (
+    Any,
+    Iterator,
+    List,
+    Set
+)
+
+from django_banking.contrib.wire_transfer.matching import (
+    Candidate,
+    StatementMatcher
+)
+from django_banking.contrib.wire_transfer.models import UserBankAccount
+from django_banking.contrib.wire_transfer.statements import StatementLine
+from django_banking.models import Operation
+
+from .enum import InvestmentApplicationStatus
+from .models import InvestmentApplication
+
+
+class InvestmentStatementMatcher(StatementMatcher):
+
+    """Also matches payments of pending investment applications by their deposit reference code.
+
+    Sender bank account must be added by user beforehand.
+    """
+
+    def load_candidates(self) -> Iterator[Candidate]:
+        yield from super().load_candidates()
+        applications = InvestmentApplication.objects.db_manager(self.using).filter(
+            status=InvestmentApplicationStatus.PENDING,
+            deposit__isnull=True,
+        ).select_related('account__asset', 'bank_account__account')
+        for application in applications.iterator():
+            yield Candidate(
+                reference_code=application.deposit_reference_code,
+                amount=application.amount,
+                currency=application.asset.symbol,
+                iban='',
+                target=application,
+            )
+
+    def settle(self, candidate: Candidate, line: StatementLine) -> Operation:
+        application = candidate.target
+        if not isinstance(application, InvestmentApplication):
+            return super().settle(candidate, line)
+
+        user_bank_accounts = UserBankAccount.objects.db_manager(self.using).with_iban(line.iban)
+        user_bank_account = user_bank_accounts.filter(
+            user_id=application.user_id,
+            is_active=True,
+        ).first()
+        if user_bank_account is None:
+            raise UserBankAccount.DoesNotExist(f'User bank account {line.iban} does not exist')
+        return application.add_payment(
+            payment_account=application.bank_account.account,
+            user_account=application.account,
+            user_bank_account=user_bank_account,
+            amount=line.amount,
+        )
+
+    def get_pending(self, candidates: List[Candidate]) -> Set[Any]:
+        applications = [
+            candidate.target.pk
+            for candidate in candidates
+            if isinstance(candidate.target, InvestmentApplication)
+        ]
+        pending = super().get_pending(candidates)
+        pending.update(
+            InvestmentApplication.objects.db_manager(self.using).filter(
+                pk__in=applications,
+                status=InvestmentApplicationStatus.PENDING,
+                deposit__isnull=True,
+            ).values_list('pk', flat=True)
+        )
+        return pending
@@ -1,4 +1,3 @@
-from django.contrib.postgres.fields.jsonb import KeyTextTransform
 from django.db.models import (
     BooleanField,
     Case,
@@ -11,7 +10,6 @@ from django.db.models import (
     Value,
     When
 )
-from django.db.models.functions import Cast
 
 from django_banking.models import Operation
 from django_banking.models.transactions.enum import (
@@ -69,7 +67,6 @@ class InvestmentApplicationQuerySet(QuerySet):
 
     def with_payment_status(self):
         return self.annotate(
-            deposit_str=Cast('deposit_id', CharField()),
             is_paid=Exists(
                 Operation.objects.filter(
                     status__in=[OperationStatus.HOLD, OperationStatus.COMMITTED],
@@ -79,11 +76,8 @@ class InvestmentApplicationQuerySet(QuerySet):
             is_refunded=Exists(
                 Operation.objects.filter(
                     type=OperationType.REFUND,
-                    status__in=[OperationStatus.HOLD, OperationStatus.COMMITTED]
-                ).annotate(
-                    deposit_id=Cast(KeyTextTransform('deposit', 'references'), CharField()),
-                ).filter(
-                    deposit_id=OuterRef('deposit_str'),
+                    status__in=[OperationStatus.HOLD, OperationStatus.COMMITTED],
+                    refunded_deposit=OuterRef('deposit'),
                 )
             ),
             payment_status=Case(
@@ -0,0 +1,22 @@
+# Generated by Django 3.0.3 on 2026-10-18 02:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc', '0010_auto_20200124_1214'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kycdocument',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='kycdocument',
+            index=models.Index(fields=['profile', 'sha256'], name='kyc_document_profile_sha256'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.0.3 on 2026-10-18 03:07
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def backfill_check_created_at(apps, schema_editor):
+    # exact check creation time is unknown, submission creation time is the closest one
+    BaseKYCSubmission = apps.get_model('kyc', 'BaseKYCSubmission')
+    Beneficiary = apps.get_model('kyc', 'Beneficiary')
+    BaseKYCSubmission.objects.filter(onfido_check_id__isnull=False).update(
+        onfido_check_created_at=F('created_at')
+    )
+    Beneficiary.objects.filter(onfido_check_id__isnull=False).update(
+        onfido_check_created_at=Subquery(
+            BaseKYCSubmission.objects.filter(
+                pk=OuterRef('organisational_submission_id')
+            ).values('created_at')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc', '0011_document_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='basekycsubmission',
+            name='onfido_check_created_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='basekycsubmission',
+            name='onfido_result_collected_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='beneficiary',
+            name='onfido_check_created_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='beneficiary',
+            name='onfido_result_collected_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_check_created_at, migrations.RunPython.noop),
+    ]
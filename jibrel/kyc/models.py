@@ -155,14 +155,24 @@ class KYCDocument(CloneMixin, models.Model):
     MIN_SIZE = 32 * 1024
 
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4)
+    #: stored file can be shared by duplicates uploaded by the same profile,
+    #: so it must be deleted only once no other document references its name
     file = models.FileField(storage=kyc_file_storage)
+    #: MD5 of content, duplicates of direct uploads are found by it
     checksum = models.CharField(max_length=32)
+    #: content hash, documents of the same profile with equal hashes share stored file
+    sha256 = models.CharField(max_length=64, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     profile = models.ForeignKey(to='authentication.Profile', on_delete=models.PROTECT)
 
     objects = DocumentQuerySet.as_manager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['profile', 'sha256'], name='kyc_document_profile_sha256'),
+        ]
+
 
 class AddressMixing(models.Model):
     """
@@ -229,6 +239,9 @@ class BaseKYCSubmission(CloneMixin, models.Model):
 
     onfido_applicant_id = models.CharField(max_length=100, null=True, blank=True)
     onfido_check_id = models.CharField(max_length=100, null=True, blank=True)
+    onfido_check_created_at = models.DateTimeField(null=True, blank=True)
+    #: last time pending check result was requested by sweeper
+    onfido_result_collected_at = models.DateTimeField(null=True, blank=True)
     onfido_result = models.CharField(max_length=100, choices=ONFIDO_RESULT_CHOICES, null=True, blank=True)
     onfido_report = models.FileField(storage=kyc_file_storage, null=True)
 
@@ -446,6 +459,9 @@ class Beneficiary(CloneMixin, AddressMixing, models.Model):  # type: ignore
 
     onfido_applicant_id = models.CharField(max_length=100, null=True, blank=True)
     onfido_check_id = models.CharField(max_length=100, null=True, blank=True)
+    onfido_check_created_at = models.DateTimeField(null=True, blank=True)
+    #: last time pending check result was requested by sweeper
+    onfido_result_collected_at = models.DateTimeField(null=True, blank=True)
     onfido_result = models.CharField(max_length=100, choices=ONFIDO_RESULT_CHOICES, null=True, blank=True)
     onfido_report = models.FileField(storage=kyc_file_storage, null=True)
 
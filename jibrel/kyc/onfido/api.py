@@ -3,7 +3,15 @@ from datetime import date
 from typing import Optional
 
 import onfido
-import requests
+from django.core.files import File
+from onfido.rest import ApiException
+
+from jibrel.core.http import (
+    get_pool_manager,
+    get_session
+)
+
+from .multipart import MultipartFileStream
 
 
 @dataclass
@@ -21,7 +29,7 @@ class OnfidoAPI:
     ):
         configuration = onfido.Configuration()
         configuration.host = api_url
-        self.api = onfido.DefaultApi(
+        self._api = onfido.DefaultApi(
             onfido.ApiClient(
                 configuration=configuration,
                 header_name='Authorization',
@@ -29,6 +37,13 @@ class OnfidoAPI:
             )
         )
 
+    @property
+    def api(self) -> onfido.DefaultApi:
+        """SDK client sending requests through pool of current process.
+        """
+        self._api.api_client.rest_client.pool_manager = get_pool_manager('onfido')
+        return self._api
+
     def create_applicant(
         self,
         first_name: str,
@@ -53,17 +68,32 @@ class OnfidoAPI:
     def upload_document(
         self,
         applicant_id: str,
-        file_path: str,
+        file: File,
         document_type: str,
         country: str,
     ) -> str:
-        response = self.api.upload_document(
-            applicant_id=applicant_id,
-            file=file_path,
-            type=document_type,
-            issuing_country=country,
+        """Upload document streaming file content by chunks.
+
+        SDK reads whole file into memory to build request, so request is made
+        directly with the same headers.
+        """
+        body = MultipartFileStream(
+            fields={'type': document_type, 'issuing_country': country},
+            file_field='file',
+            file=file,
         )
-        return response.id
+        response = get_session('onfido').post(  # type: ignore
+            f'{self.api.api_client.configuration.host}/applicants/{applicant_id}/documents',
+            data=body,
+            headers={
+                **self.api.api_client.default_headers,
+                'Accept': 'application/json',
+                'Content-Type': body.content_type,
+            },
+        )
+        if not response.ok:
+            raise ApiException(status=response.status_code, reason=response.reason)
+        return response.json()['id']
 
     def create_check(
         self,
@@ -96,7 +126,7 @@ class OnfidoAPI:
         )
 
     def download_report(self, url: str) -> bytes:
-        response = requests.get(
+        response = get_session('onfido').get(
             url,
             headers=self.api.api_client.default_headers,
         )
@@ -1,4 +1,3 @@
-import tempfile
 from dataclasses import dataclass
 from datetime import date
 from enum import Enum
@@ -9,7 +8,7 @@ from typing import (
 from uuid import UUID
 
 import pycountry
-from django.core.files import File
+from django.db.models.fields.files import FieldFile
 
 from jibrel.kyc.models import (
     BaseKYCSubmission,
@@ -28,7 +27,7 @@ class PersonalDocumentType(Enum):
 @dataclass
 class PersonalDocument:
     uuid: UUID
-    file: File
+    file: FieldFile
     type: PersonalDocumentType
     country: str
 
@@ -106,13 +105,10 @@ def create_applicant(onfido_api: OnfidoAPI, person: Person) -> str:
 
 
 def upload_document(onfido_api: OnfidoAPI, applicant_id: str, document: PersonalDocument):
-    with tempfile.NamedTemporaryFile(suffix=document.file.name) as f:
-        f.write(document.file.read())
-        f.seek(0)
-
+    with document.file.storage.open_stream(document.file.name) as file:
         onfido_api.upload_document(
             applicant_id=applicant_id,
-            file_path=f.name,
+            file=file,
             document_type=document.type.value,
             country=document.country,
         )
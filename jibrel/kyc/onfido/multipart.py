@@ -0,0 +1,57 @@
+import mimetypes
+import os
+from typing import (
+    Dict,
+    Iterator
+)
+from uuid import uuid4
+
+from django.core.files import File
+
+
+class MultipartFileStream:
+
+    """Body of multipart/form-data request with plain fields and single file.
+
+    File is read by chunks while request is sent, so memory use is bounded by
+    `chunk_size` whatever file size is. Length is known in advance, so request
+    is sent with Content-Length, not chunked.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, str],
+        file_field: str,
+        file: File,
+        chunk_size: int = 64 * 1024,
+    ):
+        self.boundary = uuid4().hex
+        self.file = file
+        self.chunk_size = chunk_size
+        filename = os.path.basename(file.name)
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        self._head = b''.join(
+            self._part_header(f'name="{name}"') + value.encode() + b'\r\n'
+            for name, value in fields.items()
+        ) + self._part_header(
+            f'name="{file_field}"; filename="{filename}"', content_type
+        )
+        self._tail = f'\r\n--{self.boundary}--\r\n'.encode()
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def _part_header(self, disposition: str, content_type: str = None) -> bytes:
+        header = f'--{self.boundary}\r\nContent-Disposition: form-data; {disposition}\r\n'
+        if content_type:
+            header += f'Content-Type: {content_type}\r\n'
+        return f'{header}\r\n'.encode()
+
+    def __len__(self) -> int:
+        return len(self._head) + self.file.size + len(self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._head
+        yield from self.file.chunks(self.chunk_size)
+        yield self._tail
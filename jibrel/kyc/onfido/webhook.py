@@ -0,0 +1,29 @@
+import hashlib
+import hmac
+from typing import Optional
+
+#: header with HMAC-SHA256 hex digest of request body signed with webhook token
+SIGNATURE_HEADER = 'HTTP_X_SHA2_SIGNATURE'
+
+CHECK_COMPLETED = 'check.completed'
+
+
+def is_valid_signature(body: bytes, signature: str, token: str) -> bool:
+    if not token or not signature:
+        return False
+    expected = hmac.new(token.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature.lower())
+
+
+def get_completed_check_id(event: dict) -> Optional[str]:
+    """Get id of check from `check.completed` event, other events are ignored.
+    """
+    payload = event.get('payload')
+    if not isinstance(payload, dict):
+        return None
+    if payload.get('resource_type') != 'check' or payload.get('action') != CHECK_COMPLETED:
+        return None
+    check = payload.get('object')
+    if not isinstance(check, dict):
+        return None
+    return check.get('id')
@@ -29,6 +29,11 @@ class PhoneVerificationQuerySet(models.QuerySet):
 
 
 class DocumentQuerySet(models.QuerySet):
+    def is_file_referenced(self, name: str) -> bool:
+        """Check if stored file is referenced by any document, duplicates share stored files.
+        """
+        return self.filter(file=name).exists()
+
     def not_used_in_kyc(self):
         from .models import IndividualKYCSubmission
         return self.annotate(
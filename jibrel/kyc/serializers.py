@@ -10,6 +10,12 @@ from rest_framework.exceptions import (
     ValidationError
 )
 
+from django_banking.core.exceptions import UploadNotFound
+from django_banking.core.uploads import (
+    HEAD_SIZE,
+    UploadedFile,
+    get_uploaded_file
+)
 from jibrel.authentication.models import Phone
 from jibrel.core.errors import ErrorCode
 from jibrel.core.rest_framework import (
@@ -20,6 +26,7 @@ from jibrel.core.serializers import (
     DateField,
     PhoneNumberField
 )
+from jibrel.core.storages import kyc_file_storage
 from jibrel.kyc.models import (
     IndividualKYCSubmission,
     KYCDocument,
@@ -51,6 +58,34 @@ class VerifyPhoneRequestSerializer(serializers.Serializer):
     pin = serializers.CharField(max_length=6)
 
 
+def validate_document_file(file: File) -> None:
+    magic_bytes = file.read(HEAD_SIZE)
+    file.seek(0)
+    validate_document_content(file.size, magic_bytes)
+
+
+def validate_document_content(size: int, magic_bytes: bytes) -> None:
+    errors = []
+    if (size < KYCDocument.MIN_SIZE) or (size > KYCDocument.MAX_SIZE):
+        errors.append(
+            ErrorDetail(
+                f'File size `{size}` should be in range from ' +
+                f'`{KYCDocument.MIN_SIZE}` to `{KYCDocument.MAX_SIZE}`',
+                'invalid'
+            )
+        )
+    mime_type = magic.from_buffer(magic_bytes, mime=True)
+    if mime_type not in KYCDocument.SUPPORTED_MIME_TYPES:
+        errors.append(
+            ErrorDetail(
+                f'File type `{mime_type}` not supported',
+                'invalid'
+            )
+        )
+    if errors:
+        raise ValidationError(errors)
+
+
 class UploadDocumentRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = KYCDocument
@@ -62,30 +97,51 @@ class UploadDocumentRequestSerializer(serializers.ModelSerializer):
         }
 
     def validate_file(self, file: File) -> File:
-        errors = []
-        if (file.size < KYCDocument.MIN_SIZE) or (file.size > KYCDocument.MAX_SIZE):
-            errors.append(
-                ErrorDetail(
-                    f'File size `{file.size}` should be in range from ' +
-                    f'`{KYCDocument.MIN_SIZE}` to `{KYCDocument.MAX_SIZE}`',
-                    'invalid'
-                )
-            )
-        magic_bytes = file.read(1024)
-        file.seek(0)
-        mime_type = magic.from_buffer(magic_bytes, mime=True)
-        if mime_type not in KYCDocument.SUPPORTED_MIME_TYPES:
-            errors.append(
-                ErrorDetail(
-                    f'File type `{mime_type}` not supported',
-                    'invalid'
-                )
-            )
-        if errors:
-            raise ValidationError(errors)
+        validate_document_file(file)
         return file
 
 
+class RequestDocumentUploadSerializer(serializers.Serializer):
+    fileName = serializers.CharField(max_length=255, source='file_name')
+    contentType = serializers.ChoiceField(
+        choices=KYCDocument.SUPPORTED_MIME_TYPES,
+        source='content_type',
+    )
+
+
+class FinalizeDocumentUploadSerializer(serializers.Serializer):
+    token = serializers.CharField()
+    checksum = serializers.RegexField(r'^[0-9a-f]{32}$')
+
+    def validate(self, attrs):
+        try:
+            upload = get_uploaded_file(
+                kyc_file_storage, attrs['token'], self.context['profile'].pk
+            )
+        except UploadNotFound as exc:
+            raise ValidationError({'token': [ErrorDetail(str(exc), 'invalid')]})
+        try:
+            self.check_upload(upload, attrs['checksum'])
+        except ValidationError:
+            # rejected file is removed, new upload should be requested to retry
+            if not KYCDocument.objects.is_file_referenced(upload.name):
+                kyc_file_storage.delete(upload.name)
+            raise
+        attrs['upload'] = upload
+        return attrs
+
+    @staticmethod
+    def check_upload(upload: UploadedFile, checksum: str):
+        try:
+            validate_document_content(upload.size, upload.head)
+        except ValidationError as exc:
+            raise ValidationError({'token': exc.detail})
+        if upload.checksum != checksum:
+            raise ValidationError({
+                'checksum': [ErrorDetail('Checksum does not match uploaded file', 'invalid')]
+            })
+
+
 def date_diff_validator(days):
     def _date_diff_validator(date):
         if (date - timezone.now().date()).days < days:
@@ -1,10 +1,16 @@
 import hashlib
 from datetime import date
+from typing import Tuple
 from uuid import UUID
 
 from django.conf import settings
 from django.core.files import File
 
+from django_banking.core.uploads import (
+    DirectUpload,
+    UploadedFile,
+    request_upload
+)
 from jibrel.authentication.models import (
     Phone,
     Profile,
@@ -15,6 +21,7 @@ from jibrel.core.limits import (
     ResendVerificationSMSLimiter,
     UploadKYCDocumentLimiter
 )
+from jibrel.core.storages import kyc_file_storage
 from jibrel.kyc.models import (
     IndividualKYCSubmission,
     KYCDocument,
@@ -99,17 +106,79 @@ def check_phone_verification(
     phone.set_code_submitted()
 
 
+def hash_file(file: File) -> Tuple[str, str]:
+    """Calculate MD5 and SHA-256 hex digests of file reading it chunk by chunk.
+    """
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+    for chunk in file.chunks():
+        md5.update(chunk)
+        sha256.update(chunk)
+    file.seek(0)
+    return md5.hexdigest(), sha256.hexdigest()
+
+
+def _create_document(file: File, profile: Profile, checksum: str, sha256: str) -> KYCDocument:
+    # SHA-256 of direct uploads is unknown, their duplicates are found by MD5 checksum.
+    # Duplicate shares stored file of the original, see `KYCDocument.file`
+    documents = KYCDocument.objects.filter(profile=profile)
+    if sha256:
+        duplicate = documents.filter(sha256=sha256).first()
+    else:
+        duplicate = documents.filter(checksum=checksum).first()
+    return KYCDocument.objects.create(
+        file=duplicate.file.name if duplicate else file,
+        profile=profile,
+        checksum=checksum,
+        sha256=sha256,
+    )
+
+
 def upload_document(
     file: File,
     profile: Profile,
 ) -> UUID:
+    """Store uploaded document.
+
+    File is streamed to storage by chunks, document already uploaded by the
+    same profile is referenced instead of storing its content again.
+    """
     UploadKYCDocumentLimiter(profile.user).is_throttled(raise_exception=True)
-    checksum = hashlib.md5(file.read()).hexdigest()
-    document = KYCDocument.objects.create(
-        file=file,
-        profile=profile,
-        checksum=checksum,
+    checksum, sha256 = hash_file(file)
+    return _create_document(file, profile, checksum, sha256).uuid
+
+
+def request_document_upload(
+    profile: Profile,
+    file_name: str,
+    content_type: str,
+) -> DirectUpload:
+    """Issue presigned form for uploading document directly to storage.
+    """
+    UploadKYCDocumentLimiter(profile.user).is_throttled(raise_exception=True)
+    return request_upload(
+        kyc_file_storage,
+        owner=profile.pk,
+        filename=file_name,
+        content_type=content_type,
+        min_size=KYCDocument.MIN_SIZE,
+        max_size=KYCDocument.MAX_SIZE,
     )
+
+
+def finalize_document_upload(
+    upload: UploadedFile,
+    profile: Profile,
+) -> UUID:
+    """Register document uploaded directly to storage and validated by its metadata.
+
+    Content isn't downloaded, so SHA-256 digest is left empty. Duplicate of
+    already uploaded document is removed from storage unless some document
+    references it.
+    """
+    document = _create_document(upload.name, profile, upload.checksum, '')
+    if not KYCDocument.objects.is_file_referenced(upload.name):
+        kyc_file_storage.delete(upload.name)
     return document.uuid
 
 
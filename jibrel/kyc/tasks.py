@@ -13,6 +13,7 @@ from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.files import File
 from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 from django.utils.text import slugify
 from onfido.rest import ApiException
@@ -298,29 +299,39 @@ def onfido_start_check_task(self: Task, *, account_type: str, kyc_submission_id:
         check_id,
     )
     kyc_submission.onfido_check_id = check_id
+    kyc_submission.onfido_check_created_at = timezone.now()
     kyc_submission.save()
 
 
 @app.task(
     bind=True,
-    default_retry_delay=settings.ONFIDO_COLLECT_RESULTS_SCHEDULE,
     autoretry_for=(ApiException, requests.exceptions.HTTPError,),
-    max_retries=settings.ONFIDO_MAX_RETIES,
+    **onfido_retry_options,
 )
 def onfido_save_check_result_task(self, *, account_type: str, kyc_submission_id: int):
-    """Save OnFido check results and report for submission `kyc_submission_id`"""
+    """Save OnFido check results and report for submission `kyc_submission_id`
+
+    Check isn't polled until it is complete, task is enqueued again by
+    completion webhook or results sweeper.
+    """
 
     kyc_submission = BaseKYCSubmission.get_submission(account_type, kyc_submission_id)
     if kyc_submission.onfido_applicant_id is None:
         logger.warning('Applicant was not created, skipping saving check result')
         return
+    if kyc_submission.onfido_result is not None:
+        logger.info(
+            'Check result for applicant %s is already saved', kyc_submission.onfido_applicant_id
+        )
+        return
     result, report_url = check.get_check_result(
         onfido_api,
         kyc_submission.onfido_applicant_id,
         kyc_submission.onfido_check_id,
     )
     if not result:
-        self.retry()
+        logger.info('Check %s is not complete yet', kyc_submission.onfido_check_id)
+        return
     report = check.download_report(
         onfido_api,
         report_url
@@ -378,14 +389,14 @@ def onfido_start_check_beneficiary_task(self: Task, beneficiary_id: int):
         raise self.retry(exc=exc)
     logger.info('Check successfully for applicant %s with Check ID %s', beneficiary.onfido_applicant_id, check_id)
     beneficiary.onfido_check_id = check_id
+    beneficiary.onfido_check_created_at = timezone.now()
     beneficiary.save()
 
 
 @app.task(
     bind=True,
-    default_retry_delay=settings.ONFIDO_COLLECT_RESULTS_SCHEDULE,
     autoretry_for=(ApiException, requests.exceptions.HTTPError,),
-    max_retries=settings.ONFIDO_MAX_RETIES,
+    **onfido_retry_options,
 )
 def onfido_save_check_result_beneficiary_task(self, beneficiary_id: int):
     """Save OnFido check results and report for submission `kyc_submission_id`"""
@@ -394,13 +405,19 @@ def onfido_save_check_result_beneficiary_task(self, beneficiary_id: int):
     if beneficiary.onfido_applicant_id is None:
         logger.warning('Applicant was not created, skipping saving check result')
         return
+    if beneficiary.onfido_result is not None:
+        logger.info(
+            'Check result for applicant %s is already saved', beneficiary.onfido_applicant_id
+        )
+        return
     result, report_url = check.get_check_result(
         onfido_api,
         beneficiary.onfido_applicant_id,
         beneficiary.onfido_check_id,
     )
     if not result:
-        self.retry()
+        logger.info('Check %s is not complete yet', beneficiary.onfido_check_id)
+        return
     report = check.download_report(
         onfido_api,
         report_url
@@ -414,6 +431,70 @@ def onfido_save_check_result_beneficiary_task(self, beneficiary_id: int):
     beneficiary.save()
 
 
+def enqueue_onfido_check_result(check_id: str) -> int:
+    """Enqueue saving result of completed check `check_id`
+
+    Returns:
+        number of submissions and beneficiaries results of which are enqueued
+    """
+    submissions = BaseKYCSubmission.objects.filter(
+        onfido_check_id=check_id,
+        onfido_result__isnull=True,
+    )
+    beneficiaries = Beneficiary.objects.filter(
+        onfido_check_id=check_id,
+        onfido_result__isnull=True,
+    )
+    return _enqueue_onfido_check_results(submissions, beneficiaries)
+
+
+def _enqueue_onfido_check_results(submissions, beneficiaries) -> int:
+    count = 0
+    for account_type, kyc_submission_id in submissions.values_list('account_type', 'pk'):
+        onfido_save_check_result_task.delay(
+            account_type=account_type, kyc_submission_id=kyc_submission_id
+        )
+        count += 1
+    for beneficiary_id in beneficiaries.values_list('pk', flat=True):
+        onfido_save_check_result_beneficiary_task.delay(beneficiary_id)
+        count += 1
+    return count
+
+
+@app.task()
+def onfido_collect_check_results_task():
+    """Enqueue saving results of pending checks completion webhook of which was missed
+
+    Checks started within the last sweep interval are left for webhook, at
+    most `ONFIDO_COLLECT_RESULTS_BATCH_SIZE` submissions and beneficiaries
+    are collected per run. Checks never collected go first, then the ones
+    collected longest ago, so checks stuck on OnFido side don't block others.
+    """
+    now = timezone.now()
+    edge = now - timedelta(seconds=settings.ONFIDO_COLLECT_RESULTS_SCHEDULE)
+    batch_size = settings.ONFIDO_COLLECT_RESULTS_BATCH_SIZE
+    order = (F('onfido_result_collected_at').asc(nulls_first=True), 'onfido_check_created_at')
+    submission_ids = list(BaseKYCSubmission.objects.filter(
+        onfido_check_id__isnull=False,
+        onfido_result__isnull=True,
+        status=BaseKYCSubmission.PENDING,
+        onfido_check_created_at__lt=edge,
+    ).order_by(*order).values_list('pk', flat=True)[:batch_size])
+    beneficiary_ids = list(Beneficiary.objects.filter(
+        onfido_check_id__isnull=False,
+        onfido_result__isnull=True,
+        organisational_submission__status=BaseKYCSubmission.PENDING,
+        onfido_check_created_at__lt=edge,
+    ).order_by(*order).values_list('pk', flat=True)[:batch_size])
+
+    submissions = BaseKYCSubmission.objects.filter(pk__in=submission_ids)
+    beneficiaries = Beneficiary.objects.filter(pk__in=beneficiary_ids)
+    submissions.update(onfido_result_collected_at=now)
+    beneficiaries.update(onfido_result_collected_at=now)
+    count = _enqueue_onfido_check_results(submissions, beneficiaries)
+    logger.info('Saving of %s OnFido check results enqueued', count)
+
+
 def send_phone_verified_email(user_id: str, user_ip: str):
     user = User.objects.get(pk=user_id)
     rendered = PhoneVerifiedEmailMessage.render({
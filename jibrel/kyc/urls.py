@@ -4,6 +4,8 @@ from jibrel.kyc import views
 
 urlpatterns = [
     path('document', views.UploadDocumentAPIView.as_view()),
+    path('document/upload/request', views.RequestDocumentUploadAPIView.as_view()),
+    path('document/upload/finalize', views.FinalizeDocumentUploadAPIView.as_view()),
     path('phone', views.PhoneAPIView.as_view()),
     path('phone/resend-sms', views.ResendSMSAPIView.as_view()),
     path('phone/call-me', views.CallPhoneAPIView.as_view()),
@@ -13,4 +15,5 @@ urlpatterns = [
     path('organization', views.OrganisationalKYCSubmissionAPIView.as_view()),
     path('organization/validate', views.OrganisationalKYCValidateAPIView.as_view()),
     path('approved', views.LastKYCAPIView.as_view()),
+    path('onfido/webhook', views.OnfidoWebhookAPIView.as_view()),
 ]
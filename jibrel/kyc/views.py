@@ -1,3 +1,6 @@
+import json
+
+from django.conf import settings
 from rest_framework import (
     exceptions,
     mixins,
@@ -29,21 +32,26 @@ from jibrel.core.rest_framework import (
     exception_handler
 )
 from jibrel.kyc.serializers import (
+    FinalizeDocumentUploadSerializer,
     IndividualKYCSubmissionSerializer,
     LastIndividualKYCSerializer,
     LastOrganisationalKYCSerializer,
     OrganisationalKYCSubmissionSerializer,
     PhoneSerializer,
+    RequestDocumentUploadSerializer,
     UploadDocumentRequestSerializer,
     VerifyPhoneRequestSerializer
 )
 from jibrel.kyc.services import (
     check_phone_verification,
+    finalize_document_upload,
+    request_document_upload,
     request_phone_verification,
     submit_individual_kyc,
     submit_organisational_kyc,
     upload_document
 )
+from jibrel.kyc.tasks import enqueue_onfido_check_result
 from jibrel.notifications.phone_verification import PhoneVerificationChannel
 
 from .models import (
@@ -51,6 +59,11 @@ from .models import (
     IndividualKYCSubmission,
     OrganisationalKYCSubmission
 )
+from .onfido.webhook import (
+    SIGNATURE_HEADER,
+    get_completed_check_id,
+    is_valid_signature
+)
 from .signals import kyc_requested
 
 
@@ -184,6 +197,41 @@ class UploadDocumentAPIView(APIView):
         })
 
 
+class RequestDocumentUploadAPIView(APIView):
+    def post(self, request: Request) -> Response:
+        serializer = RequestDocumentUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = request_document_upload(
+            profile=request.user.profile,
+            file_name=serializer.validated_data['file_name'],
+            content_type=serializer.validated_data['content_type'],
+        )
+        return Response({
+            'data': {
+                'token': upload.token,
+                'url': upload.url,
+                'fields': upload.fields,
+            }
+        })
+
+
+class FinalizeDocumentUploadAPIView(APIView):
+    def post(self, request: Request) -> Response:
+        serializer = FinalizeDocumentUploadSerializer(
+            data=request.data, context={'profile': request.user.profile}
+        )
+        serializer.is_valid(raise_exception=True)
+        document_id = finalize_document_upload(
+            upload=serializer.validated_data['upload'],
+            profile=request.user.profile,
+        )
+        return Response({
+            'data': {
+                'id': document_id
+            }
+        })
+
+
 class IndividualKYCSubmissionAPIView(APIView):
     serializer_class = IndividualKYCSubmissionSerializer
 
@@ -346,3 +394,28 @@ class LastKYCAPIView(APIView):
         return Response(
             serializer_class(request.user.profile.last_kyc.details, many=False).data
         )
+
+
+class OnfidoWebhookAPIView(APIView):
+    """Receive OnFido events, results of completed checks are saved asynchronously
+    """
+
+    authentication_classes = []  # type: ignore
+    permission_classes = []  # type: ignore
+    throttle_classes = []  # type: ignore
+
+    def post(self, request: Request) -> Response:
+        body = request.body
+        signature = request.META.get(SIGNATURE_HEADER, '')
+        if not is_valid_signature(body, signature, settings.ONFIDO_WEBHOOK_TOKEN):
+            raise exceptions.PermissionDenied('Invalid signature')
+        try:
+            event = json.loads(body)
+        except ValueError:
+            raise exceptions.ParseError()
+        if not isinstance(event, dict):
+            raise exceptions.ParseError('Event must be JSON object')
+        check_id = get_completed_check_id(event)
+        if check_id:
+            enqueue_onfido_check_result(check_id)
+        return Response()
@@ -19,6 +19,8 @@ from django.template.loader import select_template
 from django.utils import timezone
 from requests import Response
 
+from jibrel.core.http import get_session
+
 
 class EmailMessage(AnymailMessage):
     """Overridden email message with injected `postprocess_func` which would be called in EmailBackend"""
@@ -31,7 +33,19 @@ class EmailMessage(AnymailMessage):
 
 
 class EmailBackend(AnymailMailgunBackend):
-    """Overridden EmailBackend which calls `postprocess_func` after getting response from ESP"""
+    """Overridden EmailBackend which calls `postprocess_func` after getting response from ESP
+
+    Messages are sent through shared session, connection to ESP is kept alive between sends.
+    """
+
+    def open(self):
+        if self.session:
+            return False
+        self.session = get_session('mailgun')
+        return True
+
+    def close(self):
+        self.session = None
 
     def post_to_esp(self, payload, message: EmailMessage) -> Response:
         response = super().post_to_esp(payload, message)
@@ -5,6 +5,8 @@ import requests
 from django.conf import settings
 from requests.auth import HTTPBasicAuth
 
+from jibrel.core.http import get_session
+
 
 class PhoneVerificationChannel(Enum):
     SMS = 'sms'
@@ -27,11 +29,10 @@ class TwilioVerifyAPI:
         path: str,
         **kwargs: Any
     ) -> requests.Response:
-        return requests.request(
+        return get_session('twilio').request(
             method,
             f'{self._base_url}{path}',
             auth=self._auth,
-            timeout=settings.TWILIO_REQUEST_TIMEOUT,
             **kwargs
         )
 
@@ -21,6 +21,9 @@ from django_banking.contrib.wire_transfer.models import (
 )
 from django_banking.models import Operation
 from django_banking.models.transactions.enum import OperationStatus
+from django_banking.models.transactions.exceptions import (
+    OperationArchivedException
+)
 from jibrel.investment.enum import InvestmentApplicationStatus
 
 admin.site.unregister(WithdrawalWireTransferOperation)
@@ -94,10 +97,14 @@ class DepositWireTransferOperationModelAdmin(DepositWireTransferOperationModelAd
         accepted = request.POST.get('confirm', None)
         amount = obj.amount
         if accepted == 'yes':
-            operation = Operation.objects.create_refund(
-                deposit=obj,
-                amount=amount
-            )
+            try:
+                operation = Operation.objects.create_refund(
+                    deposit=obj,
+                    amount=amount
+                )
+            except OperationArchivedException as exc:
+                self.message_user(request, exc.reason, messages.ERROR)
+                return HttpResponseRedirect(back_url)
             try:
                 operation.commit()
                 # TODO
@@ -0,0 +1,26 @@
+from celery.utils.log import get_task_logger
+
+from django_banking.core.prices import price_repository
+from django_banking.models import BalanceCheckpoint
+from django_banking.models.transactions.partitions import maintain_partitions
+from jibrel.celery import app
+
+logger = get_task_logger(__name__)
+
+
+@app.task()
+def roll_balance_checkpoints_task():
+    created = BalanceCheckpoint.objects.roll_forward()
+    logger.info("%s balance checkpoints created", created)
+
+
+@app.task()
+def maintain_transaction_partitions_task():
+    created, archived = maintain_partitions()
+    logger.info("%s transaction partitions created, %s archived", len(created), len(archived))
+
+
+@app.task()
+def refresh_prices_task():
+    snapshot = price_repository.refresh()
+    logger.info("%s prices refreshed, version %s", len(snapshot), snapshot.version)
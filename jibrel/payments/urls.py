@@ -7,6 +7,14 @@ urlpatterns = [
     *path('operations/',  views.OperationViewSet.as_view({'get': 'list'})),
     *path('operations/<pk>/',  views.OperationViewSet.as_view({'get': 'retrieve'})),
     *path('operations/<pk>/upload',  views.UploadOperationConfirmationAPIView.as_view()),
+    *path(
+        'operations/<pk>/upload/request',
+        views.RequestOperationConfirmationUploadAPIView.as_view(),
+    ),
+    *path(
+        'operations/<pk>/upload/finalize',
+        views.FinalizeOperationConfirmationUploadAPIView.as_view(),
+    ),
 
     *path('bank-account/', views.BankAccountListAPIView.as_view()),
     *path('bank-account/<uuid:bank_account_id>/', views.BankAccountDetailsAPIView.as_view()),
@@ -5,7 +5,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from django_banking.api.views import AssetsListAPIView as AssetsListAPIView_
+from django_banking.api.views import \
+    FinalizeOperationConfirmationUploadAPIView as \
+    FinalizeOperationConfirmationUploadAPIView_
 from django_banking.api.views import OperationViewSet as OperationViewSet_
+from django_banking.api.views import \
+    RequestOperationConfirmationUploadAPIView as \
+    RequestOperationConfirmationUploadAPIView_
 from django_banking.api.views import \
     UploadOperationConfirmationAPIView as UploadOperationConfirmationAPIView_
 from django_banking.contrib.wire_transfer.api.views import \
@@ -25,6 +31,14 @@ class UploadOperationConfirmationAPIView(UploadOperationConfirmationAPIView_):
     permission_classes = [IsAuthenticated, IsKYCVerifiedUser]
 
 
+class RequestOperationConfirmationUploadAPIView(RequestOperationConfirmationUploadAPIView_):
+    permission_classes = [IsAuthenticated, IsKYCVerifiedUser]
+
+
+class FinalizeOperationConfirmationUploadAPIView(FinalizeOperationConfirmationUploadAPIView_):
+    permission_classes = [IsAuthenticated, IsKYCVerifiedUser]
+
+
 class BankAccountListAPIView(BankAccountListAPIView_):
     permission_classes = [IsAuthenticated, IsKYCVerifiedUser]
 
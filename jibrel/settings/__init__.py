@@ -53,7 +53,18 @@ ONFIDO_API_KEY = config('ONFIDO_API_KEY')
 ONFIDO_API_URL = config('ONFIDO_API_URL', default='https://api.onfido.com/v2')
 ONFIDO_DEFAULT_RETRY_DELAY = config('ONFIDO_DEFAULT_RETRY_DELAY', cast=int, default=10)
 ONFIDO_MAX_RETIES = config('ONFIDO_MAX_RETIES', cast=int, default=10)
-ONFIDO_COLLECT_RESULTS_SCHEDULE = config('ONFIDO_COLLECT_RESULTS_SCHEDULE', cast=int, default=1200)
+ONFIDO_COLLECT_RESULTS_SCHEDULE = config('ONFIDO_COLLECT_RESULTS_SCHEDULE', cast=int, default=3600)
+ONFIDO_COLLECT_RESULTS_BATCH_SIZE = config('ONFIDO_COLLECT_RESULTS_BATCH_SIZE', cast=int, default=100)
+ONFIDO_WEBHOOK_TOKEN = config('ONFIDO_WEBHOOK_TOKEN', default='')
+
+OUTBOUND_HTTP_TIMEOUT = config('OUTBOUND_HTTP_TIMEOUT', cast=float, default=30)
+OUTBOUND_HTTP_POOL_SIZE = config('OUTBOUND_HTTP_POOL_SIZE', cast=int, default=10)
+OUTBOUND_HTTP_RETRIES = config('OUTBOUND_HTTP_RETRIES', cast=int, default=3)
+OUTBOUND_HTTP_BACKOFF_FACTOR = config('OUTBOUND_HTTP_BACKOFF_FACTOR', cast=float, default=0.5)
+# per integration overrides of the options above
+OUTBOUND_HTTP_INTEGRATIONS = {
+    'twilio': {'timeout': TWILIO_REQUEST_TIMEOUT},
+}
 
 # S3 and file storing
 AWS_S3_LOCATION_PREFIX = config('AWS_S3_LOCATION_PREFIX', default='')
@@ -222,6 +233,22 @@ DATABASES = {
     }
 }
 
+# Asset and fee registries, limits usage, prices and price offers are published to api, admin
+# and celery processes through default cache, so it must be shared by them (database,
+# memcached, redis), not process local. It is checked by `django_banking.E001` system check.
+# Database cache table is created with `createcachetable` command.
+CACHE_BACKEND = config('CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': config('CACHE_LOCATION', default='django_cache'),
+    }
+}
+if CACHE_BACKEND == 'django.core.cache.backends.db.DatabaseCache':
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', cast=int, default=100000),
+    }
+
 AUTH_USER_MODEL = 'authentication.User'
 
 TIME_ZONE = 'UTC'
@@ -348,17 +375,50 @@ LOGGING = {
 }
 
 DJANGO_BANKING_USER_MODEL = 'authentication.User'
+DJANGO_BANKING_WIRE_TRANSFER_STATEMENT_MATCHER = 'jibrel.investment.matching.InvestmentStatementMatcher'
+# prices aren't refreshed unless source file is configured
+PRICE_SOURCE_PATH = config('PRICE_SOURCE_PATH', default='')
+DJANGO_BANKING_PRICE_SOURCE_OPTIONS = {
+    'path': PRICE_SOURCE_PATH
+}
+DJANGO_BANKING_PRICE_SNAPSHOT_TIMEOUT = RATES_CACHE_CONTROL_TIMEOUT
+DJANGO_BANKING_PRICE_OFFER_LIFETIME = EXCHANGE_PRICE_FOR_USER_LIFETIME
 
 KYC_ADMIN_NOTIFICATION_RECIPIENT = config('KYC_ADMIN_NOTIFICATION_RECIPIENT')
 KYC_ADMIN_NOTIFICATION_PERIOD = config('KYC_ADMIN_NOTIFICATION_PERIOD', cast=int, default=1)
 
+BALANCE_CHECKPOINT_SCHEDULE = config('BALANCE_CHECKPOINT_SCHEDULE', cast=int, default=3600)
+DJANGO_BANKING_BALANCE_CHECKPOINT_LAG = timedelta(
+    seconds=config('BALANCE_CHECKPOINT_LAG', cast=int, default=3600)
+)
+DJANGO_BANKING_TRANSACTION_ARCHIVE_AFTER_MONTHS = config(
+    'TRANSACTION_ARCHIVE_AFTER_MONTHS', cast=lambda value: int(value) if value else None, default=''
+)
+
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULE = {
     'send_admin_new_kyc_notification': {
         'task': 'jibrel.kyc.tasks.send_admin_new_kyc_notification',
         'schedule': timedelta(hours=KYC_ADMIN_NOTIFICATION_PERIOD)
-    }
+    },
+    'roll_balance_checkpoints': {
+        'task': 'jibrel.payments.tasks.roll_balance_checkpoints_task',
+        'schedule': timedelta(seconds=BALANCE_CHECKPOINT_SCHEDULE)
+    },
+    'maintain_transaction_partitions': {
+        'task': 'jibrel.payments.tasks.maintain_transaction_partitions_task',
+        'schedule': timedelta(days=1)
+    },
+    'onfido_collect_check_results': {
+        'task': 'jibrel.kyc.tasks.onfido_collect_check_results_task',
+        'schedule': timedelta(seconds=ONFIDO_COLLECT_RESULTS_SCHEDULE)
+    },
 }
+if PRICE_SOURCE_PATH:
+    CELERY_BEAT_SCHEDULE['refresh_prices'] = {
+        'task': 'jibrel.payments.tasks.refresh_prices_task',
+        'schedule': timedelta(seconds=EXCHANGE_PRICES_RECALCULATION_SCHEDULE)
+    }
 
 DOCUSIGN_API_HOST = config('DOCUSIGN_API_HOST', default='https://demo.docusign.net/restapi')
 DOCUSIGN_OAUTH_HOST = config('DOCUSIGN_OAUTH_HOST', default='account-d.docusign.com')
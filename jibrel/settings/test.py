@@ -11,3 +11,14 @@ REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {  # NOQA
     'payments': f'{PAYMENTS_THROTTLING_LIMIT}/min',
 }
 PROMETHEUS_EXPORT_MIGRATIONS = False
+
+# not installed in production yet, installed to test it
+INSTALLED_APPS += ['django_banking.contrib.crypto']  # NOQA
+
+# tests run in single process
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+SILENCED_SYSTEM_CHECKS = ['django_banking.E001']
@@ -15,6 +15,8 @@ MAIN_DB_APPS = {
     'wire_transfer',
     'investment',
     'wallets',
+    # database cache is shared with api and celery processes
+    'django_cache',
 }
 
 
@@ -7,3 +7,11 @@ MIDDLEWARE = [
 ]
 STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 PROMETHEUS_EXPORT_MIGRATIONS = False
+
+# tests run in single process
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+SILENCED_SYSTEM_CHECKS = ['django_banking.E001']
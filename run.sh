@@ -8,6 +8,7 @@ if [[ "$1" = "api" ]]; then
     echo "Starting jibrel.com backend service in '${ENVIRONMENT}' environment on node $(hostname)"
     python manage.py check
     python manage.py migrate --noinput
+    python manage.py createcachetable
     if [ "${ENVIRONMENT}" = "production" ]; then
         gunicorn jibrel.wsgi \
           -w 4 \
@@ -1,4 +1,8 @@
+from uuid import uuid4
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from django_banking.exceptions import (
     AccountBalanceException,
@@ -11,7 +15,11 @@ from django_banking.models import (
     Operation
 )
 from django_banking.models.accounts.enum import AccountType
-from django_banking.models.transactions.enum import OperationType
+from django_banking.models.transactions.enum import (
+    OperationStatus,
+    OperationType
+)
+from django_banking.models.transactions.posting import Posting
 
 
 @pytest.mark.django_db
@@ -170,3 +178,92 @@ def test_conflict_with_holded_operation():
 
     assert op2.is_valid(include_new=False)
     op2.commit()
+
+
+@pytest.mark.django_db
+def test_batch_posting():
+    asset = Asset.objects.create(name='Tmp', symbol='XYZ')
+    acc1 = Account.objects.create(type=AccountType.TYPE_ACTIVE, strict=False, asset=asset)
+    acc2 = Account.objects.create(type=AccountType.TYPE_ACTIVE, strict=False, asset=asset)
+    payment = Account.objects.create(type=AccountType.TYPE_NORMAL, strict=False, asset=asset)
+
+    unbalanced = Posting(type=OperationType.DEPOSIT).add(acc1, 10).add(payment, -5)
+    with pytest.raises(OperationBalanceException):
+        Operation.objects.post([unbalanced])
+    assert not Operation.objects.exists()
+
+    deposits = [
+        Posting(type=OperationType.DEPOSIT).add(payment, -10).add(acc1, 10),
+        Posting(type=OperationType.DEPOSIT).add(payment, -20).add(acc2, 20),
+    ]
+    overdraft = Posting(type=OperationType.WITHDRAWAL).add(acc1, -15).add(payment, 15)
+    with pytest.raises(AccountBalanceException):
+        Operation.objects.post([*deposits, overdraft])
+    assert not Operation.objects.exists()
+
+    operations = Operation.objects.post(deposits)
+    assert [op.status for op in operations] == [OperationStatus.HOLD] * 2
+    assert Operation.objects.filter(status=OperationStatus.HOLD).count() == 2
+    for op in operations:
+        op.commit()
+    assert acc1.calculate_balance() == 10
+    assert acc2.calculate_balance() == 20
+    assert payment.calculate_balance() == -30
+
+
+@pytest.mark.django_db
+def test_validation_queries_count_does_not_depend_on_legs():
+    asset = Asset.objects.create(name='Tmp', symbol='XYZ')
+    payment = Account.objects.create(type=AccountType.TYPE_NORMAL, strict=False, asset=asset)
+
+    def count_validation_queries(legs):
+        op = Operation.objects.create(type=OperationType.DEPOSIT)
+        for _ in range(legs):
+            acc = Account.objects.create(type=AccountType.TYPE_ACTIVE, strict=True, asset=asset)
+            op.transactions.create(account=acc, amount=10)
+            op.transactions.create(account=payment, amount=-10)
+        with CaptureQueriesContext(connection) as ctx:
+            assert op.is_valid()
+        return len(ctx.captured_queries)
+
+    assert count_validation_queries(1) == count_validation_queries(3)
+
+    acc = Account.objects.create(type=AccountType.TYPE_ACTIVE, strict=False, asset=asset)
+    op = Operation.objects.create(type=OperationType.WITHDRAWAL)
+    op.transactions.create(account=acc, amount=-10)
+    op.transactions.create(account=payment, amount=10)
+    with pytest.raises(AccountBalanceException) as exc_info:
+        op.is_valid()
+    assert exc_info.value.account == acc
+
+
+@pytest.mark.django_db
+def test_references_denormalized():
+    asset = Asset.objects.create(name='Tmp', symbol='XYZ')
+    user_account = Account.objects.create(type=AccountType.TYPE_ACTIVE, strict=False, asset=asset)
+    payment_account = Account.objects.create(
+        type=AccountType.TYPE_NORMAL, strict=False, asset=asset
+    )
+    bank_account_uuid = str(uuid4())
+
+    deposit = Operation.objects.create_deposit(
+        payment_method_account=payment_account,
+        user_account=user_account,
+        amount=10,
+        references={'reference_code': 'DEPOSIT-123', 'user_bank_account_uuid': bank_account_uuid},
+    )
+    deposit.commit()
+    refund = Operation.objects.create_refund(amount=5, deposit=deposit)
+    operation = Operation.objects.create(
+        type=OperationType.CORRECTION, references={'deposit': 'bad'}
+    )
+    unknown = Operation.objects.create(
+        type=OperationType.CORRECTION, references={'deposit': str(uuid4())}
+    )
+
+    assert Operation.objects.get(reference_code='DEPOSIT-123') == deposit
+    assert str(Operation.objects.get(pk=deposit.pk).user_bank_account_uuid) == bank_account_uuid
+    assert Operation.objects.get(pk=refund.pk).refunded_deposit == deposit
+    assert Operation.objects.get(pk=deposit.pk).refund == refund
+    assert operation.refunded_deposit_id is None
+    assert unknown.refunded_deposit_id is None
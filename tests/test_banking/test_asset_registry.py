@@ -0,0 +1,59 @@
+import pytest
+from django.core.cache import cache
+
+from django_banking.models import Asset
+from django_banking.models.accounts.enum import AccountType
+from django_banking.models.accounts.models import Account
+from django_banking.models.assets.enum import AssetType
+from django_banking.models.assets.registry import (
+    AssetRegistry,
+    asset_registry
+)
+
+
+@pytest.mark.django_db
+def test_asset_registry(full_verified_user, django_assert_num_queries):
+    usd = Asset.objects.get(symbol='USD')
+    account = Account.objects.create(asset=usd, type=AccountType.TYPE_NORMAL, strict=False)
+    account = Account.objects.get(pk=account.pk)
+    asset_registry.all()
+    full_verified_user.get_residency_country_code()
+
+    with django_assert_num_queries(0):
+        assert asset_registry.get(str(usd.pk)) == usd
+        assert asset_registry.get_by_symbol('USD') == usd
+        assert Asset.objects.main_fiat_for_customer(full_verified_user) == usd
+        assert usd in Asset.objects.for_customer(full_verified_user)
+        assert str(account) == 'Account(asset=USD)'
+
+    with pytest.raises(Asset.DoesNotExist):
+        asset_registry.get('not uuid')
+
+    # changed by other process
+    cache.set(asset_registry.version_cache_key, 'other')
+    with django_assert_num_queries(1):
+        asset_registry.get_by_symbol('USD')
+        asset_registry.get_by_symbol('USD')
+
+    # changing transaction sees its own changes only
+    asset = Asset.objects.create(name='Fiat', symbol='FIA', type=AssetType.FIAT)
+    assert asset_registry.get_by_symbol('FIA') == asset
+    assert asset in asset_registry.filter(AssetType.FIAT, [None])
+
+
+@pytest.mark.django_db
+def test_asset_registry_invalidated_by_other_process(django_assert_num_queries):
+    cache.clear()
+    assert asset_registry.get_by_symbol('USD').name != 'Dollar'
+
+    # registry of other process with nothing loaded yet
+    other_registry = AssetRegistry()
+    Asset.objects.filter(symbol='USD').update(name='Dollar')
+    other_registry.invalidate()
+
+    with django_assert_num_queries(1):
+        assert asset_registry.get_by_symbol('USD').name == 'Dollar'
+        assert asset_registry.get_by_symbol('USD').name == 'Dollar'
+
+    # don't leak rolled back change to other tests
+    asset_registry.invalidate()
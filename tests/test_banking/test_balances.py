@@ -0,0 +1,147 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import (
+    CommandError,
+    call_command
+)
+from django.utils.timezone import now
+
+from django_banking.exceptions import OperationException
+from django_banking.models import (
+    Account,
+    AccountBalance,
+    BalanceCheckpoint,
+    Operation
+)
+from django_banking.models.accounts.enum import AccountType
+from django_banking.models.transactions.enum import OperationType
+
+
+@pytest.fixture()
+def accounts(asset_factory):
+    asset = asset_factory()
+    user_account = Account.objects.create(
+        type=AccountType.TYPE_ACTIVE, strict=False, asset=asset
+    )
+    payment_account = Account.objects.create(
+        type=AccountType.TYPE_NORMAL, strict=False, asset=asset
+    )
+    return user_account, payment_account
+
+
+def create_operation(type_, debit, credit, amount):
+    op = Operation.objects.create(type=type_)
+    op.transactions.create(account=debit, amount=amount)
+    op.transactions.create(account=credit, amount=-amount)
+    return op
+
+
+def get_balance(account):
+    return AccountBalance.objects.get(account=account)
+
+
+@pytest.mark.django_db
+def test_balance_follows_operation_status(accounts):
+    user_account, payment_account = accounts
+    deposit = create_operation(OperationType.DEPOSIT, user_account, payment_account, 10)
+    assert not AccountBalance.objects.filter(account=user_account).exists()
+    assert user_account.calculate_balance() == 10
+    assert user_account.calculate_balance(include_new=False) == 0
+
+    deposit.hold()
+    balance = get_balance(user_account)
+    assert (balance.hold, balance.committed, balance.available) == (10, 0, 0)
+
+    deposit.commit()
+    balance = get_balance(user_account)
+    assert (balance.hold, balance.committed, balance.available) == (0, 10, 10)
+    assert get_balance(payment_account).committed == -10
+
+    withdrawal = create_operation(OperationType.WITHDRAWAL, payment_account, user_account, 4)
+    withdrawal.hold()
+    balance = get_balance(user_account)
+    assert (balance.hold, balance.committed, balance.available) == (-4, 10, 6)
+    assert user_account.calculate_balance() == 6
+
+    withdrawal.cancel()
+    balance = get_balance(user_account)
+    assert (balance.hold, balance.committed, balance.available) == (0, 10, 10)
+
+    withdrawal.cancel()
+    assert get_balance(user_account).available == 10
+
+    assert Account.objects.with_balances().get(pk=user_account.pk).balance == 10
+    assert AccountBalance.objects.check_consistency() == []
+
+
+@pytest.mark.django_db
+def test_reject_removes_held_amount(accounts):
+    user_account, payment_account = accounts
+    deposit = create_operation(OperationType.DEPOSIT, user_account, payment_account, 10)
+    deposit.hold()
+    deposit.reject('test')
+    balance = get_balance(user_account)
+    assert (balance.hold, balance.committed, balance.available) == (0, 0, 0)
+    assert Operation.objects.get(pk=deposit.pk).references['reject_reason'] == 'test'
+
+
+@pytest.mark.django_db
+def test_rebuild_and_check_consistency(accounts):
+    user_account, payment_account = accounts
+    deposit = create_operation(OperationType.DEPOSIT, user_account, payment_account, 10)
+    deposit.hold()
+    deposit.commit()
+
+    AccountBalance.objects.filter(account=user_account).update(committed=0, available=Decimal(3))
+    mismatches = AccountBalance.objects.check_consistency()
+    assert {(m.field, m.stored, m.actual) for m in mismatches} == {
+        ('committed', 0, 10),
+        ('available', 3, 10),
+    }
+    with pytest.raises(CommandError):
+        call_command('rebuild_account_balances', '--check')
+
+    call_command('rebuild_account_balances', '--account', str(user_account.pk))
+    assert AccountBalance.objects.check_consistency() == []
+    assert get_balance(user_account).available == 10
+    assert get_balance(payment_account).committed == -10
+
+
+@pytest.mark.django_db
+def test_balance_checkpoints(accounts):
+    user_account, payment_account = accounts
+    deposit = create_operation(OperationType.DEPOSIT, user_account, payment_account, 10)
+    deposit.hold()
+    deposit.commit()
+    held = create_operation(OperationType.WITHDRAWAL, payment_account, user_account, 3)
+    held.hold()
+
+    assert BalanceCheckpoint.objects.roll_forward(cutoff=now()) == 2
+    assert BalanceCheckpoint.objects.roll_forward(cutoff=now() - timedelta(days=1)) == 0
+    checkpoint = BalanceCheckpoint.objects.get(account=user_account)
+    assert (checkpoint.committed, checkpoint.available) == (10, 10)
+
+    with pytest.raises(OperationException):
+        deposit.cancel()
+    # later saves of finalized operation don't move it into the next window
+    deposit.description = 'edited'
+    deposit.save()
+
+    held.commit()
+    deposit = create_operation(OperationType.DEPOSIT, user_account, payment_account, 5)
+    deposit.hold()
+    deposit.commit()
+    assert BalanceCheckpoint.objects.roll_forward(cutoff=now()) == 2
+    checkpoint = BalanceCheckpoint.objects.latest_for_accounts([user_account]).get()
+    assert (checkpoint.committed, checkpoint.available) == (12, 12)
+
+    create_operation(OperationType.WITHDRAWAL, payment_account, user_account, 1).hold()
+    balances = BalanceCheckpoint.objects.calculate_balances()
+    assert balances[user_account.pk] == {
+        'hold': -1,
+        'committed': 12,
+        'available': 11,
+    }
+    assert AccountBalance.objects.check_consistency() == []
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.db import (
+    connection,
+    transaction
+)
+from rest_framework import status
+from rest_framework.test import (
+    APIRequestFactory,
+    force_authenticate
+)
+
+from django_banking.contrib.crypto.api.views import CryptoAccountDepositAPIView
+from django_banking.contrib.crypto.exceptions import AddressPoolExhausted
+from django_banking.contrib.crypto.managers import (
+    address_pool_refill_cache_key
+)
+from django_banking.contrib.crypto.models import UserCryptoDepositAccount
+from django_banking.contrib.crypto.tasks import refill_address_pool_task
+from tests.factories import VerifiedUser
+
+from .factories.dajngo_banking import AssetFactory
+
+
+def generate_addresses(asset, count):
+    return [f'0x{asset.symbol}{n}' for n in range(count)]
+
+
+@pytest.fixture
+def refill_task(mocker):
+    return mocker.patch('django_banking.contrib.crypto.tasks.refill_address_pool_task.delay')
+
+
+@pytest.fixture
+def asset():
+    asset = AssetFactory()
+    cache.delete(address_pool_refill_cache_key(asset.pk))
+    return asset
+
+
+@pytest.mark.django_db
+def test_address_allocation(asset, refill_task):
+    UserCryptoDepositAccount.objects.add_addresses(asset, ['0x1', '0x2', '0x2'])
+    user = VerifiedUser.create()
+
+    deposit_account = UserCryptoDepositAccount.objects.for_customer(user, asset)
+    assert deposit_account.user == user
+    assert deposit_account.asset == asset
+    assert UserCryptoDepositAccount.objects.for_customer(user, asset) == deposit_account
+    assert UserCryptoDepositAccount.objects.free(asset).count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_locked_address_skipped(asset, refill_task):
+    UserCryptoDepositAccount.objects.add_addresses(asset, ['0x1', '0x2'])
+    user = VerifiedUser.create()
+    locked, released = threading.Event(), threading.Event()
+    locked_addresses = []
+
+    def allocate_concurrently():
+        try:
+            with transaction.atomic():
+                free = UserCryptoDepositAccount.objects.free(asset)
+                locked_addresses.append(free.select_for_update().first().address)
+                locked.set()
+                released.wait(10)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=allocate_concurrently)
+    thread.start()
+    try:
+        assert locked.wait(10)
+        deposit_account = UserCryptoDepositAccount.objects.allocate(user, asset)
+    finally:
+        released.set()
+        thread.join()
+    assert deposit_account.address not in locked_addresses
+
+
+@pytest.mark.django_db(transaction=True)
+def test_address_pool_refill(asset, refill_task, mocker):
+    mocker.patch('django_banking.contrib.crypto.managers.CRYPTO_ADDRESS_POOL_LOW_WATER_MARK', 2)
+    mocker.patch('django_banking.contrib.crypto.managers.CRYPTO_ADDRESS_POOL_SIZE', 3)
+    mocker.patch(
+        'django_banking.contrib.crypto.managers.CRYPTO_ADDRESS_GENERATOR',
+        f'{__name__}.generate_addresses',
+    )
+    UserCryptoDepositAccount.objects.add_addresses(asset, ['0x1', '0x2'])
+
+    UserCryptoDepositAccount.objects.for_customer(VerifiedUser.create(), asset)
+    refill_task.assert_called_once_with(asset_id=str(asset.pk))
+
+    # refill is enqueued once until it's done
+    UserCryptoDepositAccount.objects.for_customer(VerifiedUser.create(), asset)
+    with pytest.raises(AddressPoolExhausted):
+        UserCryptoDepositAccount.objects.for_customer(VerifiedUser.create(), asset)
+    assert refill_task.call_count == 1
+
+    refill_address_pool_task(asset_id=str(asset.pk))
+    assert UserCryptoDepositAccount.objects.free(asset).count() == 3
+    for _ in range(2):
+        UserCryptoDepositAccount.objects.for_customer(VerifiedUser.create(), asset)
+    assert refill_task.call_count == 2
+
+
+@pytest.mark.django_db
+def test_deposit_address_unavailable(asset, refill_task):
+    request = APIRequestFactory().get('/')
+    force_authenticate(request, VerifiedUser.create())
+    response = CryptoAccountDepositAPIView.as_view()(request, asset_id=asset.pk)
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
@@ -0,0 +1,121 @@
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+
+from django_banking.contrib.crypto.ingestion import (
+    CryptoDepositEvent,
+    IngestionResult,
+    ingest_deposit_events,
+    settle_pending_transfers
+)
+from django_banking.contrib.crypto.managers import (
+    address_pool_refill_cache_key
+)
+from django_banking.contrib.crypto.models import (
+    CryptoDepositTransfer,
+    UserCryptoDepositAccount
+)
+from django_banking.core.prices import PriceSnapshot
+from django_banking.models import (
+    Asset,
+    UserAccount
+)
+from django_banking.models.assets.enum import AssetType
+from tests.factories import VerifiedUser
+
+from .factories.dajngo_banking import AssetFactory
+
+prices = PriceSnapshot([])
+
+
+def event(address, tx_hash, amount='1', confirmations=6):
+    return CryptoDepositEvent(
+        address=address, tx_hash=tx_hash, amount=Decimal(amount), confirmations=confirmations,
+    )
+
+
+def get_balance(user, asset):
+    return UserAccount.objects.for_customer(user, asset).calculate_balance()
+
+
+@pytest.fixture(autouse=True)
+def refill_task(mocker):
+    return mocker.patch('django_banking.contrib.crypto.tasks.refill_address_pool_task.delay')
+
+
+@pytest.fixture
+def settle_task(mocker):
+    return mocker.patch('django_banking.contrib.crypto.tasks.settle_pending_deposits_task.delay')
+
+
+@pytest.fixture
+def asset():
+    if not Asset.objects.filter(type=AssetType.FIAT, country=None).exists():
+        # flushed by transactional tests, deposits are valued in main fiat asset
+        AssetFactory(type=AssetType.FIAT, country=None)
+    asset = AssetFactory()
+    cache.delete(address_pool_refill_cache_key(asset.pk))
+    UserCryptoDepositAccount.objects.add_addresses(asset, ['0x1'])
+    return asset
+
+
+@pytest.mark.django_db
+def test_ingest_batches_deduplicated(asset):
+    user = VerifiedUser.create()
+    address = UserCryptoDepositAccount.objects.for_customer(user, asset).address
+    events = [
+        event(address, 'tx1', '1'),
+        event(address, 'tx1', '1'),
+        event(address, 'tx2', '2'),
+        event(address, 'tx3', '4'),
+        event(address, 'tx4', '8', confirmations=1),
+    ]
+
+    result = ingest_deposit_events(events, prices=prices, batch_size=2)
+    assert result == IngestionResult(created=3, duplicated=1, unconfirmed=1)
+    assert get_balance(user, asset) == Decimal(7)
+    assert CryptoDepositTransfer.objects.count() == 3
+    assert not CryptoDepositTransfer.objects.pending().exists()
+
+    # events are replayed by watcher
+    result = ingest_deposit_events(events, prices=prices)
+    assert result == IngestionResult(duplicated=4, unconfirmed=1)
+    assert get_balance(user, asset) == Decimal(7)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unbound_address_settled_once_bound(asset, settle_task):
+    result = ingest_deposit_events(
+        [event('0x1', 'tx1', '1'), event('0x1', 'tx2', '2'), event('0xunknown', 'tx3', '4')],
+        prices=prices,
+    )
+    assert result == IngestionResult(unknown=3)
+    assert CryptoDepositTransfer.objects.pending().count() == 3
+    assert settle_pending_transfers(prices=prices) == 0
+
+    user = VerifiedUser.create()
+    deposit_account = UserCryptoDepositAccount.objects.for_customer(user, asset)
+    assert deposit_account.address == '0x1'
+    settle_task.assert_called_once_with(address='0x1')
+
+    assert settle_pending_transfers(addresses=['0x1'], prices=prices) == 2
+    assert get_balance(user, asset) == Decimal(3)
+    assert list(
+        CryptoDepositTransfer.objects.pending().values_list('address', flat=True)
+    ) == ['0xunknown']
+    assert settle_pending_transfers(prices=prices) == 0
+
+
+@pytest.mark.django_db
+def test_pending_settled_on_ingestion(asset, settle_task, mocker):
+    mocker.patch('django_banking.contrib.crypto.ingestion.CRYPTO_DEPOSIT_BATCH_SIZE', 1)
+    ingest_deposit_events(
+        [event('0x1', 'tx1', '1'), event('0x1', 'tx2', '2')], prices=prices,
+    )
+    user = VerifiedUser.create()
+    UserCryptoDepositAccount.objects.for_customer(user, asset)
+
+    result = ingest_deposit_events([event('0x1', 'tx3', '4')], prices=prices)
+    assert result == IngestionResult(created=1, settled=2)
+    assert get_balance(user, asset) == Decimal(7)
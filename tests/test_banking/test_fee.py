@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+import pytest
+
+from django_banking.models import (
+    Asset,
+    Fee
+)
+from django_banking.models.fee.enum import (
+    FeeOperationType,
+    FeeValueType
+)
+from django_banking.models.fee.schedule import FeeSchedule
+from django_banking.models.fee.utils import (
+    calculate_fee,
+    calculate_fees
+)
+
+
+@pytest.mark.django_db
+def test_calculate_fees(django_assert_num_queries):
+    usd = Asset.objects.get(symbol='USD')
+    other = Asset.objects.create(name='Other', symbol='OTH', decimals=2)
+    Fee.objects.create(
+        operation_type=FeeOperationType.WITHDRAWAL_BANK_ACCOUNT,
+        asset=None,
+        value_type=FeeValueType.CONSTANT,
+        value=Decimal(5),
+    )
+    Fee.objects.create(
+        operation_type=FeeOperationType.WITHDRAWAL_BANK_ACCOUNT,
+        asset=usd,
+        value_type=FeeValueType.PERCENTAGE,
+        value=Decimal('0.01'),
+    )
+    usd.decimals = 2
+
+    fees = calculate_fees(
+        [Decimal('10.99'), Decimal(200)], usd, FeeOperationType.WITHDRAWAL_BANK_ACCOUNT
+    )
+    assert [fee.rounded for fee in fees] == [Decimal('0.10'), Decimal('2.00')]
+    assert fees[0].remainder == Decimal('0.0099')
+    assert calculate_fee(Decimal(10), other, FeeOperationType.WITHDRAWAL_BANK_ACCOUNT).rounded == 5
+
+    with pytest.raises(Fee.DoesNotExist):
+        calculate_fee(Decimal(10), usd, FeeOperationType.DEPOSIT_CARD)
+
+    # uncommitted schedule is read from db, but still once per batch
+    with django_assert_num_queries(1):
+        calculate_fees([Decimal(1)] * 10, usd, FeeOperationType.WITHDRAWAL_BANK_ACCOUNT)
+
+
+@pytest.mark.django_db
+def test_fee_schedule_invalidated_in_other_process():
+    usd = Asset.objects.get(symbol='USD')
+    fee = Fee.objects.create(
+        operation_type=FeeOperationType.DEPOSIT_CARD,
+        asset=None,
+        value_type=FeeValueType.CONSTANT,
+        value=Decimal(5),
+    )
+    # schedule of other process loaded before fee is changed in admin
+    other_schedule = FeeSchedule()
+    assert other_schedule.get(FeeOperationType.DEPOSIT_CARD, usd).value == 5
+
+    fee.value = Decimal(7)
+    fee.save()
+    assert other_schedule.get(FeeOperationType.DEPOSIT_CARD, usd).value == 7
@@ -0,0 +1,69 @@
+import threading
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+
+from django_banking.exceptions import AccountBalanceException
+from django_banking.models import (
+    Account,
+    AccountBalance,
+    Asset,
+    Operation
+)
+from django_banking.models.accounts.enum import AccountType
+from django_banking.models.transactions.enum import OperationType
+from django_banking.models.transactions.posting import Posting
+
+
+def run_in_parallel(func, count):
+    barrier = threading.Barrier(count)
+    results = []
+
+    def target(index):
+        try:
+            barrier.wait()
+            results.append(func(index))
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=target, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_withdrawals_do_not_overdraw():
+    asset = Asset.objects.create(name='Tmp', symbol='XYZ')
+    payment = Account.objects.create(type=AccountType.TYPE_NORMAL, strict=False, asset=asset)
+    user_accounts = [
+        Account.objects.create(type=AccountType.TYPE_ACTIVE, strict=False, asset=asset)
+        for _ in range(2)
+    ]
+    deposits = Operation.objects.post([
+        Posting(type=OperationType.DEPOSIT).add(payment, -100).add(account, 100)
+        for account in user_accounts
+    ])
+    for deposit in deposits:
+        deposit.commit()
+
+    def withdraw(account):
+        try:
+            Operation.objects.create_withdrawal(
+                user_account=account,
+                payment_method_account=payment,
+                amount=Decimal(30),
+            )
+            return account.pk
+        except AccountBalanceException:
+            return None
+
+    results = run_in_parallel(lambda index: withdraw(user_accounts[index % 2]), 16)
+
+    for account in user_accounts:
+        assert results.count(account.pk) == 3
+        assert account.calculate_balance() == 10
+    assert AccountBalance.objects.check_consistency() == []
@@ -0,0 +1,153 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+from django_banking.models import (
+    AccountBalance,
+    BalanceCheckpoint
+)
+
+
+@pytest.fixture
+def migrator(transactional_db):
+    """Migrate `django_banking` to the given node and return its historical apps.
+
+    The database is migrated back to the latest state after the test.
+    """
+    def migrate(name):
+        target = [('django_banking', name)]
+        executor = MigrationExecutor(connection)
+        executor.migrate(target)
+        executor.loader.build_graph()
+        return executor.loader.project_state(target).apps
+
+    yield migrate
+
+    executor = MigrationExecutor(connection)
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+
+def test_operation_summary_backfill(migrator, user_confirmed_email):
+    apps = migrator('0007_balance_checkpoint')
+    Asset = apps.get_model('django_banking', 'Asset')
+    Account = apps.get_model('django_banking', 'Account')
+    UserAccount = apps.get_model('django_banking', 'UserAccount')
+    Operation = apps.get_model('django_banking', 'Operation')
+    Transaction = apps.get_model('django_banking', 'Transaction')
+
+    asset = Asset.objects.create(name='Fiat', symbol='FIA', type='fiat')
+    user_account = Account.objects.create(type='active', strict=False, asset=asset)
+    payment_account = Account.objects.create(type='normal', strict=False, asset=asset)
+    UserAccount.objects.create(user_id=user_confirmed_email.pk, account=user_account)
+    deposit = Operation.objects.create(type='deposit', status='committed')
+    Transaction.objects.create(operation=deposit, account=payment_account, amount=Decimal(-10))
+    Transaction.objects.create(operation=deposit, account=user_account, amount=Decimal(10))
+
+    apps = migrator('0010_operation_summary_history')
+    OperationSummary = apps.get_model('django_banking', 'OperationSummary')
+    summary = OperationSummary.objects.get(operation_id=deposit.pk)
+    assert summary.user_id == user_confirmed_email.pk
+    assert summary.debit_amount == 10
+    assert summary.created_at == deposit.created_at
+
+
+def test_user_account_duplicates_merge(migrator, user_confirmed_email):
+    apps = migrator('0011_user_account_asset')
+    Asset = apps.get_model('django_banking', 'Asset')
+    Account = apps.get_model('django_banking', 'Account')
+    UserAccount = apps.get_model('django_banking', 'UserAccount')
+    Operation = apps.get_model('django_banking', 'Operation')
+    Transaction = apps.get_model('django_banking', 'Transaction')
+    HistoricalAccountBalance = apps.get_model('django_banking', 'AccountBalance')
+
+    asset = Asset.objects.create(name='Fiat', symbol='FIA', type='fiat')
+    payment_account = Account.objects.create(type='normal', strict=False, asset=asset)
+    unused, used, also_used = [
+        UserAccount.objects.create(
+            user_id=user_confirmed_email.pk,
+            account=Account.objects.create(type='active', strict=False, asset=asset),
+            asset=asset,
+        )
+        for _ in range(3)
+    ]
+    for relation, amount in ((used, 10), (used, 5), (also_used, 1)):
+        deposit = Operation.objects.create(type='deposit', status='committed')
+        Transaction.objects.create(operation=deposit, account=payment_account, amount=-amount)
+        Transaction.objects.create(operation=deposit, account=relation.account, amount=amount)
+    for account, amount in ((used.account, 15), (also_used.account, 1), (payment_account, -16)):
+        HistoricalAccountBalance.objects.create(
+            account=account, committed=amount, available=amount
+        )
+
+    apps = migrator('0012_user_account_unique_asset')
+    UserAccount = apps.get_model('django_banking', 'UserAccount')
+    Transaction = apps.get_model('django_banking', 'Transaction')
+    HistoricalAccountBalance = apps.get_model('django_banking', 'AccountBalance')
+    relation = UserAccount.objects.get(user_id=user_confirmed_email.pk, asset_id=asset.pk)
+    assert relation.pk == used.pk
+    assert Transaction.objects.filter(account_id=relation.account_id).count() == 3
+    assert HistoricalAccountBalance.objects.get(account_id=relation.account_id).committed == 16
+
+
+def test_user_account_duplicates_merge_checkpoints(migrator, user_confirmed_email):
+    apps = migrator('0011_user_account_asset')
+    Asset = apps.get_model('django_banking', 'Asset')
+    Account = apps.get_model('django_banking', 'Account')
+    UserAccount = apps.get_model('django_banking', 'UserAccount')
+    Operation = apps.get_model('django_banking', 'Operation')
+    Transaction = apps.get_model('django_banking', 'Transaction')
+    HistoricalAccountBalance = apps.get_model('django_banking', 'AccountBalance')
+    HistoricalBalanceCheckpoint = apps.get_model('django_banking', 'BalanceCheckpoint')
+
+    asset = Asset.objects.create(name='Fiat', symbol='FIA', type='fiat')
+    payment_account = Account.objects.create(type='normal', strict=False, asset=asset)
+    used, also_used = [
+        UserAccount.objects.create(
+            user_id=user_confirmed_email.pk,
+            account=Account.objects.create(type='active', strict=False, asset=asset),
+            asset=asset,
+        )
+        for _ in range(2)
+    ]
+    cutoff = timezone.now() - timedelta(hours=1)
+    deposits = (
+        (used, 10, cutoff - timedelta(hours=1)),
+        (used, 5, timezone.now()),
+        (also_used, 1, cutoff - timedelta(hours=2)),
+    )
+    for relation, amount, finalized_at in deposits:
+        deposit = Operation.objects.create(type='deposit', status='committed')
+        Operation.objects.filter(pk=deposit.pk).update(updated_at=finalized_at)
+        Transaction.objects.create(operation=deposit, account=payment_account, amount=-amount)
+        Transaction.objects.create(operation=deposit, account=relation.account, amount=amount)
+    for account, amount in ((used.account, 15), (also_used.account, 1), (payment_account, -16)):
+        HistoricalAccountBalance.objects.create(
+            account=account, committed=amount, available=amount
+        )
+    # merged account latest checkpoint is older, but valid for the latest cutoff too
+    for account, amount, checkpoint_cutoff in (
+        (used.account, 10, cutoff),
+        (payment_account, -11, cutoff),
+        (also_used.account, 1, cutoff - timedelta(hours=1)),
+    ):
+        HistoricalBalanceCheckpoint.objects.create(
+            account=account, cutoff=checkpoint_cutoff, committed=amount, available=amount
+        )
+
+    apps = migrator('0012_user_account_unique_asset')
+    HistoricalBalanceCheckpoint = apps.get_model('django_banking', 'BalanceCheckpoint')
+    checkpoint = HistoricalBalanceCheckpoint.objects.get(account_id=used.account_id, cutoff=cutoff)
+    assert (checkpoint.committed, checkpoint.available) == (11, 11)
+    assert not HistoricalBalanceCheckpoint.objects.filter(account_id=also_used.account_id).exists()
+
+    migrator('0017_operation_finalized_at')
+    balance = AccountBalance.objects.get(account_id=used.account_id)
+    assert (balance.hold, balance.committed, balance.available) == (0, 16, 16)
+    assert not AccountBalance.objects.filter(account_id=also_used.account_id).exists()
+    assert AccountBalance.objects.check_consistency() == []
+    assert BalanceCheckpoint.objects.roll_forward(timezone.now() + timedelta(minutes=1)) == 2
+    assert AccountBalance.objects.check_consistency() == []
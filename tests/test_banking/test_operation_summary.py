@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+import pytest
+
+from django_banking.contrib.wire_transfer.models import (
+    DepositWireTransferOperation
+)
+from django_banking.models import (
+    Account,
+    Asset,
+    Operation,
+    OperationSummary,
+    PaymentOperation,
+    UserAccount
+)
+from django_banking.models.accounts.enum import AccountType
+from django_banking.models.accounts.models import UserFeeAccount
+from django_banking.models.assets.enum import AssetType
+from django_banking.models.transactions.enum import OperationType
+
+
+@pytest.mark.django_db
+def test_operation_summary(user_confirmed_email):
+    user = user_confirmed_email
+    fiat = Asset.objects.create(name='Fiat', symbol='FIA', type=AssetType.FIAT)
+    crypto = Asset.objects.create(name='Crypto', symbol='CRY', type=AssetType.CRYPTO)
+    fiat_account = UserAccount.objects.for_customer(user, fiat)
+    crypto_account = UserAccount.objects.for_customer(user, crypto)
+    fee_account = UserFeeAccount.objects.for_customer(user, fiat)
+    payment_account, fiat_exchange, crypto_exchange = [
+        Account.objects.create(type=AccountType.TYPE_NORMAL, strict=False, asset=asset)
+        for asset in (fiat, fiat, crypto)
+    ]
+
+    deposit = Operation.objects.create_deposit(
+        payment_method_account=payment_account,
+        user_account=fiat_account,
+        amount=Decimal(100),
+        fee_account=fee_account,
+        fee_amount=Decimal(5),
+        references={'user_bank_account_uuid': '1234'},
+    )
+    deposit.commit()
+    summary = OperationSummary.objects.get(operation=deposit)
+    assert summary.user == user
+    assert (summary.debit_amount, summary.debit_asset) == (95, fiat)
+    assert (summary.credit_amount, summary.credit_asset) == (95, fiat)
+    assert (summary.fee_amount, summary.fee_asset) == (5, fiat)
+
+    buy = Operation.objects.create_exchange(
+        base_account=crypto_account,
+        base_exchange_account=crypto_exchange,
+        quote_account=fiat_account,
+        quote_exchange_account=fiat_exchange,
+        fee_account=fee_account,
+        base_amount=Decimal(2),
+        quote_amount=Decimal(-40),
+        fee_amount=Decimal(1),
+    )
+    summary = OperationSummary.objects.get(operation=buy)
+    assert (summary.debit_amount, summary.debit_asset) == (2, crypto)
+    assert (summary.credit_amount, summary.credit_asset) == (41, fiat)
+    assert (summary.fee_amount, summary.fee_asset) == (1, fiat)
+
+    assert (deposit.asset_type, buy.asset_type) == (AssetType.FIAT, None)
+    assert list(DepositWireTransferOperation.objects.all()) == [deposit]
+    assert set(PaymentOperation.objects.for_user(user, only_allowed_assets=False)) == {deposit, buy}
+
+    operations = PaymentOperation.objects.with_amounts(user).order_by('created_at')
+    assert [(op.pk, op.debit_asset, op.credit_asset_id) for op in operations] == [
+        (deposit.pk, 'FIA', fiat.pk),
+        (buy.pk, 'CRY', fiat.pk),
+    ]
+
+    # operations created without posting get summary on hold
+    manual = Operation.objects.create(type=OperationType.WITHDRAWAL)
+    manual.transactions.create(account=fiat_account, amount=-10)
+    manual.transactions.create(account=payment_account, amount=10)
+    assert not OperationSummary.objects.filter(operation=manual).exists()
+    manual.hold()
+    summary = OperationSummary.objects.get(operation=manual)
+    assert Operation.objects.get(pk=manual.pk).asset_type == AssetType.FIAT
+    assert (summary.credit_amount, summary.fee_amount, summary.fee_asset) == (10, 0, None)
@@ -0,0 +1,109 @@
+from datetime import (
+    date,
+    datetime,
+    timedelta
+)
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils.timezone import (
+    now,
+    utc
+)
+
+from django_banking.models import (
+    Account,
+    AccountBalance,
+    BalanceCheckpoint,
+    Operation,
+    OperationSummary,
+    Transaction
+)
+from django_banking.models.accounts.enum import AccountType
+from django_banking.models.transactions.enum import OperationType
+from django_banking.models.transactions.exceptions import (
+    OperationArchivedException
+)
+from django_banking.models.transactions.partitions import (
+    archive_partitions,
+    get_archive_bound,
+    get_partitions,
+    month_start,
+    partition_name
+)
+from django_banking.settings import TRANSACTION_ARCHIVE_SCHEMA
+from tests.factories import VerifiedUser
+
+
+def test_month_start():
+    assert month_start(date(2020, 1, 31)) == date(2020, 1, 1)
+    assert month_start(date(2020, 1, 31), -1) == date(2019, 12, 1)
+    assert month_start(date(2020, 11, 2), 14) == date(2022, 1, 1)
+
+
+@pytest.mark.django_db
+def test_transaction_partitions(asset_factory):
+    asset = asset_factory()
+    user_account = Account.objects.create(type=AccountType.TYPE_ACTIVE, strict=False, asset=asset)
+    payment_account = Account.objects.create(
+        type=AccountType.TYPE_NORMAL, strict=False, asset=asset
+    )
+
+    def deposit(amount, created_at):
+        operation = Operation.objects.create(type=OperationType.DEPOSIT)
+        operation.transactions.create(account=user_account, amount=amount)
+        operation.transactions.create(account=payment_account, amount=-amount)
+        operation.hold()
+        operation.commit()
+        Operation.objects.filter(pk=operation.pk).update(
+            created_at=created_at, updated_at=created_at, finalized_at=created_at
+        )
+        operation.transactions.update(created_at=created_at)
+        return operation
+
+    old = datetime(2019, 1, 10, tzinfo=utc)
+    call_command('maintain_transaction_partitions', '--ahead', '1')
+    this_month = month_start(now().date())
+    partitions = get_partitions()
+    assert partition_name(this_month) in partitions
+    assert partition_name(month_start(this_month, 1)) in partitions
+
+    call_command('maintain_transaction_partitions', '--ahead', '1', '--archive-after', '1')
+    assert get_partitions() == partitions
+
+    old_partition = partition_name(date(2019, 1, 1))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE "{old_partition}" PARTITION OF "{Transaction._meta.db_table}" '
+            f"FOR VALUES FROM ('2019-01-01 00:00+00') TO ('2019-02-01 00:00+00')"
+        )
+    archived = deposit(10, old)
+    deposit(5, now())
+    with connection.cursor() as cursor:
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+    # not covered by balance checkpoint yet
+    assert archive_partitions(this_month) == []
+
+    BalanceCheckpoint.objects.roll_forward(cutoff=now() - timedelta(days=1))
+    assert archive_partitions(this_month) == [old_partition]
+    assert not Transaction.objects.filter(operation=archived).exists()
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT sum(amount) FROM "{TRANSACTION_ARCHIVE_SCHEMA}"."{old_partition}"')
+        assert cursor.fetchone() == (0,)
+
+    assert AccountBalance.objects.check_consistency() == []
+    balances = BalanceCheckpoint.objects.calculate_balances([user_account])
+    assert balances[user_account.pk]['committed'] == 15
+
+    # readers of archived operation transactions
+    assert get_archive_bound() == datetime(2019, 2, 1, tzinfo=utc)
+    with pytest.raises(OperationArchivedException):
+        Operation.objects.create_refund(amount=10, deposit=archived)
+    summary = OperationSummary.objects.create(
+        operation=archived, user=VerifiedUser.create(), debit_amount=0, credit_amount=10,
+        fee_amount=0, created_at=old,
+    )
+    OperationSummary.objects.refresh([archived])
+    assert OperationSummary.objects.filter(pk=summary.pk).exists()
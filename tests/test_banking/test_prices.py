@@ -0,0 +1,82 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from django_banking.checks import check_shared_cache
+from django_banking.core.exceptions import PriceUnavailable
+from django_banking.core.prices import (
+    FilePriceSource,
+    PriceRepository
+)
+from django_banking.models import Asset
+from django_banking.models.assets.enum import AssetType
+
+
+@pytest.fixture
+def price_file(tmp_path):
+    path = tmp_path / 'prices.json'
+    path.write_text(json.dumps([
+        {'base': 'BTC', 'quote': 'USD', 'buy': '8000', 'sell': '10000'},
+        {'base': 'UNKNOWN', 'quote': 'USD', 'buy': '1', 'sell': '1'},
+    ]))
+    return path
+
+
+@pytest.mark.django_db
+def test_price_repository(price_file, django_assert_num_queries, mocker):
+    cache.delete(PriceRepository.snapshot_cache_key)
+    cache.delete(PriceRepository.version_cache_key)
+    usd = Asset.objects.get(symbol='USD')
+    btc = Asset.objects.create(name='Bitcoin', symbol='BTC', type=AssetType.CRYPTO)
+    repository = PriceRepository(FilePriceSource(str(price_file)))
+    other_process = PriceRepository()
+
+    with pytest.raises(PriceUnavailable):
+        repository.get(btc.pk, usd.pk)
+
+    snapshot = repository.refresh()
+    assert len(snapshot) == 2
+
+    with django_assert_num_queries(0):
+        price = other_process.get(btc.pk, usd.pk)
+        inverse = other_process.get(usd.pk, btc.pk)
+    assert (price.buy, price.sell) == (Decimal(8000), Decimal(10000))
+    assert (inverse.buy, inverse.sell) == (Decimal('0.0001'), Decimal('0.000125'))
+
+    offer = other_process.make_offer('user', btc.pk, usd.pk)
+    assert repository.get_offer('user', offer.uuid) == offer
+    assert offer.version == snapshot.version
+    with pytest.raises(PriceUnavailable):
+        repository.get_offer('other', offer.uuid)
+
+    # snapshot replaced by next refresh
+    price_file.write_text(json.dumps([
+        {'base': 'BTC', 'quote': 'USD', 'buy': '9000', 'sell': '9500'},
+    ]))
+    repository.refresh()
+    assert other_process.get(btc.pk, usd.pk).sell == Decimal(9500)
+    assert repository.get_offer('user', offer.uuid).price == price
+
+    mocker.patch('django.utils.timezone.now', return_value=offer.expires_at + timedelta(seconds=1))
+    with pytest.raises(PriceUnavailable):
+        repository.get_offer('user', offer.uuid)
+
+    # not refreshed in time
+    cache.delete(PriceRepository.snapshot_cache_key)
+    cache.delete(PriceRepository.version_cache_key)
+    with pytest.raises(PriceUnavailable):
+        other_process.get(btc.pk, usd.pk)
+
+
+def test_shared_cache_check():
+    locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    with override_settings(CACHES=locmem):
+        assert [error.id for error in check_shared_cache(None)] == ['django_banking.E001']
+
+    database = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache'}}
+    with override_settings(CACHES=database):
+        assert check_shared_cache(None) == []
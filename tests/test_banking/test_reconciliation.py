@@ -0,0 +1,54 @@
+import pytest
+from django.core.management import (
+    CommandError,
+    call_command
+)
+
+from django_banking.models import (
+    Account,
+    Operation,
+    Transaction
+)
+from django_banking.models.accounts.enum import AccountType
+from django_banking.models.transactions.enum import (
+    OperationStatus,
+    OperationType
+)
+from django_banking.models.transactions.reconciliation import (
+    LedgerViolationType,
+    reconcile_ledger
+)
+
+
+@pytest.mark.django_db
+def test_reconcile_ledger(asset_factory):
+    asset = asset_factory()
+    active = Account.objects.create(type=AccountType.TYPE_ACTIVE, strict=True, asset=asset)
+    passive = Account.objects.create(type=AccountType.TYPE_PASSIVE, strict=True, asset=asset)
+
+    deposit = Operation.objects.create(type=OperationType.DEPOSIT)
+    deposit.transactions.create(account=active, amount=10)
+    deposit.transactions.create(account=passive, amount=-10)
+    deposit.hold()
+    deposit.commit()
+    call_command('reconcile_ledger')
+
+    # corrupted bypassing validation
+    broken = Operation.objects.create(type=OperationType.WITHDRAWAL)
+    broken.transactions.create(account=active, amount=-15)
+    Operation.objects.filter(pk=broken.pk).update(status=OperationStatus.COMMITTED)
+    Transaction.objects.create(operation=deposit, account=passive, amount=3)
+
+    violations = {
+        (violation.type, violation.operation_id, violation.account_id, violation.amount)
+        for violation in reconcile_ledger(chunk_size=1)
+    }
+    assert violations == {
+        (LedgerViolationType.UNBALANCED_OPERATION, deposit.pk, None, 3),
+        (LedgerViolationType.UNBALANCED_OPERATION, broken.pk, None, -15),
+        (LedgerViolationType.STRICTNESS, broken.pk, active.pk, -15),
+        (LedgerViolationType.STRICTNESS, deposit.pk, passive.pk, 3),
+        (LedgerViolationType.NEGATIVE_ACTIVE_BALANCE, None, active.pk, -5),
+    }
+    with pytest.raises(CommandError):
+        call_command('reconcile_ledger', '--chunk-size', '100')
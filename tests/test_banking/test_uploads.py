@@ -0,0 +1,25 @@
+import base64
+import json
+
+import pytest
+
+from django_banking.storages import AmazonS3Storage
+
+
+@pytest.mark.filterwarnings('ignore::django.utils.deprecation.RemovedInDjango40Warning')
+def test_presigned_post():
+    storage = AmazonS3Storage(
+        access_key='key',
+        secret_key='secret',
+        bucket_name='bucket',
+        region_name='eu-central-1',
+        location='kyc',
+    )
+    url, fields = storage.presigned_post('uuid/passport.pdf', 'application/pdf', 1, 1024, 60)
+
+    assert url == 'https://bucket.s3.amazonaws.com/'
+    assert fields['key'] == 'kyc/uuid/passport.pdf'
+    assert fields['Content-Type'] == 'application/pdf'
+    policy = json.loads(base64.b64decode(fields['policy']))
+    assert {'Content-Type': 'application/pdf'} in policy['conditions']
+    assert ['content-length-range', 1, 1024] in policy['conditions']
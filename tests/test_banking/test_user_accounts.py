@@ -0,0 +1,37 @@
+import pytest
+
+from django_banking.models import (
+    Account,
+    Asset,
+    UserAccount
+)
+from django_banking.models.accounts.models import UserFeeAccount
+from django_banking.models.assets.enum import AssetType
+
+
+@pytest.mark.django_db
+def test_user_accounts_provisioning(full_verified_user, django_assert_max_num_queries):
+    user = full_verified_user
+    for i in range(5):
+        Asset.objects.create(name=f'Crypto{i}', symbol=f'CR{i}', type=AssetType.CRYPTO)
+    assets = Asset.objects.for_customer(user)
+    accounts_count = Account.objects.count()
+
+    with django_assert_max_num_queries(10):
+        accounts = list(UserAccount.objects.get_user_accounts(user))
+    assert {account.asset_id for account in accounts} == {asset.pk for asset in assets}
+    assert Account.objects.count() == accounts_count + len(assets)
+
+    # assets are read from db while transaction changing them isn't finished
+    with django_assert_max_num_queries(3):
+        assert len(UserAccount.objects.get_user_accounts(user)) == len(assets)
+
+    # concurrently created accounts are kept, duplicates dropped
+    assert UserAccount.objects.provision(user, assets) == 0
+    assert Account.objects.count() == accounts_count + len(assets)
+    assert UserAccount.objects.for_customer(user, assets[0]) in accounts
+
+    fee_account = UserFeeAccount.objects.for_customer(user, assets[0])
+    assert fee_account.strict
+    assert fee_account not in accounts
+    assert UserFeeAccount.objects.for_customer(user, assets[0]) == fee_account
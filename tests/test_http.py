@@ -0,0 +1,83 @@
+import threading
+from http.server import (
+    BaseHTTPRequestHandler,
+    HTTPServer
+)
+
+import pytest
+from prometheus_client import REGISTRY
+
+from jibrel.core.http import (
+    IntegrationPoolManager,
+    IntegrationSession,
+    get_pool_manager,
+    get_session
+)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.clients.append(self.client_address)
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    server = HTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.clients = []
+    server.statuses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def count_requests(integration, status):
+    return REGISTRY.get_sample_value(
+        'outbound_http_requests_total',
+        {'integration': integration, 'method': 'GET', 'status': status},
+    ) or 0
+
+
+def test_get_session():
+    assert get_session('twilio') is get_session('twilio')
+    assert get_session('twilio') is not get_session('onfido')
+    assert get_pool_manager('onfido') is get_pool_manager('onfido')
+
+
+def test_session_keep_alive_and_retry(stand_in, settings):
+    settings.OUTBOUND_HTTP_BACKOFF_FACTOR = 0
+    session = IntegrationSession('test')
+    url = f'http://127.0.0.1:{stand_in.server_port}/'
+    before = count_requests('test', '200')
+
+    assert session.get(url).status_code == 200
+    stand_in.statuses = [503]
+    assert session.get(url).status_code == 200
+
+    # the same connection is reused for all requests, including retried one
+    assert len(stand_in.clients) == 3
+    assert len(set(stand_in.clients)) == 1
+    assert count_requests('test', '200') == before + 2
+
+
+def test_pool_manager_keep_alive(stand_in):
+    pool_manager = IntegrationPoolManager('test')
+    url = f'http://127.0.0.1:{stand_in.server_port}/'
+    before = count_requests('test', '200')
+
+    assert pool_manager.request('GET', url).status == 200
+    assert pool_manager.request('GET', url).status == 200
+
+    assert len(set(stand_in.clients)) == 1
+    assert count_requests('test', '200') == before + 2
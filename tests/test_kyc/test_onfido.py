@@ -1,15 +1,24 @@
 import io
+import json
+import threading
+import tracemalloc
 from datetime import (
     date,
     timedelta
 )
+from http.server import (
+    BaseHTTPRequestHandler,
+    HTTPServer
+)
 
 import pytest
+from django.core.files import File
 
 from jibrel.kyc import (
     models,
     tasks
 )
+from jibrel.kyc.onfido.api import OnfidoAPI
 from tests.factories import KYCDocumentFactoryWithFileField
 
 
@@ -31,9 +40,9 @@ def test_enqueue_onfido_routine(celery_worker, user_not_confirmed, mocker):
     onfido_mock = mocker.patch('jibrel.kyc.tasks.onfido_api')
 
     file_mock = mocker.patch('jibrel.core.storages.AmazonS3Storage.save')
-    file_mock2 = mocker.patch('jibrel.core.storages.AmazonS3Storage.open')
+    file_mock2 = mocker.patch('jibrel.core.storages.AmazonS3Storage.open_stream')
     file_mock.return_value = 'abc.pdf'
-    file_mock2.return_value = io.BytesIO()
+    file_mock2.return_value = File(io.BytesIO(), name='abc.pdf')
 
     data = {
             'first_name': 'First name',
@@ -82,7 +91,7 @@ def test_enqueue_onfido_routine(celery_worker, user_not_confirmed, mocker):
         'applicant_id': 'AAA-001',
         'country': 'ARE',
         'document_type': 'passport',
-        'file_path': mocker.ANY
+        'file': file_mock2.return_value
     })
     submission = models.IndividualKYCSubmission.objects.get(pk=submission.pk)
     assert submission.onfido_applicant_id == 'AAA-001'
@@ -91,3 +100,74 @@ def test_enqueue_onfido_routine(celery_worker, user_not_confirmed, mocker):
     assert submission.onfido_report == 'abc.pdf'
 
 # TODO enqueue_onfido_routine_beneficiary
+
+
+class ZeroReader(io.RawIOBase):
+    """Stream of zero bytes generated on read, never held in memory as a whole.
+    """
+
+    def __init__(self, size):
+        self.remaining = size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self.remaining)
+        buffer[:size] = bytes(size)
+        self.remaining -= size
+        return size
+
+
+class OnfidoStandInHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        remaining = int(self.headers['Content-Length'])
+        head = self.rfile.read(min(remaining, 1024))
+        received = len(head)
+        while received < remaining:
+            received += len(self.rfile.read(min(remaining - received, 64 * 1024)))
+        self.server.received.append((self.path, self.headers, head, received))
+        body = json.dumps({'id': 'DOC-1'}).encode()
+        self.send_response(201)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def onfido_stand_in():
+    server = HTTPServer(('127.0.0.1', 0), OnfidoStandInHandler)
+    server.received = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_upload_document_streaming(onfido_stand_in):
+    api = OnfidoAPI(api_key='key', api_url=f'http://127.0.0.1:{onfido_stand_in.server_port}')
+    size = 20 * 1024 * 1024
+    file = File(ZeroReader(size), name='kyc/passport.pdf')
+    file.size = size
+
+    tracemalloc.start()
+    document_id = api.upload_document('APP-1', file, 'passport', 'ARE')
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert document_id == 'DOC-1'
+    path, headers, head, received = onfido_stand_in.received[0]
+    assert path == '/applicants/APP-1/documents'
+    assert headers['Authorization'] == 'Token token=key'
+    assert headers['Content-Type'].startswith('multipart/form-data; boundary=')
+    assert b'name="type"\r\n\r\npassport\r\n' in head
+    assert b'name="issuing_country"\r\n\r\nARE\r\n' in head
+    assert b'filename="passport.pdf"\r\nContent-Type: application/pdf\r\n' in head
+    assert received == int(headers['Content-Length']) > size
+    # whole document is never held in memory
+    assert peak < size / 10
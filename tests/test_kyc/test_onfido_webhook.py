@@ -0,0 +1,144 @@
+import hashlib
+import hmac
+import json
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from jibrel.kyc import tasks
+from jibrel.kyc.models import (
+    BaseKYCSubmission,
+    IndividualKYCSubmission
+)
+from jibrel.kyc.onfido.api import CheckResult
+from tests.factories import ApprovedIndividualKYCFactory
+
+
+class FakeOnfido:
+    def __init__(self):
+        self.checks = {}
+        self.calls = 0
+
+    def get_check_results(self, applicant_id, check_id):
+        self.calls += 1
+        status, result = self.checks[check_id]
+        return CheckResult(status, result, f'https://onfido/{check_id}')
+
+    def download_report(self, url):
+        return b'report data'
+
+
+@pytest.fixture
+def fake_onfido(mocker):
+    fake = FakeOnfido()
+    mocker.patch('jibrel.kyc.tasks.onfido_api', fake)
+    mocker.patch('jibrel.core.storages.AmazonS3Storage.save', return_value='report.pdf')
+    return fake
+
+
+@pytest.fixture
+def pending_submission(user_not_confirmed):
+    def create(check_id):
+        profile = user_not_confirmed.profile
+        return ApprovedIndividualKYCFactory.create(
+            profile=profile,
+            passport_document__profile=profile,
+            proof_of_address_document__profile=profile,
+            status=BaseKYCSubmission.PENDING,
+            onfido_applicant_id='APP-1',
+            onfido_check_id=check_id,
+            onfido_check_created_at=timezone.now(),
+        )
+    return create
+
+
+def post_event(client, event, token='secret'):
+    body = json.dumps(event).encode()
+    return client.post(
+        '/v1/kyc/onfido/webhook',
+        body,
+        content_type='application/json',
+        HTTP_X_SHA2_SIGNATURE=hmac.new(token.encode(), body, hashlib.sha256).hexdigest(),
+    )
+
+
+def check_event(check_id, action='check.completed'):
+    return {
+        'payload': {
+            'resource_type': 'check',
+            'action': action,
+            'object': {
+                'id': check_id,
+                'status': 'complete',
+                'href': f'https://api.onfido.com/v2/applicants/APP-1/checks/{check_id}',
+            },
+        },
+    }
+
+
+@pytest.mark.django_db
+def test_onfido_webhook(client, settings, pending_submission, mocker):
+    settings.ONFIDO_WEBHOOK_TOKEN = 'secret'
+    enqueue = mocker.patch('jibrel.kyc.tasks.onfido_save_check_result_task.delay')
+    submission = pending_submission('C1')
+
+    assert post_event(client, check_event('C1'), token='wrong').status_code == 403
+    assert post_event(client, check_event('C1', action='check.started')).status_code == 200
+    assert post_event(client, check_event('unknown')).status_code == 200
+    assert post_event(client, [check_event('C1')]).status_code == 400
+    assert post_event(client, {'payload': ['check']}).status_code == 200
+    malformed_check = {'payload': {**check_event('C1')['payload'], 'object': 'C1'}}
+    assert post_event(client, malformed_check).status_code == 200
+    enqueue.assert_not_called()
+
+    assert post_event(client, check_event('C1')).status_code == 200
+    enqueue.assert_called_once_with(
+        account_type=BaseKYCSubmission.INDIVIDUAL, kyc_submission_id=submission.pk
+    )
+
+
+@pytest.mark.django_db
+def test_onfido_save_check_result(fake_onfido, pending_submission):
+    submission = pending_submission('C1')
+    fake_onfido.checks['C1'] = ('in_progress', None)
+
+    # not complete check isn't polled with retries
+    tasks.onfido_save_check_result_task.apply(kwargs={
+        'account_type': submission.account_type, 'kyc_submission_id': submission.pk,
+    }).get()
+    assert fake_onfido.calls == 1
+    assert IndividualKYCSubmission.objects.get(pk=submission.pk).onfido_result is None
+
+    fake_onfido.checks['C1'] = ('complete', 'clear')
+    for _ in range(2):
+        tasks.onfido_save_check_result_task.apply(kwargs={
+            'account_type': submission.account_type, 'kyc_submission_id': submission.pk,
+        }).get()
+    assert fake_onfido.calls == 2
+    submission = IndividualKYCSubmission.objects.get(pk=submission.pk)
+    assert submission.onfido_result == 'clear'
+    assert submission.onfido_report == 'report.pdf'
+
+
+@pytest.mark.django_db
+def test_onfido_collect_check_results(pending_submission, mocker, settings):
+    settings.ONFIDO_COLLECT_RESULTS_BATCH_SIZE = 1
+    enqueue = mocker.patch('jibrel.kyc.tasks.onfido_save_check_result_task.delay')
+    stuck = pending_submission('C1')
+    missed = pending_submission('C2')
+    BaseKYCSubmission.objects.filter(pk__in=[stuck.pk, missed.pk]).update(
+        onfido_check_created_at=timezone.now() - timedelta(days=1)
+    )
+    BaseKYCSubmission.objects.filter(pk=stuck.pk).update(
+        onfido_check_created_at=timezone.now() - timedelta(days=2)
+    )
+    pending_submission('C3')
+
+    # submissions collected longest ago go first, so stuck ones don't block others
+    for expected in (stuck, missed, stuck):
+        enqueue.reset_mock()
+        tasks.onfido_collect_check_results_task()
+        enqueue.assert_called_once_with(
+            account_type=BaseKYCSubmission.INDIVIDUAL, kyc_submission_id=expected.pk
+        )
@@ -0,0 +1,139 @@
+import hashlib
+from unittest import mock
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from django_banking.core.uploads import HEAD_SIZE
+from django_banking.storages import ObjectInfo
+from jibrel.kyc.models import KYCDocument
+
+
+def pdf_file(content: bytes):
+    return SimpleUploadedFile('passport.pdf', b'%PDF-1.4\n' + content * 64 * 1024)
+
+
+@pytest.mark.django_db
+def test_upload_document_dedup(client, user_with_confirmed_phone):
+    client.force_login(user_with_confirmed_phone)
+    with mock.patch(
+        'jibrel.core.storages.AmazonS3Storage.save', return_value='passport.pdf'
+    ) as storage:
+        first = client.post('/v1/kyc/document', {'file': pdf_file(b'a')})
+        second = client.post('/v1/kyc/document', {'file': pdf_file(b'a')})
+        other = client.post('/v1/kyc/document', {'file': pdf_file(b'b')})
+    assert (first.status_code, second.status_code, other.status_code) == (200, 200, 200)
+    assert storage.call_count == 2
+
+    first_document = KYCDocument.objects.get(pk=first.data['data']['id'])
+    second_document = KYCDocument.objects.get(pk=second.data['data']['id'])
+    content = b'%PDF-1.4\n' + b'a' * 64 * 1024
+    assert first_document.checksum == hashlib.md5(content).hexdigest()
+    assert first_document.sha256 == hashlib.sha256(content).hexdigest()
+    assert second_document.pk != first_document.pk
+    assert second_document.file.name == first_document.file.name
+
+
+@pytest.mark.django_db
+def test_direct_upload_document(client, user_with_confirmed_phone, full_verified_user, mocker):
+    client.force_login(user_with_confirmed_phone)
+    presigned_post = mocker.patch(
+        'jibrel.core.storages.AmazonS3Storage.presigned_post',
+        return_value=('https://bucket.s3.amazonaws.com/', {'key': 'kyc/passport.pdf'}),
+    )
+    content = b'%PDF-1.4\n' + b'a' * 64 * 1024
+    checksum = hashlib.md5(content).hexdigest()
+    mocker.patch(
+        'jibrel.core.storages.AmazonS3Storage.get_object_info',
+        return_value=ObjectInfo(size=len(content), etag=checksum),
+    )
+    read_head = mocker.patch(
+        'jibrel.core.storages.AmazonS3Storage.read_head',
+        side_effect=lambda name, size: content[:size],
+    )
+    open_ = mocker.patch('jibrel.core.storages.AmazonS3Storage.open')
+    delete = mocker.patch('jibrel.core.storages.AmazonS3Storage.delete')
+
+    def upload():
+        response = client.post(
+            '/v1/kyc/document/upload/request',
+            {'fileName': 'passport.pdf', 'contentType': 'application/pdf'},
+            content_type='application/json',
+        )
+        assert response.status_code == 200
+        assert response.data['data']['url'] == 'https://bucket.s3.amazonaws.com/'
+        return response.data['data']['token'], presigned_post.call_args[0][0]
+
+    response = client.post(
+        '/v1/kyc/document/upload/request',
+        {'fileName': 'passport.exe', 'contentType': 'application/octet-stream'},
+        content_type='application/json',
+    )
+    assert response.status_code == 400
+
+    token, name = upload()
+    assert name.endswith('/passport.pdf')
+    assert presigned_post.call_args[0][1:] == (
+        'application/pdf', KYCDocument.MIN_SIZE, KYCDocument.MAX_SIZE, mock.ANY
+    )
+
+    # rejected file is removed from storage
+    response = client.post(
+        '/v1/kyc/document/upload/finalize',
+        {'token': token, 'checksum': '0' * 32},
+        content_type='application/json',
+    )
+    assert response.status_code == 400
+    delete.assert_called_once_with(name)
+    delete.reset_mock()
+
+    response = client.post(
+        '/v1/kyc/document/upload/finalize',
+        {'token': token, 'checksum': checksum},
+        content_type='application/json',
+    )
+    assert response.status_code == 200
+    document = KYCDocument.objects.get(pk=response.data['data']['id'])
+    assert document.file.name == name
+    assert document.checksum == checksum
+    # content is validated by metadata and first bytes, never downloaded
+    assert document.sha256 == ''
+    assert read_head.call_args[0] == (name, HEAD_SIZE)
+    open_.assert_not_called()
+
+    # identical content uploaded again is removed from storage
+    first_token = token
+    token, duplicate_name = upload()
+    response = client.post(
+        '/v1/kyc/document/upload/finalize',
+        {'token': token, 'checksum': checksum},
+        content_type='application/json',
+    )
+    assert response.status_code == 200
+    assert KYCDocument.objects.get(pk=response.data['data']['id']).file.name == name
+    delete.assert_called_once_with(duplicate_name)
+
+    # stored file shared with duplicates is kept
+    response = client.post(
+        '/v1/kyc/document/upload/finalize',
+        {'token': first_token, 'checksum': checksum},
+        content_type='application/json',
+    )
+    assert response.status_code == 200
+    assert KYCDocument.objects.filter(file=name).count() == 3
+    response = client.post(
+        '/v1/kyc/document/upload/finalize',
+        {'token': first_token, 'checksum': '0' * 32},
+        content_type='application/json',
+    )
+    assert response.status_code == 400
+    delete.assert_called_once_with(duplicate_name)
+
+    # token can't be used by another profile
+    client.force_login(full_verified_user)
+    response = client.post(
+        '/v1/kyc/document/upload/finalize',
+        {'token': token, 'checksum': checksum},
+        content_type='application/json',
+    )
+    assert response.status_code == 400
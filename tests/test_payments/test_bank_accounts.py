@@ -11,6 +11,7 @@ from django_banking.models import (
     Operation,
     UserAccount
 )
+from jibrel.authentication.models import User
 from tests.factories import VerifiedUser
 
 from ..test_banking.factories.wire_transfer import (
@@ -411,3 +412,24 @@ def test_deposit_limit_minimum(client, mocker):
     )
     assert resp.status_code == status.HTTP_201_CREATED
     email_mock.assert_called()
+
+
+@pytest.mark.django_db
+def test_deposit_residency_resolved_once(client, mocker):
+    mocker.patch('jibrel.payments.signals.handler.email_message_send')
+    user = VerifiedUser.create()
+    asset = Asset.objects.main_fiat_for_customer(user)
+    bank_account = BankAccountFactory.create(user=user, account__asset=asset)
+    ColdBankAccountFactory.create(account__asset=asset)
+
+    user = User.objects.get(pk=user.pk)
+    client.force_authenticate(user)
+    residency = mocker.spy(user, 'get_residency_country_code')
+    resp = client.post(
+        f'/v1/payments/bank-account/{bank_account.uuid}/deposit',
+        {
+            'amount': '100',
+        }
+    )
+    assert resp.status_code == status.HTTP_201_CREATED
+    assert residency.call_count == 1
@@ -0,0 +1,206 @@
+import io
+from datetime import date
+from decimal import Decimal
+from xml.etree import ElementTree
+
+import pytest
+from django.core.management import call_command
+
+from django_banking.contrib.wire_transfer import statements
+from django_banking.contrib.wire_transfer.enum import StatementLineMismatch
+from django_banking.contrib.wire_transfer.matching import StatementMatcher
+from django_banking.contrib.wire_transfer.models import (
+    DepositWireTransferOperation,
+    UnmatchedStatementLine
+)
+from django_banking.contrib.wire_transfer.statements import (
+    StatementLine,
+    parse_camt053,
+    parse_csv,
+    parse_mt940
+)
+from django_banking.models import (
+    Asset,
+    Operation,
+    UserAccount
+)
+from django_banking.models.transactions.enum import OperationStatus
+from jibrel.investment.enum import InvestmentApplicationStatus
+from jibrel.investment.matching import InvestmentStatementMatcher
+from tests.factories import VerifiedUser
+from tests.test_banking.factories.wire_transfer import (
+    BankAccountFactory,
+    ColdBankAccountFactory
+)
+
+IBAN = 'DE89370400440532013000'
+OTHER_IBAN = 'GB82WEST12345698765432'
+
+
+def create_wire_deposit(user, cold_bank_account, bank_account, amount, reference_code):
+    return DepositWireTransferOperation.objects.create_deposit(
+        payment_method_account=cold_bank_account.account,
+        user_account=UserAccount.objects.for_customer(user, cold_bank_account.account.asset),
+        amount=Decimal(amount),
+        references={
+            'user_bank_account_uuid': str(bank_account.uuid),
+            'reference_code': reference_code,
+            'amount': amount,
+        },
+    )
+
+
+def test_parse_statements():
+    csv_file = io.BytesIO(
+        b'Date,Amount,Currency,IBAN,Reference\n'
+        b'2020-03-01,100.50,usd,DE89 3704 0044 0532 0130 00,Payment DEPOSIT-111-222-333\n'
+        b'2020-03-01,-20,USD,,Fee\n'
+    )
+    assert list(parse_csv(csv_file)) == [
+        StatementLine(
+            2, Decimal('100.50'), 'USD', 'Payment DEPOSIT-111-222-333', IBAN, date(2020, 3, 1)
+        ),
+    ]
+
+    mt940_file = io.BytesIO(
+        b':20:STATEMENT\r\n'
+        b':25:12345678\r\n'
+        b':60F:C200301USD1000,00\r\n'
+        b':61:2003010301C100,50NTRFNONREF//B1\r\n'
+        b':86:?20DEPOSIT-111-222-333?31' + IBAN.encode() + b'\r\n'
+        b':61:2003010301D20,00NCHGNONREF\r\n'
+        b':86:Fee\r\n'
+        b':62F:C200301USD1080,50\r\n'
+        b'-\r\n'
+    )
+    lines = list(parse_mt940(mt940_file))
+    assert len(lines) == 1
+    assert lines[0].line_number == 4
+    assert lines[0].amount == Decimal('100.50')
+    assert lines[0].currency == 'USD'
+    assert 'DEPOSIT-111-222-333' in lines[0].reference
+    assert lines[0].iban == IBAN
+
+    camt_file = io.BytesIO(
+        b'<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02">'
+        b'<BkToCstmrStmt><Stmt>'
+        b'<Ntry><Amt Ccy="USD">100.50</Amt><CdtDbtInd>CRDT</CdtDbtInd>'
+        b'<BookgDt><Dt>2020-03-01</Dt></BookgDt>'
+        b'<NtryDtls><TxDtls>'
+        b'<RltdPties><DbtrAcct><Id><IBAN>' + IBAN.encode() + b'</IBAN></Id></DbtrAcct></RltdPties>'
+        b'<RmtInf><Ustrd>DEPOSIT-111-222-333</Ustrd></RmtInf>'
+        b'</TxDtls></NtryDtls></Ntry>'
+        b'<Ntry><Amt Ccy="USD">20</Amt><CdtDbtInd>DBIT</CdtDbtInd></Ntry>'
+        b'</Stmt></BkToCstmrStmt></Document>'
+    )
+    assert list(parse_camt053(camt_file)) == [
+        StatementLine(1, Decimal('100.50'), 'USD', 'DEPOSIT-111-222-333', IBAN, date(2020, 3, 1)),
+    ]
+
+
+def test_parse_camt053_drops_entries(mocker):
+    parsers = []
+
+    def iterparse(*args, **kwargs):
+        parsers.append(ElementTree.iterparse(*args, **kwargs))
+        return parsers[-1]
+
+    mocker.patch.object(statements, 'iterparse', side_effect=iterparse)
+    entry = b'<Ntry><Amt Ccy="USD">1</Amt><CdtDbtInd>CRDT</CdtDbtInd></Ntry>'
+    camt_file = io.BytesIO(
+        b'<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02">'
+        b'<BkToCstmrStmt><Stmt><Id>1</Id>' + entry * 100 + b'</Stmt></BkToCstmrStmt></Document>'
+    )
+    assert len(list(parse_camt053(camt_file))) == 100
+
+    statement = parsers[0].root[0][0]
+    assert [child.tag.split('}')[1] for child in statement] == ['Id']
+
+
+@pytest.mark.django_db
+def test_statement_matching(mocker, django_assert_max_num_queries):
+    email_mock = mocker.patch('jibrel.payments.signals.handler.email_message_send')
+    mocker.patch('django.db.transaction.on_commit', side_effect=lambda func, using=None: func())
+    user = VerifiedUser.create()
+    asset = Asset.objects.main_fiat_for_customer(user)
+    bank_account = BankAccountFactory.create(user=user, account__asset=asset, iban_number=IBAN)
+    cold_bank_account = ColdBankAccountFactory.create(account__asset=asset)
+    deposits = [
+        create_wire_deposit(user, cold_bank_account, bank_account, '100', f'DEPOSIT-000-000-00{i}')
+        for i in range(5)
+    ]
+    for _ in range(2):
+        create_wire_deposit(user, cold_bank_account, bank_account, '100', 'DEPOSIT-000-000-009')
+    lines = [
+        StatementLine(1, Decimal('100.00'), 'USD', 'deposit-000-000-000', IBAN),
+        StatementLine(2, Decimal(100), 'USD', 'DEPOSIT-000-000-001', IBAN),
+        StatementLine(3, Decimal(100), 'USD', 'Ref DEPOSIT-000-000-001', IBAN),
+        StatementLine(4, Decimal(99), 'USD', 'DEPOSIT-000-000-002', IBAN),
+        StatementLine(5, Decimal(100), 'EUR', 'DEPOSIT-000-000-003', IBAN),
+        StatementLine(6, Decimal(100), 'USD', 'DEPOSIT-000-000-004', OTHER_IBAN),
+        StatementLine(7, Decimal(100), 'USD', 'DEPOSIT-999-999-999', IBAN),
+        StatementLine(8, Decimal(100), 'USD', 'Unknown', IBAN),
+        StatementLine(9, Decimal(100), 'USD', 'DEPOSIT-000-000-009', IBAN),
+    ]
+
+    with django_assert_max_num_queries(70):
+        result = StatementMatcher('statement.csv', batch_size=1).run(lines)
+
+    assert result == (2, 7, 0)
+    assert email_mock.call_count == 2
+    statuses = dict(Operation.objects.filter(
+        pk__in=[deposit.pk for deposit in deposits]
+    ).values_list('reference_code', 'status'))
+    assert statuses['DEPOSIT-000-000-000'] == OperationStatus.COMMITTED
+    assert statuses['DEPOSIT-000-000-001'] == OperationStatus.COMMITTED
+    assert statuses['DEPOSIT-000-000-002'] == OperationStatus.HOLD
+    assert dict(UnmatchedStatementLine.objects.values_list('line_number', 'reason')) == {
+        3: StatementLineMismatch.DUPLICATE,
+        4: StatementLineMismatch.AMOUNT_MISMATCH,
+        5: StatementLineMismatch.CURRENCY_MISMATCH,
+        6: StatementLineMismatch.IBAN_MISMATCH,
+        7: StatementLineMismatch.UNKNOWN_REFERENCE,
+        8: StatementLineMismatch.NO_REFERENCE,
+        9: StatementLineMismatch.AMBIGUOUS_REFERENCE,
+    }
+
+    # reimport skips settled lines and doesn't duplicate queued ones
+    assert StatementMatcher('statement.csv').run(lines) == (0, 7, 2)
+    assert UnmatchedStatementLine.objects.count() == 7
+
+    # overlapping statement
+    overlapping = [line._replace(line_number=line.line_number + 10) for line in lines[:3]]
+    assert StatementMatcher('next.csv').run(overlapping) == (0, 1, 2)
+    assert UnmatchedStatementLine.objects.get(statement='next.csv').reason == \
+        StatementLineMismatch.DUPLICATE
+
+
+@pytest.mark.django_db
+def test_import_bank_statement_command(mocker, application_factory, tmp_path):
+    mocker.patch('jibrel.payments.signals.handler.email_message_send')
+    application = application_factory(amount=250, status=InvestmentApplicationStatus.PENDING)
+    asset = application.asset
+    application.bank_account = ColdBankAccountFactory.create(account__asset=asset)
+    application.save()
+    BankAccountFactory.create(
+        user=application.user, account__asset=asset, iban_number='de89 3704 0044 0532 0130 00'
+    )
+    statement = tmp_path / 'statement.csv'
+    statement.write_text(
+        'date,amount,currency,iban,reference\n'
+        f'2020-03-01,250,{asset.symbol},{IBAN},{application.deposit_reference_code}\n'
+    )
+
+    assert isinstance(InvestmentStatementMatcher('test'), StatementMatcher)
+    stdout = io.StringIO()
+    call_command('import_bank_statement', str(statement), stdout=stdout)
+
+    assert '1 lines matched, 0 queued as unmatched, 0 already settled' in stdout.getvalue()
+    application.refresh_from_db()
+    assert application.status == InvestmentApplicationStatus.HOLD
+    assert application.deposit.is_committed
+    assert application.deposit.user_bank_account_uuid is not None
+
+    stdout = io.StringIO()
+    call_command('import_bank_statement', str(statement), stdout=stdout)
+    assert '0 lines matched, 0 queued as unmatched, 1 already settled' in stdout.getvalue()
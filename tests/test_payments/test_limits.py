@@ -0,0 +1,142 @@
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from django_banking.limitations.cache import (
+    get_cached_limits_usage,
+    set_cached_limits_usage
+)
+from django_banking.limitations.enum import (
+    LimitInterval,
+    LimitType
+)
+from django_banking.limitations.exceptions import LimitExceededException
+from django_banking.limitations.utils import (
+    calculate_limits_usage,
+    get_user_limits,
+    validate_limits_available
+)
+from django_banking.models import Asset
+from django_banking.models.transactions.enum import OperationType
+from django_banking.utils import limit_parser
+from tests.factories import VerifiedUser
+
+from ..test_banking.factories.wire_transfer import (
+    BankAccountFactory,
+    ColdBankAccountFactory
+)
+
+
+@pytest.fixture()
+def deposit_limits(mocker):
+    limits = limit_parser({
+        None: [
+            {
+                'asset_symbol': 'USD',
+                'value': Decimal(1000),
+                'limit_type': 'DEPOSIT',
+                'interval': 'WEEK',
+            },
+            {
+                'asset_symbol': 'USD',
+                'value': Decimal(500),
+                'limit_type': 'DEPOSIT',
+                'interval': 'DAY',
+            },
+        ]
+    })
+    mocker.patch('django_banking.limitations.utils.LIMITS', limits)
+    return limits
+
+
+def get_available(user):
+    return {limit.interval: limit.available for limit in get_user_limits(user)}
+
+
+@pytest.mark.django_db
+def test_limits_usage(deposit_limits, create_deposit_operation):
+    user = VerifiedUser.create()
+    asset = Asset.objects.get(symbol='USD')
+    assert get_available(user) == {LimitInterval.WEEK: 1000, LimitInterval.DAY: 500}
+
+    deposit = create_deposit_operation(user=user, asset=asset, amount=Decimal(100), commit=False)
+    assert get_available(user) == {LimitInterval.WEEK: 900, LimitInterval.DAY: 400}
+
+    with mock.patch('django_banking.limitations.utils.calculate_limits_usage') as calculate:
+        assert get_available(user) == {LimitInterval.WEEK: 900, LimitInterval.DAY: 400}
+    calculate.assert_not_called()
+
+    deposit.cancel()
+    assert get_available(user) == {LimitInterval.WEEK: 1000, LimitInterval.DAY: 500}
+
+    create_deposit_operation(user=user, asset=asset, amount=Decimal(450))
+    with pytest.raises(LimitExceededException) as e:
+        validate_limits_available(user, OperationType.DEPOSIT, asset, Decimal(100))
+    assert e.value.limit.type == LimitType.DEPOSIT
+    assert e.value.limit.interval == LimitInterval.DAY
+    validate_limits_available(user, OperationType.DEPOSIT, asset, Decimal(50))
+    validate_limits_available(user, OperationType.WITHDRAWAL, asset, Decimal(1000))
+
+
+@pytest.mark.django_db
+def test_limits_usage_cached_concurrently(deposit_limits, create_deposit_operation):
+    user = VerifiedUser.create()
+    asset = Asset.objects.get(symbol='USD')
+
+    # other worker calculates usage before deposit is posted
+    usage, version = get_cached_limits_usage(user.pk)
+    assert usage is None
+    usage = calculate_limits_usage(user, deposit_limits[None])
+    create_deposit_operation(user=user, asset=asset, amount=Decimal(100), commit=False)
+    # and caches it once deposit has already dropped cached usage
+    set_cached_limits_usage(user.pk, usage, version)
+
+    assert get_available(user) == {LimitInterval.WEEK: 900, LimitInterval.DAY: 400}
+
+
+@pytest.mark.django_db
+def test_operation_limits_usage(deposit_limits, create_deposit_operation):
+    user = VerifiedUser.create()
+    asset = Asset.objects.get(symbol='USD')
+    create_deposit_operation(user=user, asset=asset, amount=Decimal(100))
+    limits = [
+        *deposit_limits[None],
+        *limit_parser([{
+            'asset_symbol': 'USD',
+            'value': Decimal(200),
+            'limit_type': 'DEPOSIT',
+            'interval': 'OPERATION',
+        }]),
+    ]
+
+    # per operation limits don't make usage query scan whole history
+    with CaptureQueriesContext(connection) as captured:
+        usage = calculate_limits_usage(user, limits)
+    conditions = captured.captured_queries[0]['sql'].split(' FROM ', 1)[1]
+    assert '"created_at" >=' in conditions
+    assert usage == {
+        ('USD', LimitType.DEPOSIT, LimitInterval.WEEK): 100,
+        ('USD', LimitType.DEPOSIT, LimitInterval.DAY): 100,
+    }
+
+
+@pytest.mark.django_db
+def test_deposit_limit_exceeded(deposit_limits, mocker):
+    mocker.patch('jibrel.payments.signals.handler.email_message_send')
+    user = VerifiedUser.create()
+    client = APIClient()
+    client.force_authenticate(user)
+    asset = Asset.objects.main_fiat_for_customer(user)
+    bank_account = BankAccountFactory.create(user=user, account__asset=asset)
+    ColdBankAccountFactory.create(account__asset=asset)
+
+    resp = client.post(f'/v1/payments/bank-account/{bank_account.uuid}/deposit', {'amount': '400'})
+    assert resp.status_code == status.HTTP_201_CREATED
+
+    resp = client.post(f'/v1/payments/bank-account/{bank_account.uuid}/deposit', {'amount': '200'})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
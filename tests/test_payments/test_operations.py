@@ -1,3 +1,4 @@
+import hashlib
 import os
 from unittest import mock
 
@@ -7,15 +8,20 @@ from django.core.files import File
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from django_banking.api.views import OperationHistoryPagination
+from django_banking.core.exceptions import NonSupportedCountryException
 from django_banking.models import (
     Asset,
     Operation,
+    OperationSummary,
     UserAccount
 )
 from django_banking.models.transactions.enum import OperationType
 from django_banking.models.transactions.models import (
     OperationConfirmationDocument
 )
+from django_banking.storages import ObjectInfo
+from jibrel.authentication.models import User
 from tests.factories import (
     ApprovedIndividualKYCFactory,
     VerifiedUser
@@ -84,6 +90,23 @@ def test_operations_list():
     validate_response_schema('/v1/payments/operations', 'GET', resp)
 
 
+@pytest.mark.django_db
+def test_operations_list_non_supported_country(mocker):
+    client = APIClient()
+    user = VerifiedUser.create()
+    create_deposit_operation(user)
+    client.force_authenticate(User.objects.get(pk=user.pk))
+    mocker.patch(
+        'jibrel.authentication.models.User.get_residency_country_code',
+        side_effect=NonSupportedCountryException,
+    )
+
+    resp = client.get('/v1/payments/operations/')
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data['data'] == []
+
+
 @pytest.mark.django_db
 def test_bank_deposit_with_upload():
     client = APIClient()
@@ -112,6 +135,83 @@ def test_bank_deposit_with_upload():
     assert resp.data['data'][0]['depositReferenceCode'] == '1234'
 
 
+@pytest.mark.django_db
+def test_bank_deposit_with_direct_upload(mocker):
+    client = APIClient()
+    user = VerifiedUser.create()
+    client.force_authenticate(user)
+    operation = create_deposit_operation(user, commit=False)
+    presigned_post = mocker.patch(
+        'django_banking.storages.AmazonS3Storage.presigned_post',
+        return_value=('https://bucket.s3.amazonaws.com/', {'key': 'operations/upload.jpg'}),
+    )
+    with open(os.path.join(os.path.dirname(__file__), 'fixtures', 'upload.jpg'), 'rb') as fp:
+        content = fp.read()
+    checksum = hashlib.md5(content).hexdigest()
+    get_object_info = mocker.patch(
+        'django_banking.storages.AmazonS3Storage.get_object_info',
+        return_value=ObjectInfo(size=len(content), etag=checksum),
+    )
+    read_head = mocker.patch(
+        'django_banking.storages.AmazonS3Storage.read_head',
+        side_effect=lambda name, size: content[:size],
+    )
+    delete = mocker.patch('django_banking.storages.AmazonS3Storage.delete')
+
+    resp = client.post(
+        f'/v1/payments/operations/{operation.uuid}/upload/request',
+        {'fileName': 'upload.jpg', 'contentType': 'image/jpeg'},
+        format='json',
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    token = resp.data['data']['token']
+    name = presigned_post.call_args[0][0]
+    url = f'/v1/payments/operations/{operation.uuid}/upload/finalize'
+    data = {'token': token, 'checksum': checksum}
+
+    other_operation = create_deposit_operation(user, commit=False)
+    resp = client.post(
+        f'/v1/payments/operations/{other_operation.uuid}/upload/finalize', data, format='json'
+    )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    get_object_info.return_value = None
+    resp = client.post(url, data, format='json')
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'token' in resp.data['errors']
+    delete.assert_not_called()
+
+    # rejected file is removed from storage
+    get_object_info.return_value = ObjectInfo(
+        size=OperationConfirmationDocument.MAX_SIZE + 1, etag=checksum
+    )
+    resp = client.post(url, data, format='json')
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'token' in resp.data['errors']
+    delete.assert_called_once_with(name)
+
+    get_object_info.return_value = ObjectInfo(size=len(content), etag=checksum)
+    read_head.side_effect = lambda name, size: b'MZ' + b'\0' * (size - 2)
+    resp = client.post(url, data, format='json')
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'token' in resp.data['errors']
+
+    read_head.side_effect = lambda name, size: content[:size]
+    resp = client.post(url, {'token': token, 'checksum': '0' * 32}, format='json')
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'checksum' in resp.data['errors']
+    assert delete.call_count == 3
+
+    resp = client.post(url, data, format='json')
+    assert resp.status_code == status.HTTP_201_CREATED
+    assert OperationConfirmationDocument.objects.get(operation=operation).file.name == name
+
+    # registered file is kept
+    resp = client.post(url, {'token': token, 'checksum': '0' * 32}, format='json')
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert delete.call_count == 3
+
+
 @pytest.mark.django_db
 def test_operation_details():
     client = APIClient()
@@ -150,3 +250,34 @@ def test_operation_after_citizenship_change():
 
     resp = client.get(f'/v1/payments/operations/{operation.uuid}')
     assert resp.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_operations_list_keyset_pagination():
+    client = APIClient()
+    user = VerifiedUser.create()
+    client.force_authenticate(user)
+
+    operations = [create_deposit_operation(user) for _ in range(5)]
+    # equal timestamps must not break pages
+    OperationSummary.objects.filter(operation__in=operations).update(
+        created_at=operations[0].created_at
+    )
+    expected = [str(op.pk) for op in sorted(operations, key=lambda op: op.pk, reverse=True)]
+
+    with mock.patch.object(OperationHistoryPagination, 'page_size', 2):
+        seen = []
+        url = '/v1/payments/operations/'
+        while url:
+            resp = client.get(url)
+            assert resp.status_code == status.HTTP_200_OK
+            seen += [item['id'] for item in resp.data['data']]
+            url = resp.data['next']
+            last_page = resp
+        assert seen == expected
+
+        resp = client.get(last_page.data['previous'])
+        assert [item['id'] for item in resp.data['data']] == expected[2:4]
+
+        resp = client.get('/v1/payments/operations/', {'cursor': 'invalid'})
+        assert resp.status_code == status.HTTP_404_NOT_FOUND